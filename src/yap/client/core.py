@@ -16,7 +16,7 @@ Core client implementation for Yap.
 This module provides the `VoiceClient` class which handles:
 1.  Connecting to the server via WebSockets.
 2.  Capturing audio from the microphone using PyAudio.
-3.  Preprocessing audio (resampling, normalization).
+3.  Encoding audio in the negotiated wire format (the server resamples and downmixes).
 4.  Sending audio data and receiving transcription results.
 """
 
@@ -63,6 +63,10 @@ class VoiceClient:
         if isinstance(cfg_device, int):
              self.device_index = cfg_device
 
+        # Wire format negotiated in the handshake, the server decodes it
+        self.audio_encoding = self.config.get("audio.encoding", "pcm_s16")
+        self.opus_encoder = None
+
     async def run(self, duration=10, on_transcription=None, on_live_update=None, use_vad=True):
         """
         Connects to the server, streams audio, and handles incoming transcription updates.
@@ -80,9 +84,14 @@ class VoiceClient:
                 "uid": self.uid,
                 "language": "en",
                 "task": "transcribe",
-                "model": "small",
+                "model": self.config.get("model.size", "small"),
                 "use_vad": use_vad,
-                "vad_parameters": {"threshold": 0.5} 
+                "vad_parameters": {"threshold": 0.5},
+                "audio_encoding": self.audio_encoding,
+                "sample_rate": self.rate,
+                "channels": self.channels,
+                # only new segments and the current partial, merged by id below
+                "delta_segments": True,
             }
             await websocket.send(json.dumps(handshake))
             
@@ -133,33 +142,13 @@ class VoiceClient:
             while not stop_event.is_set():
                 raw_data = stream.read(self.chunk, exception_on_overflow=False)
                 
-                # Conversion Pipeline:
-                # 1. Stereo (2ch) -> Mono (1ch)
-                # raw_data is int16 (2 bytes). 
+                # Raw capture (interleaved int16 at the capture rate);
+                # the server downmixes and resamples to 16 kHz mono.
                 audio_array = np.frombuffer(raw_data, dtype=np.int16)
-                
-                if self.channels == 2:
-                   # De-interleave and average: [L, R, L, R...] -> reshape to (N, 2)
-                   audio_stereo = audio_array.reshape(-1, 2)
-                   audio_mono = audio_stereo.mean(axis=1).astype(np.int16)
-                else:
-                   audio_mono = audio_array
-
-                # 2. Downsample 32k -> 16k
-                # Simple decimation [::2] works well for this factor
-                if self.rate == 32000:
-                     audio_resampled = audio_mono[::2]
-                elif self.rate != 16000:
-                     # For now, just pass through if 16k or unknown
-                     audio_resampled = audio_mono
-                else:
-                     audio_resampled = audio_mono
-                
-                # 3. Convert Int16 -> Float32
-                audio_np = audio_resampled.astype(np.float32) / 32768.0
 
-                # Send
-                await websocket.send(audio_np.tobytes())
+                # Encode & Send
+                for packet in self.encode_audio(audio_array):
+                    await websocket.send(packet)
                 await asyncio.sleep(0.001)
         except Exception:
              # print(f"\n[ERROR] Audio read loop failed: {e}", file=sys.stderr)
@@ -168,6 +157,22 @@ class VoiceClient:
             stream.stop_stream()
             stream.close()
 
+    def encode_audio(self, audio_int16):
+        """
+        Encodes interleaved int16 audio at `self.rate` in the negotiated wire format.
+
+        Returns:
+            list: Binary messages to send.
+        """
+        if self.audio_encoding == "opus":
+            if self.opus_encoder is None:
+                from yap.whisper_live.audio_codec import OpusEncoder
+                self.opus_encoder = OpusEncoder(rate=self.rate, channels=self.channels)
+            return self.opus_encoder.encode(audio_int16)
+        if self.audio_encoding == "pcm_f32":
+            return [(audio_int16.astype(np.float32) / 32768.0).tobytes()]
+        return [audio_int16.astype(np.int16).tobytes()]
+
     async def receive_transcription(self, websocket, callback=None, on_live_update=None):
         segments_map = {} 
         try:
@@ -175,9 +180,10 @@ class VoiceClient:
                 data = json.loads(message)
                 if "segments" in data:
                     for seg in data["segments"]:
-                        start_time = seg.get("start")
-                        if start_time is not None:
-                            segments_map[start_time] = seg["text"]
+                        # a partial carries the id of the segment that will replace it
+                        key = seg.get("id", seg.get("start"))
+                        if key is not None:
+                            segments_map[key] = seg["text"]
                     
                     # Update Live
                     if on_live_update:
@@ -28,8 +28,22 @@ def start():
     host = config.get("server.host", "0.0.0.0")
     model_size = config.get("model.size", "small")
     compute_type = config.get("model.compute_type") # Can be None
+    cpu_threads = config.get("model.cpu_threads", 0)
+    num_workers = config.get("model.num_workers", 1)
+    device_index = config.get("model.device_index", 0)
+    max_batch_size = config.get("model.max_batch_size", 1)
+    max_batch_wait_ms = config.get("model.max_batch_wait_ms", 10)
+    server_mode = config.get("server.mode", "sync")
+    inference_workers = config.get("server.inference_workers", 4)
+    transcript_dir = config.get("server.transcript_dir")
+    translation_engine = config.get("translation.engine", "transformers")
+    max_models = config.get("model.max_models", 2)
+    max_memory_mb = config.get("model.max_memory_mb")
+    max_model_concurrency = config.get("model.max_concurrency", 1)
     # 1. Warmup Model
     try:
+        ServeClientFasterWhisper.configure_models(
+            cpu_threads=cpu_threads, num_workers=num_workers, device_index=device_index)
         ServeClientFasterWhisper.preload_model(model_size, compute_type=compute_type)
     except Exception as e:
         print(f"FATAL: Model warmup failed: {e}")
@@ -45,6 +59,15 @@ def start():
         port=port,
         backend="faster_whisper",
         single_model=True, # Use the pre-loaded model
+        max_batch_size=max_batch_size,
+        max_batch_wait_ms=max_batch_wait_ms,
+        server_mode=server_mode,
+        inference_workers=inference_workers,
+        transcript_dir=transcript_dir,
+        translation_engine=translation_engine,
+        max_models=max_models,
+        max_memory_mb=max_memory_mb,
+        max_model_concurrency=max_model_concurrency,
     )
 
 if __name__ == "__main__":
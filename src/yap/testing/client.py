@@ -20,6 +20,14 @@ class SimulationClient(VoiceClient):
         self.audio_file = audio_file
         self.phase = 0.0
 
+        # Declared in the handshake; the server resamples and downmixes
+        self.rate = 16000
+        self.channels = 1
+        if self.audio_file and os.path.exists(self.audio_file):
+            with wave.open(self.audio_file, 'rb') as wf:
+                self.rate = wf.getframerate()
+                self.channels = wf.getnchannels()
+
     async def send_audio(self, websocket, stop_event):
         """
         Overrides VoiceClient.send_audio to stream simulation data.
@@ -33,10 +41,8 @@ class SimulationClient(VoiceClient):
         print(f"[SIMULATION] Stream Mode: File ({self.audio_file})")
         try:
             with wave.open(self.audio_file, 'rb') as wf:
-                channels = wf.getnchannels()
                 width = wf.getsampwidth()
                 rate = wf.getframerate()
-                target_rate = 16000
                 
                 while not stop_event.is_set():
                     frames_to_read = int(rate * 0.1) # 100ms chunks
@@ -45,29 +51,10 @@ class SimulationClient(VoiceClient):
                         wf.rewind()
                         data = wf.readframes(frames_to_read)
                     
-                    # Convert to standard pipeline format
+                    # Sent as-is, the server converts to 16 kHz mono
                     audio_array = np.frombuffer(data, dtype=np.int16)
-
-                    if channels == 2:
-                        audio_stereo = audio_array.reshape(-1, 2)
-                        audio_mono = audio_stereo.mean(axis=1).astype(np.int16)
-                    else:
-                        audio_mono = audio_array
-                    
-                    if rate != target_rate:
-                        # Linear interpolation resampling
-                        full_len = len(audio_mono)
-                        target_len = int(full_len * target_rate / rate)
-                        audio_resampled = np.interp(
-                            np.linspace(0, full_len, target_len, endpoint=False),
-                            np.arange(full_len),
-                            audio_mono
-                        ).astype(np.int16)
-                    else:
-                        audio_resampled = audio_mono
-                    
-                    audio_np = audio_resampled.astype(np.float32) / 32768.0
-                    await websocket.send(audio_np.tobytes())
+                    for packet in self.encode_audio(audio_array):
+                        await websocket.send(packet)
                     
                     duration = len(data) / width / rate # Approx
                     await asyncio.sleep(0.09) # Slightly faster than realtime to prevent buffer underrun
@@ -106,7 +93,8 @@ class SimulationClient(VoiceClient):
             # 4. Amplitude Normalization
             source = np.clip(source, -1.0, 1.0)
             
-            audio_np = source.astype(np.float32)
-            await websocket.send(audio_np.tobytes())
+            audio_int16 = (source * 32767).astype(np.int16)
+            for packet in self.encode_audio(audio_int16):
+                await websocket.send(packet)
             
             await asyncio.sleep(0.1)
@@ -0,0 +1,137 @@
+import numpy as np
+
+
+"""
+Fixed-capacity audio storage for streaming transcription.
+
+Provides `AudioRingBuffer`, a preallocated circular buffer addressed by a
+monotonic sample index, so appending audio never reallocates in steady state.
+"""
+
+
+class AudioRingBuffer:
+    """
+    Preallocated circular buffer of float32 audio samples.
+
+    Every sample ever written gets a monotonic index. The buffer retains the samples
+    in `[start_index, end_index)`; older samples are discarded in blocks of
+    `discard_seconds` once the buffer would exceed `max_seconds`, matching the
+    trimming behaviour the server has always used for its audio window.
+    """
+
+    def __init__(self, max_seconds=45, discard_seconds=30, rate=16000, dtype=np.float32):
+        """
+        Args:
+            max_seconds (float): Maximum amount of audio retained. Defaults to 45.
+            discard_seconds (float): Amount of audio dropped from the front when full. Defaults to 30.
+            rate (int): Sample rate of the stored audio. Defaults to 16000.
+            dtype: NumPy dtype of the stored samples. Defaults to float32.
+        """
+        self.rate = rate
+        self.capacity = int(max_seconds * rate)
+        self.discard_samples = int(discard_seconds * rate)
+        # a zero-sample discard block would never free space once the buffer is full
+        if not 0 < self.discard_samples <= self.capacity:
+            raise ValueError("discard_seconds must be positive and cannot exceed max_seconds")
+        self._data = np.zeros(self.capacity, dtype=dtype)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def start_index(self):
+        """int: Monotonic index of the oldest retained sample."""
+        return self._start
+
+    @property
+    def end_index(self):
+        """int: Monotonic index one past the newest sample (total samples written)."""
+        return self._end
+
+    @property
+    def start_time(self):
+        """float: Stream time, in seconds, of the oldest retained sample."""
+        return self._start / self.rate
+
+    @property
+    def end_time(self):
+        """float: Stream time, in seconds, of the end of the buffered audio."""
+        return self._end / self.rate
+
+    def append(self, frame_np):
+        """
+        Append audio samples, discarding the oldest audio if the buffer is full.
+
+        Args:
+            frame_np (np.ndarray): 1-D array of audio samples.
+
+        Returns:
+            int: Number of samples discarded from the front of the buffer.
+        """
+        n = frame_np.shape[0]
+        if n == 0:
+            return 0
+
+        old_start = self._start
+        if n >= self.capacity:
+            # Only the newest `capacity` samples can ever be retained.
+            frame_np = frame_np[-self.capacity:]
+            self._start = self._end + n - self.capacity
+            skipped = n - self.capacity
+            n = self.capacity
+        else:
+            skipped = 0
+            while len(self) + n > self.capacity:
+                self._start = min(self._start + self.discard_samples, self._end)
+
+        pos = (self._end + skipped) % self.capacity
+        first = min(n, self.capacity - pos)
+        self._data[pos:pos + first] = frame_np[:first]
+        if first < n:
+            self._data[:n - first] = frame_np[first:]
+        self._end += skipped + n
+        return self._start - old_start
+
+    def read(self, from_index=None):
+        """
+        Copy out the buffered samples starting at `from_index`.
+
+        Args:
+            from_index (int, optional): Monotonic sample index to start reading from. Indices
+                older than `start_index` are clamped to it. Defaults to `start_index`.
+
+        Returns:
+            np.ndarray: A contiguous copy of the samples in `[from_index, end_index)`.
+        """
+        start = self._start if from_index is None else min(max(from_index, self._start), self._end)
+        n = self._end - start
+        pos = start % self.capacity
+        first = min(n, self.capacity - pos)
+        if first == n:
+            return self._data[pos:pos + n].copy()
+        out = np.empty(n, dtype=self._data.dtype)
+        out[:first] = self._data[pos:]
+        out[first:] = self._data[:n - first]
+        return out
+
+    def samples_since(self, from_index):
+        """
+        Number of buffered samples at or after `from_index`.
+
+        Args:
+            from_index (int): Monotonic sample index.
+
+        Returns:
+            int: The count of retained samples in `[from_index, end_index)`.
+        """
+        return self._end - min(max(from_index, self._start), self._end)
+
+    def index_for_time(self, seconds):
+        """Convert a stream time in seconds to a monotonic sample index."""
+        return int(seconds * self.rate)
+
+    def clear(self):
+        """Drop all buffered audio without resetting the sample index."""
+        self._start = self._end
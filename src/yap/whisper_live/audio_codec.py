@@ -0,0 +1,234 @@
+from math import gcd
+
+import av
+import numpy as np
+from scipy.signal import firwin
+
+
+"""
+Wire formats for streamed client audio.
+
+Clients declare an `audio_encoding`, `sample_rate` and `channels` in the handshake and
+the server decodes every binary message with a per-connection `AudioFrameDecoder` into
+16 kHz mono float32 before it reaches the ring buffer, so clients can stream whatever
+their capture device delivers.
+
+- "pcm_f32": little-endian float32 samples in [-1, 1] (the original format).
+- "pcm_s16": little-endian int16 samples, half the bytes of "pcm_f32".
+- "opus": one Opus packet per message, for thin links.
+
+PCM channels are interleaved.
+"""
+
+
+AUDIO_ENCODINGS = ("pcm_f32", "pcm_s16", "opus")
+
+
+class StreamingResampler:
+    """
+    Stateful polyphase resampler for audio arriving in arbitrary block sizes.
+
+    Uses the same Kaiser-windowed anti-aliasing FIR filter as `scipy.signal.resample_poly`,
+    but keeps the filter history across calls, so resampling a stream block by block gives
+    the same samples as resampling it in one go (`scipy.signal.upfirdn` with that filter).
+    The filter is causal, which delays the output by half the filter length (under 1 ms).
+    """
+
+    def __init__(self, from_rate, to_rate):
+        """
+        Args:
+            from_rate (int): Input sample rate.
+            to_rate (int): Output sample rate.
+        """
+        g = gcd(from_rate, to_rate)
+        self.up = to_rate // g
+        self.down = from_rate // g
+
+        max_rate = max(self.up, self.down)
+        half_len = 10 * max_rate
+        h = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * self.up
+        # polyphase components: phase p applies taps h[p], h[p + up], h[p + 2 up], ...
+        self.taps = -(-h.shape[0] // self.up)
+        h = np.concatenate((h, np.zeros(self.taps * self.up - h.shape[0])))
+        self.phases = h.reshape(self.taps, self.up).T.astype(np.float32)
+
+        # last `taps - 1` input samples, zeros before the start of the stream
+        self.history = np.zeros(self.taps - 1, dtype=np.float32)
+        self.consumed = 0
+        self.produced = 0
+
+    def __call__(self, audio):
+        """
+        Args:
+            audio (np.ndarray): 1-D float32 samples at `from_rate`.
+
+        Returns:
+            np.ndarray: float32 samples at `to_rate` that can be computed so far.
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        buf = np.concatenate((self.history, audio))
+        buf_start = self.consumed - self.history.shape[0]
+        self.consumed += audio.shape[0]
+
+        # output m sits at upsampled time m * down and needs inputs up to (m * down) // up
+        if not self.consumed:
+            return np.zeros(0, dtype=np.float32)
+        end = ((self.consumed - 1) * self.up) // self.down + 1
+        t = np.arange(self.produced, end) * self.down
+        self.produced = end
+
+        newest = t // self.up - buf_start
+        idx = newest[:, None] - np.arange(self.taps)[None, :]
+        out = np.einsum("ij,ij->i", self.phases[t % self.up], buf[idx]).astype(np.float32)
+
+        self.history = buf[buf.shape[0] - self.history.shape[0]:]
+        return out
+
+
+class AudioFrameDecoder:
+    """
+    Decodes one connection's audio messages into mono float32 samples at `rate`.
+
+    Opus decoding and resampling are stateful, so every connection needs its own decoder.
+    PCM messages don't have to hold whole sample frames: bytes left over after the last
+    complete frame (all channels of one sample) are kept and prepended to the next message.
+    """
+
+    def __init__(self, encoding="pcm_f32", sample_rate=16000, channels=1, rate=16000):
+        """
+        Args:
+            encoding (str): One of `AUDIO_ENCODINGS`. Defaults to "pcm_f32".
+            sample_rate (int): Sample rate of the client's PCM audio. Opus streams carry their
+                own rate and ignore this. Defaults to 16000.
+            channels (int): Number of interleaved channels, downmixed to mono. Defaults to 1.
+            rate (int): Sample rate of the decoded audio. Defaults to 16000.
+
+        Raises:
+            ValueError: If the encoding, sample rate or channel count is not supported.
+        """
+        if encoding not in AUDIO_ENCODINGS:
+            raise ValueError(f"Unsupported audio encoding {encoding!r}, expected one of {', '.join(AUDIO_ENCODINGS)}")
+        if isinstance(sample_rate, float) and sample_rate.is_integer():
+            sample_rate = int(sample_rate)
+        if not isinstance(sample_rate, int) or not 8000 <= sample_rate <= 192000:
+            raise ValueError(f"Unsupported sample rate {sample_rate!r}, expected 8000 to 192000 Hz")
+        if channels not in (1, 2):
+            raise ValueError(f"Unsupported channel count {channels!r}, expected 1 or 2")
+        self.encoding = encoding
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.rate = rate
+        self.codec = None
+        self.resampler = None
+        self.frame_bytes = (4 if encoding == "pcm_f32" else 2) * channels
+        self.leftover = b""
+        if encoding == "opus":
+            layout = "mono" if channels == 1 else "stereo"
+            self.codec = av.CodecContext.create("opus", "r")
+            self.codec.layout = layout
+            # the opus decoder always outputs 48 kHz planar float, channels are averaged below
+            self.resampler = av.AudioResampler(format="flt", layout=layout, rate=rate)
+        elif sample_rate != rate:
+            self.resampler = StreamingResampler(sample_rate, rate)
+
+    def decode(self, frame_data):
+        """
+        Args:
+            frame_data (bytes): A binary websocket message.
+
+        Returns:
+            np.ndarray: Decoded float32 samples (possibly empty).
+        """
+        if self.encoding == "opus":
+            return self.decode_opus(frame_data)
+
+        if self.leftover:
+            frame_data = self.leftover + frame_data
+        usable = len(frame_data) - len(frame_data) % self.frame_bytes
+        self.leftover = bytes(frame_data[usable:])
+        frame_data = memoryview(frame_data)[:usable]
+
+        if self.encoding == "pcm_f32":
+            audio = np.frombuffer(frame_data, dtype=np.float32)
+        else:
+            audio = np.frombuffer(frame_data, dtype=np.int16).astype(np.float32) / 32768.0
+        if self.channels > 1:
+            audio = audio.reshape(-1, self.channels).mean(axis=1, dtype=np.float32)
+        if self.resampler is not None:
+            audio = self.resampler(audio)
+        return audio
+
+    def decode_opus(self, frame_data):
+        chunks = []
+        for frame in self.codec.decode(av.Packet(frame_data)):
+            for resampled in self.resampler.resample(frame):
+                audio = resampled.to_ndarray().reshape(-1, self.channels)
+                chunks.append(audio.mean(axis=1, dtype=np.float32))
+        if not chunks:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(chunks)
+
+
+class OpusEncoder:
+    """
+    Client-side encoder producing the packets expected by the "opus" encoding.
+
+    Audio can be passed in any block size; it is cut into fixed-size Opus frames and
+    leftover samples are kept for the next call. Input rates Opus can't encode natively
+    are converted to 48 kHz first.
+    """
+
+    OPUS_RATES = (8000, 12000, 16000, 24000, 48000)
+
+    def __init__(self, rate=16000, channels=1, frame_ms=20, bit_rate=24000):
+        """
+        Args:
+            rate (int): Sample rate of the int16 input. Defaults to 16000.
+            channels (int): Number of interleaved input channels, 1 or 2. Defaults to 1.
+            frame_ms (int): Opus frame duration (2.5, 5, 10, 20, 40 or 60 ms). Defaults to 20.
+            bit_rate (int): Target bit rate in bits per second. Defaults to 24000.
+        """
+        self.layout = "mono" if channels == 1 else "stereo"
+        self.channels = channels
+        self.rate = rate
+        self.codec_rate = rate if rate in self.OPUS_RATES else 48000
+        self.resampler = None
+        if self.codec_rate != rate:
+            self.resampler = av.AudioResampler(format="s16", layout=self.layout, rate=self.codec_rate)
+
+        self.codec = av.CodecContext.create("libopus", "w")
+        self.codec.sample_rate = self.codec_rate
+        self.codec.layout = self.layout
+        self.codec.format = "s16"
+        self.codec.bit_rate = bit_rate
+        self.frame_size = int(self.codec_rate * frame_ms / 1000)
+        self.pending = np.zeros((0, channels), dtype=np.int16)
+        self.pts = 0
+
+    def encode(self, audio):
+        """
+        Args:
+            audio (np.ndarray): Interleaved int16 samples.
+
+        Returns:
+            list: Opus packets (bytes) completed by this call.
+        """
+        audio = np.asarray(audio, dtype=np.int16).reshape(-1, self.channels)
+        if self.resampler is not None:
+            frame = av.AudioFrame.from_ndarray(audio.reshape(1, -1), format="s16", layout=self.layout)
+            frame.sample_rate = self.rate
+            audio = [f.to_ndarray().reshape(-1, self.channels) for f in self.resampler.resample(frame)]
+            audio = np.concatenate(audio) if audio else np.zeros((0, self.channels), dtype=np.int16)
+
+        audio = np.concatenate((self.pending, audio))
+        n_frames = audio.shape[0] // self.frame_size
+        packets = []
+        for i in range(n_frames):
+            block = audio[i * self.frame_size:(i + 1) * self.frame_size]
+            frame = av.AudioFrame.from_ndarray(block.reshape(1, -1), format="s16", layout=self.layout)
+            frame.sample_rate = self.codec_rate
+            frame.pts = self.pts
+            self.pts += self.frame_size
+            packets.extend(bytes(packet) for packet in self.codec.encode(frame))
+        self.pending = audio[n_frames * self.frame_size:]
+        return packets
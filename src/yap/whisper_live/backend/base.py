@@ -1,10 +1,14 @@
+import os
+import re
 import json
 import logging
 import threading
-import time
 import queue
 import numpy as np
 
+from yap.whisper_live.audio_buffer import AudioRingBuffer
+from yap.whisper_live.vad import BatchedVoiceActivityDetection
+
 
 """
 Base class for Transcription Server Clients.
@@ -16,8 +20,14 @@ buffering, and handling transcription results independent of the specific backen
 
 class ServeClientBase(object):
     RATE = 16000
+    MAX_BUFFER_SECONDS = 45
+    DISCARD_BUFFER_SECONDS = 30
     SERVER_READY = "SERVER_READY"
     DISCONNECT = "DISCONNECT"
+    VAD_ENGINE = None
+    VAD_ENGINE_LOCK = threading.Lock()
+    VAD_PAD_SECONDS = 0.5
+    MAX_TRANSCRIPT_SEGMENTS = 1000
 
     client_uid: str
     """A unique identifier for the client."""
@@ -31,6 +41,18 @@ class ServeClientBase(object):
     """Whether to clip audio with no valid segments."""
     same_output_threshold: int
     """Number of repeated outputs before considering it as a valid segment."""
+    min_new_audio: float
+    """Seconds of newly received audio required to wake the transcription loop."""
+    use_vad_gate: bool
+    """Whether to skip transcription passes over audio without voice activity."""
+    vad_threshold: float
+    """Speech probability above which a VAD window counts as voice activity."""
+    delta_segments: bool = False
+    """Send only newly completed segments and the current partial instead of the last N segments."""
+    trans_thread: threading.Thread = None
+    """The client's own transcription loop, or None when the server drives `process_audio_chunk`."""
+    receives_audio: bool = True
+    """Whether the client is fed audio. Clients that only consume segments don't allocate `audio_buffer`."""
 
     def __init__(
         self,
@@ -42,6 +64,9 @@ class ServeClientBase(object):
         same_output_threshold=10,
         translation_queue=None,
         monitor_callback=None,
+        min_new_audio=0.1,
+        use_vad_gate=False,
+        vad_threshold=0.5,
     ):
         self.client_uid = client_uid
         self.websocket = websocket
@@ -50,11 +75,17 @@ class ServeClientBase(object):
         self.clip_audio = clip_audio
         self.same_output_threshold = same_output_threshold
         self.monitor_callback = monitor_callback
+        self.min_new_audio = min_new_audio
+        self.use_vad_gate = use_vad_gate
+        self.vad_threshold = vad_threshold
 
         self.frames = b""
         self.timestamp_offset = 0.0
-        self.frames_np = None
-        self.frames_offset = 0.0
+        self.audio_buffer = AudioRingBuffer(
+            max_seconds=self.MAX_BUFFER_SECONDS,
+            discard_seconds=self.DISCARD_BUFFER_SECONDS,
+            rate=self.RATE,
+        ) if self.receives_audio else None
         self.text = []
         self.current_out = ""
         self.prev_out = ""
@@ -64,8 +95,37 @@ class ServeClientBase(object):
         self.end_time_for_same_output = None
         self.translation_queue = translation_queue
 
+        # completed segments get monotonic ids; the current partial carries the id it will complete with
+        self.next_segment_id = 0
+        self.sent_segment_id = 0
+        # append-only JSONL of every completed segment, see `enable_transcript_log`
+        self.transcript_log = None
+
         # threading
         self.lock = threading.Lock()
+        self.audio_available = threading.Condition(self.lock)
+        self.processed_index = 0
+        self.repeat_interval = 0.1
+
+        # incremental VAD: samples before vad_index were fed to the stream, windows before
+        # evaluated_index were scored, and speech was last seen in the window ending at last_speech_index
+        self.vad_stream = self.get_vad_engine().stream(self.RATE) if use_vad_gate else None
+        # serializes the gate with `cleanup` closing the stream
+        self.vad_lock = threading.Lock()
+        self.vad_index = 0
+        self.evaluated_index = 0
+        self.last_speech_index = 0
+
+    @classmethod
+    def get_vad_engine(cls):
+        """
+        Returns:
+            BatchedVoiceActivityDetection: The VAD engine shared by all connections.
+        """
+        with ServeClientBase.VAD_ENGINE_LOCK:
+            if ServeClientBase.VAD_ENGINE is None:
+                ServeClientBase.VAD_ENGINE = BatchedVoiceActivityDetection(sr=cls.RATE)
+            return ServeClientBase.VAD_ENGINE
 
     def speech_to_text(self):
         """
@@ -87,29 +147,130 @@ class ServeClientBase(object):
                 logging.info("Exiting speech to text thread")
                 break
 
-            if self.frames_np is None:
+            if not self.wait_for_audio():
                 continue
 
-            if self.clip_audio:
-                self.clip_audio_if_no_valid_segment()
+            self.process_audio_chunk()
 
-            input_bytes, duration = self.get_audio_chunk_for_processing()
-            if duration < 1.0:
-                time.sleep(0.1)     # wait for audio chunks to arrive
-                continue
-            try:
-                input_sample = input_bytes.copy()
-                result = self.transcribe_audio(input_sample)
+    def process_audio_chunk(self):
+        """
+        Run a single transcription pass over the audio received since the current timestamp offset.
 
-                if result is None or self.language is None:
-                    self.timestamp_offset += duration
-                    time.sleep(0.25)    # wait for voice activity, result is None when no voice activity
-                    continue
-                self.handle_transcription_output(result, duration)
+        Used by `speech_to_text`, and called directly from the inference executor when the server
+        drives transcription passes itself (asyncio server mode).
+        """
+        # passes already queued on the executor may still run after cleanup
+        if self.exit:
+            return
 
-            except Exception as e:
-                logging.error(f"[ERROR]: Failed to transcribe audio chunk: {e}")
-                time.sleep(0.01)
+        if self.clip_audio:
+            self.clip_audio_if_no_valid_segment()
+
+        if self.vad_stream is not None and self.skip_silence():
+            return
+
+        input_bytes, duration = self.get_audio_chunk_for_processing()
+        if duration < 1.0:
+            return    # wait for more audio chunks to arrive
+        try:
+            result = self.transcribe_audio(input_bytes)
+
+            if result is None or self.language is None:
+                # result is None when no voice activity
+                self.timestamp_offset += duration
+                return
+            self.handle_transcription_output(result, duration)
+
+        except Exception as e:
+            logging.error(f"[ERROR]: Failed to transcribe audio chunk: {e}")
+
+    def update_voice_activity(self):
+        """
+        Run the VAD stream over audio that arrived since the last call.
+
+        Every sample is evaluated once; windows with a speech probability above `vad_threshold`
+        move `last_speech_index` forward.
+
+        Returns:
+            bool: False if the client is exiting and its stream is (about to be) closed.
+        """
+        with self.vad_lock:
+            if self.exit:
+                return False
+
+            with self.lock:
+                start_index = max(self.vad_index, self.audio_buffer.start_index)
+                dropped = start_index > self.vad_index
+                audio = self.audio_buffer.read(start_index)
+                self.vad_index = self.audio_buffer.end_index
+
+            if dropped:
+                # unevaluated audio was dropped from the buffer, the stream state no longer applies
+                self.vad_stream.reset()
+                self.evaluated_index = start_index
+
+            speech_probs = self.vad_stream(audio)
+            window = self.vad_stream.num_samples
+            speech = np.flatnonzero(speech_probs > self.vad_threshold)
+            if speech.shape[0]:
+                self.last_speech_index = self.evaluated_index + (speech[-1] + 1) * window
+            self.evaluated_index += speech_probs.shape[0] * window
+            return True
+
+    def skip_silence(self):
+        """
+        Skip the transcription pass if there was no voice activity since the timestamp offset.
+
+        During silence the timestamp offset is moved up to the evaluated audio, minus
+        `VAD_PAD_SECONDS` so that the onset of the next utterance is kept. Passes are never
+        skipped while an incomplete segment is pending, so it can still be finalized.
+
+        Returns:
+            bool: True if the pass should be skipped.
+        """
+        if not self.update_voice_activity():
+            return True
+        if self.current_out:
+            return False
+
+        with self.lock:
+            if self.last_speech_index > self.audio_buffer.index_for_time(self.timestamp_offset):
+                return False
+            self.processed_index = self.vad_index
+            silence_end = (self.evaluated_index / self.RATE) - self.VAD_PAD_SECONDS
+            if silence_end > self.timestamp_offset:
+                self.timestamp_offset = silence_end
+        return True
+
+    def wait_for_audio(self):
+        """
+        Block until enough new audio has arrived to make another transcription pass worthwhile.
+
+        The loop is woken by `add_frames` once at least `min_new_audio` seconds of audio arrived
+        since the last pass, or by `cleanup`. While an incomplete segment is pending, the wait is
+        bounded by `repeat_interval` so the repeated-output logic can still finalize it when the
+        client stops sending audio.
+
+        Returns:
+            bool: True if there is audio to process, False if woken without any (e.g. on exit).
+        """
+        with self.audio_available:
+            self.audio_available.wait_for(
+                lambda: self.exit or self._has_new_audio(),
+                timeout=self.repeat_interval if self.current_out else None,
+            )
+            return not self.exit and len(self.audio_buffer) > 0
+
+    def has_new_audio(self):
+        """
+        Whether at least `min_new_audio` seconds of audio arrived since the last transcription pass.
+        """
+        with self.lock:
+            return self._has_new_audio()
+
+    def _has_new_audio(self):
+        min_samples = max(1, int(self.min_new_audio * self.RATE))
+        return self.audio_buffer.end_index - self.processed_index >= min_samples
 
     def transcribe_audio(self, input_sample):
         """
@@ -159,51 +320,44 @@ class ServeClientBase(object):
         Add audio frames to the ongoing audio stream buffer.
 
         This method is responsible for maintaining the audio stream buffer, allowing the continuous addition
-        of audio frames as they are received. It also ensures that the buffer does not exceed a specified size
-        to prevent excessive memory usage.
+        of audio frames as they are received. The buffer is a preallocated `AudioRingBuffer`, so appending
+        a frame only copies the frame itself.
 
-        If the buffer size exceeds a threshold (45 seconds of audio data), it discards the oldest 30 seconds
-        of audio data to maintain a reasonable buffer size. If the buffer is empty, it initializes it with the provided
-        audio frame. The audio stream buffer is used for real-time processing of audio data for transcription.
+        If the buffer would exceed `MAX_BUFFER_SECONDS` (45 seconds of audio data), the oldest
+        `DISCARD_BUFFER_SECONDS` (30 seconds) are discarded to keep memory bounded. Once at least
+        `min_new_audio` seconds of unprocessed audio are buffered, the transcription loop is woken.
 
         Args:
             frame_np (numpy.ndarray): The audio frame data as a NumPy array.
 
         """
-        self.lock.acquire()
-        if self.frames_np is not None and self.frames_np.shape[0] > 45*self.RATE:
-            self.frames_offset += 30.0
-            self.frames_np = self.frames_np[int(30*self.RATE):]
-            # check timestamp offset(should be >= self.frame_offset)
-            # this basically means that there is no speech as timestamp offset hasnt updated
-            # and is less than frame_offset
-            if self.timestamp_offset < self.frames_offset:
-                self.timestamp_offset = self.frames_offset
-        if self.frames_np is None:
-            self.frames_np = frame_np.copy()
-        else:
-            self.frames_np = np.concatenate((self.frames_np, frame_np), axis=0)
-        self.lock.release()
+        with self.lock:
+            if self.audio_buffer.append(frame_np):
+                # check timestamp offset(should be >= the buffer start)
+                # this basically means that there is no speech as timestamp offset hasnt updated
+                # and is less than the start of the retained audio
+                if self.timestamp_offset < self.audio_buffer.start_time:
+                    self.timestamp_offset = self.audio_buffer.start_time
+            if self._has_new_audio():
+                self.audio_available.notify_all()
 
     def clip_audio_if_no_valid_segment(self):
         """
         Update the timestamp offset based on audio buffer status.
-        Clip audio if the current chunk exceeds 30 seconds, this basically implies that
-        no valid segment for the last 30 seconds from whisper
+        Clip audio if the current chunk exceeds 25 seconds, this basically implies that
+        no valid segment for the last 25 seconds from whisper
         """
         with self.lock:
-            if self.frames_np[int((self.timestamp_offset - self.frames_offset)*self.RATE):].shape[0] > 25 * self.RATE:
-                duration = self.frames_np.shape[0] / self.RATE
-                self.timestamp_offset = self.frames_offset + duration - 5
+            start_index = self.audio_buffer.index_for_time(self.timestamp_offset)
+            if self.audio_buffer.samples_since(start_index) > 25 * self.RATE:
+                self.timestamp_offset = self.audio_buffer.end_time - 5
 
     def get_audio_chunk_for_processing(self):
         """
         Retrieves the next chunk of audio data for processing based on the current offsets.
 
-        Calculates which part of the audio data should be processed next, based on
-        the difference between the current timestamp offset and the frame's offset, scaled by
-        the audio sample rate (RATE). It then returns this chunk of audio data along with its
-        duration in seconds.
+        Converts the current timestamp offset into a sample index on the audio buffer and
+        returns a copy of all audio from that point onwards, along with its duration in seconds.
 
         Returns:
             tuple: A tuple containing:
@@ -211,8 +365,9 @@ class ServeClientBase(object):
                 - duration (float): The duration of the audio chunk in seconds.
         """
         with self.lock:
-            samples_take = max(0, (self.timestamp_offset - self.frames_offset) * self.RATE)
-            input_bytes = self.frames_np[int(samples_take):].copy()
+            start_index = self.audio_buffer.index_for_time(self.timestamp_offset)
+            input_bytes = self.audio_buffer.read(start_index)
+            self.processed_index = self.audio_buffer.end_index
         duration = input_bytes.shape[0] / self.RATE
         return input_bytes, duration
 
@@ -225,6 +380,10 @@ class ServeClientBase(object):
         recent segment of text if provided (which is considered incomplete because of the possibility
         of the last word being truncated in the audio chunk).
 
+        With `delta_segments`, only the completed segments that were not sent yet are included,
+        so the payload grows with the new text rather than with `send_last_n_segments`. Clients
+        merge segments by their `id` and replace the previous partial with the new one.
+
         Args:
             last_segment (str, optional): The most recent segment of transcribed text to be added
                                           to the list of segments. Defaults to None.
@@ -233,14 +392,63 @@ class ServeClientBase(object):
             list: A list of transcribed text segments to be sent to the client.
         """
         segments = []
-        if len(self.transcript) >= self.send_last_n_segments:
+        if self.delta_segments:
+            new_segments = min(self.next_segment_id - self.sent_segment_id, len(self.transcript))
+            if new_segments:
+                segments = self.transcript[-new_segments:]
+            self.sent_segment_id = self.next_segment_id
+        elif len(self.transcript) >= self.send_last_n_segments:
             segments = self.transcript[-self.send_last_n_segments:].copy()
         else:
             segments = self.transcript.copy()
         if last_segment is not None:
+            last_segment.setdefault("id", self.next_segment_id)
             segments = segments + [last_segment]
         return segments
 
+    def add_completed_segment(self, segment):
+        """
+        Assign the next segment id to a completed segment and append it to the transcript.
+
+        Args:
+            segment (dict): The completed segment.
+
+        Returns:
+            dict: The segment, with its `id` set.
+        """
+        segment["id"] = self.next_segment_id
+        self.next_segment_id += 1
+        self.transcript.append(segment)
+        # only the most recent segments are kept in memory, the full history goes to the log
+        if len(self.transcript) > self.MAX_TRANSCRIPT_SEGMENTS:
+            del self.transcript[:-self.MAX_TRANSCRIPT_SEGMENTS]
+        if self.transcript_log is not None:
+            try:
+                self.transcript_log.write(json.dumps(segment) + "\n")
+            except (OSError, ValueError) as e:
+                logging.error(f"[ERROR]: Writing transcript log: {e}")
+        return segment
+
+    @staticmethod
+    def transcript_log_path(directory, client_uid):
+        """
+        Path of the transcript log for `client_uid`, with the uid reduced to a safe file name.
+        """
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", str(client_uid)).lstrip(".") or "client"
+        return os.path.join(os.path.expanduser(directory), f"{name}.jsonl")
+
+    def enable_transcript_log(self, directory):
+        """
+        Append every completed segment of this connection to `<directory>/<client_uid>.jsonl`.
+
+        Args:
+            directory (str): Directory holding the transcript logs.
+        """
+        path = self.transcript_log_path(directory, self.client_uid)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # line buffered, so the log is readable while the session is running
+        self.transcript_log = open(path, "a", encoding="utf-8", buffering=1)
+
     def get_audio_chunk_duration(self, input_bytes):
         """
         Calculates the duration of the provided audio chunk.
@@ -305,7 +513,14 @@ class ServeClientBase(object):
 
         """
         logging.info("Cleaning up.")
-        self.exit = True
+        with self.audio_available:
+            self.exit = True
+            self.audio_available.notify_all()
+        if self.vad_stream is not None:
+            with self.vad_lock:
+                self.vad_stream.close()
+        if self.transcript_log is not None:
+            self.transcript_log.close()
     
     def get_segment_no_speech_prob(self, segment):
         return getattr(segment, "no_speech_prob", 0)
@@ -345,8 +560,8 @@ class ServeClientBase(object):
                     continue
                 if self.get_segment_no_speech_prob(s) > self.no_speech_thresh:
                     continue
-                completed_segment = self.format_segment(start, end, text_, completed=True)
-                self.transcript.append(completed_segment)
+                completed_segment = self.add_completed_segment(
+                    self.format_segment(start, end, text_, completed=True))
 
                 if self.translation_queue:
                     try:
@@ -374,7 +589,6 @@ class ServeClientBase(object):
             # audio that is not yet transcribed. So, capturing the time when it was repeated for the first time.
             if self.end_time_for_same_output is None:
                 self.end_time_for_same_output = self.get_segment_end(segments[-1])
-            time.sleep(0.1)  # wait briefly for any new voice activity
         else:
             self.same_output_count = 0
             self.end_time_for_same_output = None
@@ -385,13 +599,12 @@ class ServeClientBase(object):
             if not self.text or self.text[-1].strip().lower() != self.current_out.strip().lower():
                 self.text.append(self.current_out)
                 with self.lock:
-                    completed_segment = self.format_segment(
+                    completed_segment = self.add_completed_segment(self.format_segment(
                         self.timestamp_offset,
                         self.timestamp_offset + min(duration, self.end_time_for_same_output),
                         self.current_out,
                         completed=True
-                    )
-                    self.transcript.append(completed_segment)
+                    ))
 
                     if self.translation_queue:
                         try:
@@ -411,4 +624,7 @@ class ServeClientBase(object):
             with self.lock:
                 self.timestamp_offset += offset
 
+        if len(self.text) > self.MAX_TRANSCRIPT_SEGMENTS:
+            del self.text[:-self.MAX_TRANSCRIPT_SEGMENTS]
+
         return last_segment
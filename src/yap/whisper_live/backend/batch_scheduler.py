@@ -0,0 +1,175 @@
+import logging
+import threading
+
+import numpy as np
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
+from faster_whisper.transcribe import (
+    BatchedInferencePipeline,
+    Segment,
+    TranscriptionOptions,
+    get_suppressed_tokens,
+)
+
+from yap.whisper_live.backend.batching import BatchRequest, BatchScheduler
+
+
+"""
+Cross-client batched inference for the faster_whisper backend.
+
+Clients sharing the preloaded model submit their audio chunks to a single
+`BatchedInferenceScheduler`, which groups pending chunks into batches and decodes
+each batch with one CTranslate2 forward pass.
+"""
+
+
+class InferenceRequest(BatchRequest):
+    """A single client's audio chunk waiting to be decoded."""
+
+    def __init__(self, audio, language, task, initial_prompt):
+        super().__init__()
+        self.audio = audio
+        self.language = language
+        self.task = task
+        self.initial_prompt = initial_prompt
+
+    @property
+    def key(self):
+        """Requests can only share a batch if they share a tokenizer and prompt."""
+        return (self.language, self.task, self.initial_prompt)
+
+
+class BatchedInferenceScheduler(BatchScheduler):
+    """
+    Decodes audio chunks from all clients sharing the preloaded model in batches.
+
+    Chunks that cannot be batched (unknown language, or audio longer than the 30 second
+    Whisper window) fall back to a regular sequential `WhisperModel.transcribe` call.
+    """
+
+    name = "Batched inference"
+
+    def __init__(self, model, max_batch_size=8, max_wait_ms=10, model_lock=None):
+        """
+        Args:
+            model (WhisperModel): The shared faster-whisper model.
+            max_batch_size (int): Maximum number of chunks decoded in one forward pass. Defaults to 8.
+            max_wait_ms (float): Maximum time to wait for a batch to fill. Defaults to 10.
+            model_lock (threading.Lock, optional): Lock serialising access to `model`.
+        """
+        self.model = model
+        self.pipeline = BatchedInferencePipeline(model)
+        self.model_lock = model_lock or threading.Lock()
+        self.sampling_rate = model.feature_extractor.sampling_rate
+        self.max_samples = model.feature_extractor.n_samples
+        super().__init__(max_batch_size, max_wait_ms)
+        logging.info(f"Batched inference enabled (max_batch_size={max_batch_size}, max_wait_ms={max_wait_ms})")
+
+    def transcribe(self, audio, language=None, task="transcribe", initial_prompt=None, vad_parameters=None):
+        """
+        Transcribe an audio chunk, batching it with chunks from other clients when possible.
+
+        Args:
+            audio (np.ndarray): 16 kHz float32 audio chunk.
+            language (str, optional): Language code. Chunks without a language are not batched.
+            task (str): "transcribe" or "translate". Defaults to "transcribe".
+            initial_prompt (str, optional): Prompt for whisper inference. Defaults to None.
+            vad_parameters (dict, optional): Silero VAD parameters for chunks decoded with the
+                sequential fallback, or None to disable VAD. Batched chunks are not filtered;
+                clients skip silent chunks with their VAD gate before submitting them.
+
+        Returns:
+            tuple: A list of `Segment` objects and the `TranscriptionInfo` (None for batched chunks).
+        """
+        if language is None or audio.shape[0] > self.max_samples:
+            with self.model_lock:
+                segments, info = self.model.transcribe(
+                    audio,
+                    initial_prompt=initial_prompt,
+                    language=language,
+                    task=task,
+                    vad_filter=vad_parameters is not None,
+                    vad_parameters=vad_parameters)
+                return list(segments), info
+
+        return self.submit(InferenceRequest(audio, language, task, initial_prompt)), None
+
+    def process_batch(self, requests):
+        """
+        Decode a group of requests sharing the same tokenizer in a single forward pass.
+
+        Args:
+            requests (list): `InferenceRequest` objects with an identical `key`.
+        """
+        language, task, initial_prompt = requests[0].key
+        tokenizer = Tokenizer(
+            self.model.hf_tokenizer,
+            self.model.model.is_multilingual,
+            task=task,
+            language=language,
+        )
+        options = self.transcription_options(tokenizer, initial_prompt)
+        features = np.stack([
+            pad_or_trim(self.model.feature_extractor(request.audio)[..., :-1])
+            for request in requests
+        ])
+        chunks_metadata = [
+            {"offset": 0.0, "duration": request.audio.shape[0] / self.sampling_rate, "segments": []}
+            for request in requests
+        ]
+        with self.model_lock:
+            outputs = self.pipeline.forward(features, tokenizer, chunks_metadata, options)
+
+        for request, output in zip(requests, outputs):
+            request.result = [
+                Segment(
+                    id=i,
+                    seek=segment["seek"],
+                    start=round(segment["start"], 3),
+                    end=round(segment["end"], 3),
+                    text=segment["text"],
+                    tokens=segment["tokens"],
+                    avg_logprob=segment["avg_logprob"],
+                    compression_ratio=segment["compression_ratio"],
+                    no_speech_prob=segment["no_speech_prob"],
+                    words=None,
+                    temperature=options.temperatures[0],
+                )
+                for i, segment in enumerate(output, 1)
+            ]
+
+    def transcription_options(self, tokenizer, initial_prompt):
+        """
+        Build decoding options matching `WhisperModel.transcribe` defaults for streaming use.
+
+        Timestamps are kept so that the chunk can be split into segments, and only the first
+        temperature is used since batched decoding has no temperature fallback.
+        """
+        return TranscriptionOptions(
+            beam_size=5,
+            best_of=5,
+            patience=1,
+            length_penalty=1,
+            repetition_penalty=1,
+            no_repeat_ngram_size=0,
+            log_prob_threshold=-1.0,
+            no_speech_threshold=0.6,
+            compression_ratio_threshold=2.4,
+            condition_on_previous_text=False,
+            prompt_reset_on_temperature=0.5,
+            temperatures=[0.0],
+            initial_prompt=initial_prompt,
+            prefix=None,
+            suppress_blank=True,
+            suppress_tokens=get_suppressed_tokens(tokenizer, [-1]),
+            without_timestamps=False,
+            max_initial_timestamp=1.0,
+            word_timestamps=False,
+            prepend_punctuations="\"'“¿([{-",
+            append_punctuations="\"'.。,，!！?？:：”)]}、",
+            multilingual=False,
+            max_new_tokens=None,
+            clip_timestamps="0",
+            hallucination_silence_threshold=None,
+            hotwords=None,
+        )
@@ -0,0 +1,128 @@
+import logging
+import queue
+import threading
+import time
+
+
+"""
+Shared worker for cross-client batching.
+
+Client threads submit requests to a `BatchScheduler`, whose worker thread gathers pending
+requests into batches, groups them by `BatchRequest.key` and hands each group to the
+subclass's `process_batch`. Used for both whisper inference and translation.
+"""
+
+
+class BatchRequest:
+    """A single unit of work waiting for the batch worker."""
+
+    def __init__(self):
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    @property
+    def key(self):
+        """Requests are only processed in the same batch if their keys are equal."""
+        return None
+
+
+class BatchScheduler:
+    """
+    Base class for schedulers batching requests from all client threads.
+
+    `submit` blocks the calling client thread until its request has been processed, so
+    results flow back into the caller as if it had done the work itself. The worker waits at
+    most `max_wait_ms` after the first pending request for the batch to fill up to
+    `max_batch_size`. Subclasses implement `process_batch`.
+    """
+
+    name = "Batch"
+    """Shown in the worker's log messages."""
+
+    def __init__(self, max_batch_size, max_wait_ms):
+        """
+        Args:
+            max_batch_size (int): Maximum number of requests processed in one batch.
+            max_wait_ms (float): Maximum time to wait for a batch to fill.
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.requests = queue.Queue()
+        self.exit = False
+
+        self.worker = threading.Thread(target=self.process_requests, daemon=True)
+        self.worker.start()
+
+    def submit(self, request):
+        """
+        Queue a request and wait until the worker has processed it.
+
+        Returns:
+            The request's result.
+
+        Raises:
+            Exception: The error raised while processing the request's batch.
+        """
+        self.requests.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def process_requests(self):
+        """Worker loop: gather pending requests into batches and process them."""
+        while not self.exit:
+            try:
+                request = self.requests.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if request is None:
+                break
+
+            batch = [request]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    # take whatever is already queued even once the deadline has passed
+                    request = self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    self.exit = True
+                    break
+                batch.append(request)
+
+            groups = {}
+            for request in batch:
+                groups.setdefault(request.key, []).append(request)
+            for requests in groups.values():
+                self.run_batch(requests)
+
+        logging.info(f"{self.name} worker stopped")
+
+    def run_batch(self, requests):
+        """Process one group, handing any error to every request in it."""
+        try:
+            self.process_batch(requests)
+        except Exception as e:
+            logging.error(f"[ERROR]: {self.name} failed: {e}")
+            for request in requests:
+                request.error = e
+        finally:
+            for request in requests:
+                request.done.set()
+
+    def process_batch(self, requests):
+        """
+        Process a group of requests sharing the same `key`, setting each request's `result`.
+
+        Args:
+            requests (list): `BatchRequest` objects with an identical `key`.
+        """
+        raise NotImplementedError
+
+    def stop(self):
+        """Stop the worker thread once pending requests have been processed."""
+        self.requests.put(None)
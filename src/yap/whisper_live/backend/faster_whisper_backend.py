@@ -8,11 +8,40 @@ from huggingface_hub import snapshot_download
 
 from faster_whisper import WhisperModel
 from yap.whisper_live.backend.base import ServeClientBase
+from yap.whisper_live.backend.batch_scheduler import BatchedInferenceScheduler
+from yap.whisper_live.backend.model_pool import WhisperModelPool
 
 
 class ServeClientFasterWhisper(ServeClientBase):
     SINGLE_MODEL = None
     SINGLE_MODEL_LOCK = threading.Lock()
+    SINGLE_MODEL_CONFIG = None
+    BATCH_SCHEDULER = None
+    MODEL_POOL = None
+    MODEL_POOL_LOCK = threading.Lock()
+    # extra WhisperModel arguments for every model this process loads, see `configure_models`
+    MODEL_OPTIONS = {}
+
+    @classmethod
+    def configure_models(cls, cpu_threads=None, num_workers=None, device_index=None):
+        """
+        Set the CTranslate2 threading and placement options used for every model load.
+
+        Call before `preload_model`; options left as None keep the CTranslate2 defaults.
+
+        Args:
+            cpu_threads (int, optional): Threads per decode on CPU (intra_threads), 0 for
+                CTranslate2's default.
+            num_workers (int, optional): Decodes a model can run in parallel (inter_threads),
+                per device.
+            device_index (int or list, optional): GPU to load models on, or a list of GPUs
+                to place one replica on each. Ignored on CPU.
+        """
+        cls.MODEL_OPTIONS.update(
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+            device_index=device_index,
+        )
 
     @classmethod
     def preload_model(cls, model_size, device=None, compute_type=None):
@@ -44,13 +73,68 @@ class ServeClientFasterWhisper(ServeClientBase):
                 cls.SINGLE_MODEL = WhisperModel(
                     model_size,
                     device=device,
-                    compute_type=compute_type
+                    compute_type=compute_type,
+                    **WhisperModelPool.model_kwargs(cls.MODEL_OPTIONS, device),
                 )
+                cls.SINGLE_MODEL_CONFIG = (model_size, device, compute_type)
                 logging.debug("Model loaded.")
             except Exception as e:
                 logging.error(f"Failed to load model: {e}")
                 raise e
 
+    @classmethod
+    def get_model_pool(cls, max_models=None, max_memory_mb=None, max_concurrency=None):
+        """
+        Returns the process-wide `WhisperModelPool`, creating it on first use.
+
+        The pool holds every model other than the preloaded one (which is registered as a
+        pinned entry) and is shared by websocket clients, the REST API and batch jobs.
+
+        Args:
+            max_models (int, optional): New bound on the number of unpinned models.
+            max_memory_mb (float, optional): New memory budget for all pooled models.
+            max_concurrency (int, optional): New number of concurrent decodes per model, applied
+                to models whose slot has not been created yet.
+        """
+        with cls.MODEL_POOL_LOCK:
+            if cls.MODEL_POOL is None:
+                cls.MODEL_POOL = WhisperModelPool(model_options=cls.MODEL_OPTIONS)
+                if cls.SINGLE_MODEL is not None:
+                    model, device, compute_type = cls.SINGLE_MODEL_CONFIG
+                    cls.MODEL_POOL.add(model, device, compute_type, cls.SINGLE_MODEL, pinned=True)
+            pool = cls.MODEL_POOL
+        with pool.lock:
+            if max_models is not None:
+                pool.max_models = max_models
+            if max_memory_mb is not None:
+                pool.max_memory_mb = max_memory_mb
+            if max_concurrency is not None:
+                pool.max_concurrency = max_concurrency
+        return pool
+
+    @classmethod
+    def get_batch_scheduler(cls, max_batch_size, max_wait_ms):
+        """
+        Returns the process-wide batch scheduler for the shared model, creating it on first use.
+        """
+        with cls.SINGLE_MODEL_LOCK:
+            if cls.BATCH_SCHEDULER is None:
+                cls.BATCH_SCHEDULER = BatchedInferenceScheduler(
+                    cls.SINGLE_MODEL,
+                    max_batch_size=max_batch_size,
+                    max_wait_ms=max_wait_ms,
+                    model_lock=cls.get_model_pool().slot(*cls.SINGLE_MODEL_CONFIG),
+                )
+            return cls.BATCH_SCHEDULER
+
+    @classmethod
+    def stop_batch_scheduler(cls):
+        """Stop the process-wide batch scheduler's worker, if one was started."""
+        with cls.SINGLE_MODEL_LOCK:
+            if cls.BATCH_SCHEDULER is not None:
+                cls.BATCH_SCHEDULER.stop()
+                cls.BATCH_SCHEDULER = None
+
     def __init__(
         self,
         websocket,
@@ -70,6 +154,10 @@ class ServeClientFasterWhisper(ServeClientBase):
         cache_path="~/.cache/whisper-live/",
         translation_queue=None,
         monitor_callback=None,
+        max_batch_size=1,
+        max_batch_wait_ms=10,
+        min_new_audio=0.1,
+        start_thread=True,
     ):
         super().__init__(
             client_uid,
@@ -79,7 +167,11 @@ class ServeClientFasterWhisper(ServeClientBase):
             clip_audio,
             same_output_threshold,
             translation_queue,
-            monitor_callback
+            monitor_callback,
+            min_new_audio,
+            # skip whisper entirely while the connection is silent
+            use_vad_gate=use_vad,
+            vad_threshold=(vad_parameters or {}).get("threshold", 0.5),
         )
         self.cache_path = cache_path
         self.model_sizes = [
@@ -94,6 +186,9 @@ class ServeClientFasterWhisper(ServeClientBase):
         self.task = task
         self.initial_prompt = initial_prompt
         self.vad_parameters = vad_parameters or {"threshold": 0.5}
+        self.batch_scheduler = None
+        self.pooled_model = None
+        self.model_slot = None
 
         device = "cuda" if torch.cuda.is_available() else "cpu"
         if device == "cuda":
@@ -107,14 +202,28 @@ class ServeClientFasterWhisper(ServeClientBase):
         logging.debug(f"Device={device} Precision={self.compute_type}")
     
         try:
-            if single_model:
+            single_config = ServeClientFasterWhisper.SINGLE_MODEL_CONFIG
+            if single_model and (single_config is None or single_config[0] == self.model_size_or_path):
                 if ServeClientFasterWhisper.SINGLE_MODEL is None:
                     self.create_model(device)
                     ServeClientFasterWhisper.SINGLE_MODEL = self.transcriber
+                    ServeClientFasterWhisper.SINGLE_MODEL_CONFIG = (
+                        self.model_size_or_path, device, self.compute_type)
+                    self.get_model_pool().add(
+                        self.model_size_or_path, device, self.compute_type, self.transcriber, pinned=True)
                 else:
                     self.transcriber = ServeClientFasterWhisper.SINGLE_MODEL
+                self.model_slot = self.get_model_pool().slot(*ServeClientFasterWhisper.SINGLE_MODEL_CONFIG)
+                if max_batch_size > 1:
+                    self.batch_scheduler = ServeClientFasterWhisper.get_batch_scheduler(
+                        max_batch_size, max_batch_wait_ms)
             else:
-                self.create_model(device)
+                # any other model is shared through the pool by all clients asking for it
+                model_key = (self.model_size_or_path, device, self.compute_type)
+                self.transcriber = self.get_model_pool().acquire(
+                    *model_key, loader=lambda: self.load_model(device))
+                self.pooled_model = model_key
+                self.model_slot = self.get_model_pool().slot(*model_key)
         except Exception as e:
             logging.error(f"Failed to load model: {e}")
             self.websocket.send(json.dumps({
@@ -127,9 +236,11 @@ class ServeClientFasterWhisper(ServeClientBase):
 
         self.use_vad = use_vad
 
-        # threading
-        self.trans_thread = threading.Thread(target=self.speech_to_text)
-        self.trans_thread.start()
+        # threading; when start_thread is False the server schedules transcription passes itself
+        self.trans_thread = None
+        if start_thread:
+            self.trans_thread = threading.Thread(target=self.speech_to_text)
+            self.trans_thread.start()
         self.websocket.send(
             json.dumps(
                 {
@@ -140,7 +251,54 @@ class ServeClientFasterWhisper(ServeClientBase):
             )
         )
 
+    @staticmethod
+    def convert_model(model_dir, model_ref, cache_path, quantization=None, copy_files=None,
+                      cache_dir="whisper-ct2-models", converter_class=None):
+        """
+        Convert a Transformers checkpoint to CTranslate2, reusing an earlier conversion if present.
+
+        Args:
+            model_dir (str): Local directory of the Transformers checkpoint.
+            model_ref (str): Model name or HuggingFace id, used to name the converted model.
+            cache_path (str): Root of the conversion cache.
+            quantization (str, optional): CTranslate2 quantization applied to the weights.
+            copy_files (list, optional): Files copied from `model_dir` next to the converted model.
+            cache_dir (str): Subdirectory of `cache_path` holding converted models.
+            converter_class (type, optional): Converter to use. Defaults to
+                `ctranslate2.converters.TransformersConverter`.
+
+        Returns:
+            str: Directory of the converted model.
+        """
+        cache_root = os.path.expanduser(os.path.join(cache_path, cache_dir))
+        os.makedirs(cache_root, exist_ok=True)
+        safe_name = model_ref.replace("/", "--")
+        ct2_dir = os.path.join(cache_root, safe_name)
+
+        if not ctranslate2.contains_model(ct2_dir):
+            logging.debug(f"Converting '{model_ref}' to CTranslate2 @ {ct2_dir}")
+            converter_class = converter_class or ctranslate2.converters.TransformersConverter
+            ct2_converter = converter_class(
+                model_dir,
+                copy_files=copy_files,
+            )
+            ct2_converter.convert(
+                output_dir=ct2_dir,
+                quantization=quantization,
+                force=False,  # skip if already up-to-date
+            )
+        return ct2_dir
+
     def create_model(self, device):
+        self.transcriber = self.load_model(device)
+
+    def load_model(self, device):
+        """
+        Load `model_size_or_path`, converting HuggingFace checkpoints to CTranslate2 if needed.
+
+        Returns:
+            WhisperModel: The loaded model.
+        """
         model_ref = self.model_size_or_path
 
         if model_ref in self.model_sizes:
@@ -157,30 +315,21 @@ class ServeClientFasterWhisper(ServeClientBase):
                 if ctranslate2.contains_model(local_snapshot):
                     model_to_load = local_snapshot
                 else:
-                    cache_root = os.path.expanduser(os.path.join(self.cache_path, "whisper-ct2-models/"))
-                    os.makedirs(cache_root, exist_ok=True)
-                    safe_name = model_ref.replace("/", "--")
-                    ct2_dir = os.path.join(cache_root, safe_name)
-
-                    if not ctranslate2.contains_model(ct2_dir):
-                        logging.debug(f"Converting '{model_ref}' to CTranslate2 @ {ct2_dir}")
-                        ct2_converter = ctranslate2.converters.TransformersConverter(
-                            local_snapshot, 
-                            copy_files=["tokenizer.json", "preprocessor_config.json"]
-                        )
-                        ct2_converter.convert(
-                            output_dir=ct2_dir,
-                            quantization=self.compute_type,
-                            force=False,  # skip if already up-to-date
-                        )
-                    model_to_load = ct2_dir
+                    model_to_load = self.convert_model(
+                        local_snapshot,
+                        model_ref,
+                        self.cache_path,
+                        quantization=self.compute_type,
+                        copy_files=["tokenizer.json", "preprocessor_config.json"],
+                    )
 
         logging.debug(f"Loading model: {model_to_load}")
-        self.transcriber = WhisperModel(
+        return WhisperModel(
             model_to_load,
             device=device,
             compute_type=self.compute_type,
             local_files_only=False,
+            **WhisperModelPool.model_kwargs(self.MODEL_OPTIONS, device),
         )
 
     def set_language(self, info):
@@ -191,22 +340,42 @@ class ServeClientFasterWhisper(ServeClientBase):
                 {"uid": self.client_uid, "language": self.language, "language_prob": info.language_probability}))
 
     def transcribe_audio(self, input_sample):
-        if ServeClientFasterWhisper.SINGLE_MODEL:
-            ServeClientFasterWhisper.SINGLE_MODEL_LOCK.acquire()
-        result, info = self.transcriber.transcribe(
-            input_sample,
-            initial_prompt=self.initial_prompt,
-            language=self.language,
-            task=self.task,
-            vad_filter=self.use_vad,
-            vad_parameters=self.vad_parameters if self.use_vad else None)
-        if ServeClientFasterWhisper.SINGLE_MODEL:
-            ServeClientFasterWhisper.SINGLE_MODEL_LOCK.release()
+        # the incremental gate only skips passes over silence; Silero still trims leading,
+        # trailing and embedded silence from the windows that are decoded
+        vad_parameters = self.vad_parameters if self.use_vad else None
+
+        if self.batch_scheduler is not None:
+            result, info = self.batch_scheduler.transcribe(
+                input_sample,
+                language=self.language,
+                task=self.task,
+                initial_prompt=self.initial_prompt,
+                vad_parameters=vad_parameters)
+            if self.language is None and info is not None:
+                self.set_language(info)
+            return result
+
+        # segments are decoded lazily, so consume them while holding the model slot
+        with self.model_slot:
+            result, info = self.transcriber.transcribe(
+                input_sample,
+                initial_prompt=self.initial_prompt,
+                language=self.language,
+                task=self.task,
+                vad_filter=self.use_vad,
+                vad_parameters=vad_parameters)
+            result = list(result)
 
         if self.language is None and info is not None:
             self.set_language(info)
         return result
 
+    def cleanup(self):
+        super().cleanup()
+        if self.pooled_model is not None:
+            self.get_model_pool().release(*self.pooled_model)
+            self.pooled_model = None
+
     def handle_transcription_output(self, result, duration):
         segments = []
         result = list(result)
@@ -0,0 +1,248 @@
+import os
+import logging
+import threading
+from collections import OrderedDict
+
+from faster_whisper import WhisperModel
+
+
+"""
+Process-wide pool of loaded faster-whisper models.
+
+Models are keyed by (model, device, compute_type) so that callers asking for the same
+configuration share one instance instead of paying the load cost on every request.
+"""
+
+
+# approximate parameter counts in millions, matched against the model name in this order
+MODEL_PARAMETERS = (
+    ("distil-large", 756),
+    ("distil-medium", 394),
+    ("distil-small", 166),
+    ("turbo", 809),
+    ("large", 1550),
+    ("medium", 769),
+    ("small", 244),
+    ("base", 74),
+    ("tiny", 39),
+)
+
+BYTES_PER_PARAMETER = {
+    "float32": 4,
+    "float16": 2,
+    "bfloat16": 2,
+    "int8": 1,
+    "int8_float32": 1,
+    "int8_float16": 1,
+    "int8_bfloat16": 1,
+}
+
+
+class WhisperModelPool:
+    """
+    Bounded LRU cache of `WhisperModel` instances.
+
+    Pinned models (such as the daemon's preloaded model) are never evicted and do not
+    count towards `max_models`. When a new unpinned model would exceed the bound, the
+    least recently used unpinned model is dropped.
+
+    Long-lived users such as websocket clients `acquire` a model and `release` it when they
+    are done; a model is only evicted while nobody holds it. With `max_memory_mb`, models
+    are also evicted before loading one that would push the estimated resident size of all
+    models over the budget (see `estimate_memory_mb`).
+
+    Callers bound concurrent decodes on a model with its `slot` semaphore.
+    """
+
+    def __init__(self, max_models=2, max_memory_mb=None, max_concurrency=1, model_options=None):
+        """
+        Args:
+            max_models (int): Maximum number of unpinned models kept loaded. Defaults to 2.
+            max_memory_mb (float, optional): Memory budget for all loaded models, in MB.
+                Defaults to None (no budget).
+            max_concurrency (int): Number of decodes allowed to run on one model at the same
+                time. Defaults to 1.
+            model_options (dict, optional): Extra `WhisperModel` arguments for models the pool
+                loads itself (cpu_threads, num_workers, device_index), see `model_kwargs`.
+        """
+        self.max_models = max_models
+        self.max_memory_mb = max_memory_mb
+        self.max_concurrency = max_concurrency
+        self.model_options = model_options if model_options is not None else {}
+        self.slots = {}
+        self.models = OrderedDict()
+        self.pinned = set()
+        self.refs = {}
+        self.memory = {}
+        self.lock = threading.Lock()
+        self.loading = {}
+
+    @staticmethod
+    def make_key(model, device, compute_type):
+        return (model, device, compute_type)
+
+    @staticmethod
+    def model_kwargs(model_options, device):
+        """
+        `WhisperModel` keyword arguments from `model_options` that apply to `device`.
+
+        `device_index` (an int, or a list of GPUs to place one replica on each) only
+        applies to CUDA and is dropped for CPU models.
+        """
+        kwargs = {key: value for key, value in model_options.items() if value is not None}
+        if device != "cuda":
+            kwargs.pop("device_index", None)
+        return kwargs
+
+    @staticmethod
+    def estimate_memory_mb(model, compute_type):
+        """
+        Rough resident size of a model: parameter count times the bytes per weight.
+
+        The parameter count is looked up from the model size in the name or, for converted
+        models on disk, taken from the size of `model.bin`. Unknown models are assumed to be
+        as large as large-v3.
+        """
+        name = os.path.basename(str(model).rstrip("/")).lower()
+        for size, parameters in MODEL_PARAMETERS:
+            if size in name:
+                return parameters * BYTES_PER_PARAMETER.get(compute_type, 2)
+        model_file = os.path.join(str(model), "model.bin")
+        if os.path.isfile(model_file):
+            return os.path.getsize(model_file) / 2 ** 20
+        return dict(MODEL_PARAMETERS)["large"] * BYTES_PER_PARAMETER.get(compute_type, 2)
+
+    def add(self, model, device, compute_type, instance, pinned=False):
+        """
+        Register an already loaded model, e.g. the preloaded singleton.
+
+        Args:
+            model (str): Model size, path or HuggingFace id.
+            device (str): "cuda" or "cpu".
+            compute_type (str): CTranslate2 compute type.
+            instance (WhisperModel): The loaded model.
+            pinned (bool): Never evict this model. Defaults to False.
+        """
+        key = self.make_key(model, device, compute_type)
+        with self.lock:
+            self.models[key] = instance
+            self.models.move_to_end(key)
+            self.memory[key] = self.estimate_memory_mb(model, compute_type)
+            if pinned:
+                self.pinned.add(key)
+            self._evict()
+
+    def get(self, model, device, compute_type, loader=None):
+        """
+        Return a loaded model for the given configuration, loading it on a cache miss.
+
+        Concurrent misses for the same key load the model only once.
+
+        Args:
+            loader (callable, optional): Loads the model on a miss. Defaults to
+                `WhisperModel(model, device=device, compute_type=compute_type)`.
+
+        Returns:
+            WhisperModel: The shared model instance.
+        """
+        return self._get(model, device, compute_type, loader, acquire=False)
+
+    def acquire(self, model, device, compute_type, loader=None):
+        """
+        Like `get`, but keeps the model loaded until a matching `release`.
+
+        Returns:
+            WhisperModel: The shared model instance.
+        """
+        return self._get(model, device, compute_type, loader, acquire=True)
+
+    def slot(self, model, device, compute_type):
+        """
+        Semaphore with `max_concurrency` slots shared by everyone decoding with this model.
+
+        Returns:
+            threading.BoundedSemaphore: Use as a context manager around each decode.
+        """
+        key = self.make_key(model, device, compute_type)
+        with self.lock:
+            if key not in self.slots:
+                self.slots[key] = threading.BoundedSemaphore(self.max_concurrency)
+            return self.slots[key]
+
+    def release(self, model, device, compute_type):
+        """Drop a reference taken with `acquire`, making the model evictable once unused."""
+        key = self.make_key(model, device, compute_type)
+        with self.lock:
+            if self.refs.get(key, 0) <= 1:
+                self.refs.pop(key, None)
+            else:
+                self.refs[key] -= 1
+            self._evict()
+
+    def _get(self, model, device, compute_type, loader, acquire):
+        key = self.make_key(model, device, compute_type)
+        with self.lock:
+            if key in self.models:
+                return self._use(key, acquire)
+            key_lock = self.loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self.lock:
+                if key in self.models:
+                    return self._use(key, acquire)
+                memory_mb = self.estimate_memory_mb(model, compute_type)
+                # make room before loading, so the budget holds while both would be resident
+                self._evict(reserve_mb=memory_mb, reserve_slot=True)
+
+            logging.info(f"Loading model {model} on {device} ({compute_type}) into pool")
+            if loader is None:
+                instance = WhisperModel(
+                    model, device=device, compute_type=compute_type,
+                    **self.model_kwargs(self.model_options, device))
+            else:
+                instance = loader()
+
+            with self.lock:
+                self.models[key] = instance
+                self.memory[key] = memory_mb
+                self.loading.pop(key, None)
+                instance = self._use(key, acquire)
+                self._evict()
+            return instance
+
+    def _use(self, key, acquire):
+        self.models.move_to_end(key)
+        if acquire:
+            self.refs[key] = self.refs.get(key, 0) + 1
+        return self.models[key]
+
+    def find(self, model):
+        """
+        Return the (device, compute_type) of a loaded configuration of `model`, if any.
+
+        Lets callers that don't care about precision reuse whatever is already resident.
+        """
+        with self.lock:
+            for (name, device, compute_type) in reversed(self.models):
+                if name == model:
+                    return device, compute_type
+        return None
+
+    def _evict(self, reserve_mb=0, reserve_slot=False):
+        unpinned = [key for key in self.models if key not in self.pinned]
+        evictable = [key for key in unpinned if not self.refs.get(key)]
+        while evictable and (
+            len(unpinned) + reserve_slot > self.max_models
+            or (self.max_memory_mb is not None
+                and sum(self.memory.values()) + reserve_mb > self.max_memory_mb)
+        ):
+            key = evictable.pop(0)
+            unpinned.remove(key)
+            logging.info(f"Evicting model {key[0]} ({key[1]}, {key[2]}) from pool")
+            del self.models[key]
+            del self.memory[key]
+            self.slots.pop(key, None)
+
+    def __len__(self):
+        with self.lock:
+            return len(self.models)
@@ -1,6 +1,7 @@
 import json
 import logging
 import threading
+from contextlib import nullcontext
 
 from openvino import Core
 from yap.whisper_live.backend.base import ServeClientBase
@@ -27,6 +28,7 @@ class ServeClientOpenVINO(ServeClientBase):
         no_speech_thresh=0.45,
         clip_audio=False,
         same_output_threshold=10,
+        start_thread=True,
     ):
         """
         Initialize a ServeClient instance.
@@ -47,6 +49,8 @@ class ServeClientOpenVINO(ServeClientBase):
             no_speech_thresh (float, optional): Segments with no speech probability above this threshold will be discarded. Defaults to 0.45.
             clip_audio (bool, optional): Whether to clip audio with no valid segments. Defaults to False.
             same_output_threshold (int, optional): Number of repeated outputs before considering it as a valid segment. Defaults to 10.
+            start_thread (bool, optional): Whether to start the transcription thread. When False the server
+                schedules transcription passes itself. Defaults to True.
         """
         super().__init__(
             client_uid,
@@ -84,8 +88,10 @@ class ServeClientOpenVINO(ServeClientBase):
             self.create_model(model)
 
         # threading
-        self.trans_thread = threading.Thread(target=self.speech_to_text)
-        self.trans_thread.start()
+        self.trans_thread = None
+        if start_thread:
+            self.trans_thread = threading.Thread(target=self.speech_to_text)
+            self.trans_thread.start()
 
         self.websocket.send(json.dumps({
             "uid": self.client_uid,
@@ -122,12 +128,9 @@ class ServeClientOpenVINO(ServeClientBase):
             depends on the implementation of the `transcriber.transcribe` method but typically
             includes the transcribed text.
         """
-        if ServeClientOpenVINO.SINGLE_MODEL:
-            ServeClientOpenVINO.SINGLE_MODEL_LOCK.acquire()
-        result = self.transcriber.transcribe(input_sample)
-        if ServeClientOpenVINO.SINGLE_MODEL:
-            ServeClientOpenVINO.SINGLE_MODEL_LOCK.release()
-        return result
+        model_lock = ServeClientOpenVINO.SINGLE_MODEL_LOCK if ServeClientOpenVINO.SINGLE_MODEL else nullcontext()
+        with model_lock:
+            return self.transcriber.transcribe(input_sample)
 
     def handle_transcription_output(self, result, duration):
         """
@@ -1,11 +1,140 @@
+import os
 import json
 import logging
 import queue
+import threading
 import torch
+import ctranslate2
+from huggingface_hub import snapshot_download
 from transformers import M2M100ForConditionalGeneration
 from yap.whisper_live.backend.tokenization_small100 import SMALL100Tokenizer
 
 from yap.whisper_live.backend.base import ServeClientBase
+from yap.whisper_live.backend.faster_whisper_backend import ServeClientFasterWhisper
+from yap.whisper_live.backend.model_pool import WhisperModelPool
+from yap.whisper_live.backend.translation_scheduler import BatchedTranslationScheduler
+
+
+class TranslationModel:
+    """
+    A loaded SMaLL-100 model and tokenizer, shared by every client translating with it.
+
+    The target language is passed with each request instead of being set on the tokenizer,
+    so clients translating into different languages can use the same instance concurrently.
+    """
+
+    def __init__(self, model_name, device=None):
+        """
+        Args:
+            model_name (str): HuggingFace id or path of the translation model.
+            device (torch.device, optional): Device to run on. Defaults to CUDA when available.
+        """
+        self.model_name = model_name
+        self.device = device or torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        logging.info(f"Loading translation model {model_name} on device: {self.device}")
+        self.model = M2M100ForConditionalGeneration.from_pretrained(model_name).to(self.device)
+        self.model.eval()
+        self.tokenizer = SMALL100Tokenizer.from_pretrained(model_name)
+
+    def encode(self, text, target_language):
+        """
+        Token ids of `text` with the SMaLL-100 special tokens for `target_language`.
+
+        SMaLL-100 marks the target language with a prefix token on the source side:
+        `[tgt_lang_code] X [eos]`.
+        """
+        lang_id = self.tokenizer.get_lang_id(target_language)
+        ids = self.tokenizer.encode(text, add_special_tokens=False)
+        return [lang_id] + ids + [self.tokenizer.eos_token_id]
+
+    def translate(self, texts, target_language):
+        """
+        Translate a batch of texts into one target language.
+
+        Args:
+            texts (list): Texts to translate.
+            target_language (str): Target language code.
+
+        Returns:
+            list: The translated texts, in input order.
+        """
+        input_ids = [self.encode(text, target_language) for text in texts]
+        encoded_input = self.tokenizer.pad({"input_ids": input_ids}, return_tensors="pt").to(self.device)
+        with torch.no_grad():
+            generated_tokens = self.model.generate(**encoded_input)
+        return self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+
+
+class SMALL100Converter(ctranslate2.converters.TransformersConverter):
+    """Reads the vocabulary with `SMALL100Tokenizer`, which `AutoTokenizer` can't load."""
+
+    def load_tokenizer(self, tokenizer_class, model_name_or_path, **kwargs):
+        return SMALL100Tokenizer.from_pretrained(model_name_or_path)
+
+
+class CTranslate2TranslationModel(TranslationModel):
+    """
+    SMaLL-100 converted to CTranslate2, for fast quantized translation on CPU.
+
+    The checkpoint is converted once into `<cache_path>/translation-ct2-models` and
+    tokenized with the same `SMALL100Tokenizer` as `TranslationModel`.
+    """
+
+    def __init__(self, model_name, cache_path="~/.cache/whisper-live/", device=None, compute_type=None,
+                 beam_size=5, max_decoding_length=256):
+        """
+        Args:
+            model_name (str): HuggingFace id or path of the translation model.
+            cache_path (str): Root of the CTranslate2 conversion cache.
+            device (str, optional): "cuda" or "cpu". Defaults to CUDA when available.
+            compute_type (str, optional): CTranslate2 compute type. Defaults to "int8" on CPU
+                and "int8_float16" on CUDA.
+            beam_size (int): Beam size for decoding. Defaults to 5.
+            max_decoding_length (int): Maximum number of generated tokens. Defaults to 256.
+        """
+        self.model_name = model_name
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.compute_type = compute_type or ("int8_float16" if self.device == "cuda" else "int8")
+        self.beam_size = beam_size
+        self.max_decoding_length = max_decoding_length
+
+        model_dir = model_name if ctranslate2.contains_model(model_name) else None
+        if model_dir is None:
+            local_snapshot = model_name if os.path.isdir(model_name) else snapshot_download(repo_id=model_name)
+            model_dir = ServeClientFasterWhisper.convert_model(
+                local_snapshot,
+                model_name,
+                cache_path,
+                quantization="int8",
+                cache_dir="translation-ct2-models",
+                converter_class=SMALL100Converter,
+            )
+        logging.info(f"Loading CTranslate2 translation model {model_name} on {self.device} ({self.compute_type})")
+        # same threading and GPU placement as the whisper models
+        options = WhisperModelPool.model_kwargs(ServeClientFasterWhisper.MODEL_OPTIONS, self.device)
+        if "cpu_threads" in options:
+            options["intra_threads"] = options.pop("cpu_threads")
+        if "num_workers" in options:
+            options["inter_threads"] = options.pop("num_workers")
+        self.model = ctranslate2.Translator(
+            model_dir, device=self.device, compute_type=self.compute_type, **options)
+        self.tokenizer = SMALL100Tokenizer.from_pretrained(model_name)
+
+    def translate(self, texts, target_language):
+        source = [
+            self.tokenizer.convert_ids_to_tokens(self.encode(text, target_language))
+            for text in texts
+        ]
+        results = self.model.translate_batch(
+            source,
+            beam_size=self.beam_size,
+            max_decoding_length=self.max_decoding_length,
+        )
+        return [
+            self.tokenizer.decode(
+                self.tokenizer.convert_tokens_to_ids(result.hypotheses[0]), skip_special_tokens=True)
+            for result in results
+        ]
 
 
 class ServeClientTranslation(ServeClientBase):
@@ -13,8 +142,19 @@ class ServeClientTranslation(ServeClientBase):
     Handles translation of completed transcription segments in a separate thread.
     Reads from a queue populated by the transcription backend and sends translated
     segments back to the client via WebSocket.
+
+    Translation models are loaded once per process and shared by all clients, see
+    `get_translation_model`. Segments from all clients using a model are translated in
+    batches by that model's `BatchedTranslationScheduler`.
     """
-    
+
+    TRANSLATION_ENGINES = ("transformers", "ctranslate2")
+    TRANSLATION_MODELS = {}
+    TRANSLATION_SCHEDULERS = {}
+    TRANSLATION_MODELS_LOCK = threading.Lock()
+    # segments arrive on `translation_queue`, so skip the base client's audio buffer
+    receives_audio = False
+
     def __init__(
         self,
         client_uid,
@@ -22,7 +162,11 @@ class ServeClientTranslation(ServeClientBase):
         translation_queue,
         target_language="fr", 
         send_last_n_segments=10,
-        model_name="alirezamsh/small100"
+        model_name="alirezamsh/small100",
+        max_batch_size=16,
+        max_batch_wait_ms=20,
+        engine="transformers",
+        cache_path="~/.cache/whisper-live/",
     ):
         """
         Initialize the translation client.
@@ -34,38 +178,95 @@ class ServeClientTranslation(ServeClientBase):
             target_language (str): Target language code (default: "fr" for French)
             send_last_n_segments (int): Number of recent translated segments to send
             model_name (str): Translation model name to use
+            max_batch_size (int): Maximum number of segments translated in one batch. Only
+                used by the first client to load `model_name`.
+            max_batch_wait_ms (float): Maximum time to wait for a translation batch to fill.
+            engine (str): "transformers" (PyTorch) or "ctranslate2" (converted, int8 quantized)
+            cache_path (str): Root of the CTranslate2 conversion cache
         """
         super().__init__(client_uid, websocket, send_last_n_segments)
         self.translation_queue = translation_queue
         self.target_language = target_language
         self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait_ms = max_batch_wait_ms
+        self.engine = engine
+        self.cache_path = cache_path
         self.translated_segments = []
         self.translation_model = None
-        self.tokenizer = None
-        self.device = None
+        self.translation_scheduler = None
         self.model_loaded = False
         self.load_translation_model()
-        
+
+    @classmethod
+    def get_translation_model(cls, model_name, max_batch_size=16, max_batch_wait_ms=20,
+                              engine="transformers", cache_path="~/.cache/whisper-live/"):
+        """
+        Return the process-wide translation model for `model_name` and its batching scheduler,
+        loading the model on first use.
+
+        Args:
+            model_name (str): Translation model name.
+            max_batch_size (int): Batch size of a newly created scheduler. Defaults to 16.
+            max_batch_wait_ms (float): Batch wait of a newly created scheduler. Defaults to 20.
+            engine (str): One of `TRANSLATION_ENGINES`. Defaults to "transformers".
+            cache_path (str): Root of the CTranslate2 conversion cache.
+
+        Returns:
+            tuple: The shared `TranslationModel` and `BatchedTranslationScheduler`.
+
+        Raises:
+            ValueError: If the engine is unknown.
+        """
+        if engine not in cls.TRANSLATION_ENGINES:
+            raise ValueError(f"Unknown translation engine {engine!r}, expected one of {', '.join(cls.TRANSLATION_ENGINES)}")
+        key = (model_name, engine)
+        with cls.TRANSLATION_MODELS_LOCK:
+            if key not in cls.TRANSLATION_MODELS:
+                if engine == "ctranslate2":
+                    model = CTranslate2TranslationModel(model_name, cache_path=cache_path)
+                else:
+                    model = TranslationModel(model_name)
+                cls.TRANSLATION_MODELS[key] = model
+                cls.TRANSLATION_SCHEDULERS[key] = BatchedTranslationScheduler(
+                    model, max_batch_size=max_batch_size, max_wait_ms=max_batch_wait_ms)
+            return cls.TRANSLATION_MODELS[key], cls.TRANSLATION_SCHEDULERS[key]
+
+    @classmethod
+    def translation_cache_stats(cls):
+        """
+        Returns:
+            list: `TranslationCache.stats` of every loaded model, with its `model` and `engine`.
+        """
+        with cls.TRANSLATION_MODELS_LOCK:
+            return [
+                {"model": model_name, "engine": engine, **scheduler.cache.stats()}
+                for (model_name, engine), scheduler in cls.TRANSLATION_SCHEDULERS.items()
+            ]
+
+    @classmethod
+    def unload_translation_models(cls):
+        """Stop every translation scheduler's worker and drop the shared models."""
+        with cls.TRANSLATION_MODELS_LOCK:
+            for scheduler in cls.TRANSLATION_SCHEDULERS.values():
+                scheduler.stop()
+            cls.TRANSLATION_SCHEDULERS.clear()
+            cls.TRANSLATION_MODELS.clear()
+
     def load_translation_model(self):
-        """Load the translation model and tokenizer."""
+        """Attach the shared translation model, loading it if this is the first client to use it."""
         try:
-            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-            logging.info(f"Loading translation model on device: {self.device}")
-            
-            self.translation_model = M2M100ForConditionalGeneration.from_pretrained(
-                self.model_name
-            ).to(self.device)
-            self.tokenizer = SMALL100Tokenizer.from_pretrained(self.model_name)
-            self.tokenizer.tgt_lang = self.target_language
-            
+            self.translation_model, self.translation_scheduler = self.get_translation_model(
+                self.model_name, self.max_batch_size, self.max_batch_wait_ms,
+                engine=self.engine, cache_path=self.cache_path)
             self.model_loaded = True
-            logging.info(f"Translation model loaded successfully. Target language: {self.target_language}")
+            logging.info(f"Translation model ready. Target language: {self.target_language}")
         except Exception as e:
             logging.error(f"Failed to load translation model: {e}")
             self.translation_model = None
-            self.tokenizer = None
+            self.translation_scheduler = None
             self.model_loaded = False
-    
+
     def translate_text(self, text: str) -> str:
         """
         Translate a single text segment.
@@ -76,65 +277,85 @@ class ServeClientTranslation(ServeClientBase):
         Returns:
             str: Translated text or original text if translation fails
         """
-        if not self.model_loaded or not text.strip():
-            return text
-            
+        return self.translate_texts([text])[0]
+
+    def translate_texts(self, texts):
+        """
+        Translate several text segments in one batch shared with other clients.
+
+        Args:
+            texts (list): Texts to translate
+
+        Returns:
+            list: Translated texts, with the original text for blank segments or if translation fails
+        """
+        to_translate = [text for text in texts if text.strip()]
+        if not self.model_loaded or not to_translate:
+            return list(texts)
+
         try:
-            # Encode input and move to device
-            encoded_input = self.tokenizer(text, return_tensors="pt").to(self.device)
-            
-            # Generate translation
-            with torch.no_grad():
-                generated_tokens = self.translation_model.generate(**encoded_input)
-            
-            # Decode output
-            output = self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
-            return output[0] if output else text
-            
+            translated = iter(self.translation_scheduler.translate(to_translate, self.target_language))
+            return [next(translated) if text.strip() else text for text in texts]
         except Exception as e:
-            logging.error(f"Translation failed for text '{text}': {e}")
-            return text
-    
+            logging.error(f"Translation failed for {len(to_translate)} segments: {e}")
+            return list(texts)
+
+    def get_pending_segments(self):
+        """
+        Wait for completed segments and drain everything else already queued.
+
+        Returns:
+            tuple: The completed segments, and whether the exit signal was received.
+
+        Raises:
+            queue.Empty: If nothing arrived within a second.
+        """
+        segments = []
+        item = self.translation_queue.get(timeout=1.0)
+        while True:
+            self.translation_queue.task_done()
+            if item is None:
+                return segments, True
+            # Only translate completed segments
+            if item.get("completed", False):
+                segments.append(item)
+            try:
+                item = self.translation_queue.get_nowait()
+            except queue.Empty:
+                return segments, False
+
     def process_translation_queue(self):
         """
         Process segments from the translation queue.
         Continuously reads from the queue until None is received (exit signal).
+
+        Segments that queued up while the previous batch was being translated are
+        translated together.
         """
         logging.info(f"Starting translation processing for client {self.client_uid}")
         
         while not self.exit:
             try:
-                # Get segment from queue with timeout
-                segment = self.translation_queue.get(timeout=1.0)
-                
-                # Check for exit signal
-                if segment is None:
+                segments, exit_requested = self.get_pending_segments()
+
+                if segments:
+                    translated_texts = self.translate_texts([segment.get("text", "") for segment in segments])
+                    for segment, translated_text in zip(segments, translated_texts):
+                        self.translated_segments.append({
+                            "start": segment["start"],
+                            "end": segment["end"],
+                            "text": translated_text,
+                            "completed": True,
+                            "target_language": self.target_language
+                        })
+                    if len(self.translated_segments) > self.MAX_TRANSCRIPT_SEGMENTS:
+                        del self.translated_segments[:-self.MAX_TRANSCRIPT_SEGMENTS]
+                    segments_to_send = self.prepare_translated_segments()
+                    self.send_translation_to_client(segments_to_send)
+
+                if exit_requested:
                     logging.info(f"Received exit signal for translation client {self.client_uid}")
                     break
-                    
-                # Only translate completed segments
-                if not segment.get("completed", False):
-                    self.translation_queue.task_done()
-                    continue
-                    
-                # Translate the segment
-                original_text = segment.get("text", "")
-                translated_text = self.translate_text(original_text)
-                
-                # Create translated segment
-                translated_segment = {
-                    "start": segment["start"],
-                    "end": segment["end"],
-                    "text": translated_text,
-                    "completed": segment.get("completed", False),
-                    "target_language": self.target_language
-                }
-                
-                self.translated_segments.append(translated_segment)
-                segments_to_send = self.prepare_translated_segments()
-                self.send_translation_to_client(segments_to_send)
-                
-                self.translation_queue.task_done()
                 
             except queue.Empty:
                 continue
@@ -187,9 +408,7 @@ class ServeClientTranslation(ServeClientBase):
             language (str): New target language code
         """
         self.target_language = language
-        if self.tokenizer:
-            self.tokenizer.tgt_lang = language
-            logging.info(f"Target language changed to: {language}")
+        logging.info(f"Target language changed to: {language}")
     
     def cleanup(self):
         """Clean up translation resources."""
@@ -202,13 +421,8 @@ class ServeClientTranslation(ServeClientBase):
             pass
         
         self.translated_segments.clear()
-        
-        if self.translation_model:
-            del self.translation_model
-            self.translation_model = None
-        if self.tokenizer:
-            del self.tokenizer
-            self.tokenizer = None
-        
-        if self.device and self.device.type == 'cuda':
-            torch.cuda.empty_cache()
+        if self.translation_scheduler is not None:
+            logging.info(f"Translation cache: {self.translation_scheduler.cache.stats()}")
+        # the model is shared with other clients and stays loaded
+        self.translation_model = None
+        self.translation_scheduler = None
@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from yap.whisper_live.backend.batching import BatchRequest, BatchScheduler
+
+
+"""
+Cross-client batched translation.
+
+Translation clients sharing a model submit their completed segments to a single
+`BatchedTranslationScheduler`, which groups pending segments by target language and
+translates each group with one padded `generate` call. Results are kept in a shared
+`TranslationCache`, so phrases that keep coming back are only translated once.
+"""
+
+
+class TranslationCache:
+    """
+    Bounded LRU cache of translations keyed by (text, target language), with a TTL.
+
+    `hits` and `misses` count lookups since the cache was created, see `stats`.
+    """
+
+    def __init__(self, max_entries=4096, ttl=3600):
+        """
+        Args:
+            max_entries (int): Maximum number of cached translations. Defaults to 4096.
+            ttl (float): Seconds a translation stays valid, or None to keep it until evicted.
+                Defaults to 3600.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text, target_language):
+        return (text.strip(), target_language)
+
+    def get(self, text, target_language):
+        """
+        Returns:
+            str or None: The cached translation, or None on a miss.
+        """
+        key = self.make_key(text, target_language)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, text, target_language, translation):
+        key = self.make_key(text, target_language)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self.lock:
+            self.entries[key] = (translation, expires)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of entries, hits, misses and the hit rate.
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class TranslationRequest(BatchRequest):
+    """A single segment waiting to be translated."""
+
+    def __init__(self, text, target_language):
+        super().__init__()
+        self.text = text
+        self.target_language = target_language
+
+    @property
+    def key(self):
+        return self.target_language
+
+
+class BatchedTranslationScheduler(BatchScheduler):
+    """
+    Translates completed segments from all clients sharing a model in batches.
+
+    Segments are grouped by target language. Cached translations are returned without
+    queueing.
+    """
+
+    name = "Batched translation"
+
+    def __init__(self, model, max_batch_size=16, max_wait_ms=20, cache=None):
+        """
+        Args:
+            model: Translation model with a `translate(texts, target_language)` method.
+            max_batch_size (int): Maximum number of segments translated in one call. Defaults to 16.
+            max_wait_ms (float): Maximum time to wait for a batch to fill. Defaults to 20.
+            cache (TranslationCache, optional): Cache for translations of this model. Defaults
+                to a new `TranslationCache`.
+        """
+        self.model = model
+        self.cache = cache if cache is not None else TranslationCache()
+        super().__init__(max_batch_size, max_wait_ms)
+        logging.info(f"Batched translation enabled (max_batch_size={max_batch_size}, max_wait_ms={max_wait_ms})")
+
+    def translate(self, texts, target_language):
+        """
+        Translate texts, batching them with segments from other clients when possible.
+
+        Args:
+            texts (list): Texts to translate.
+            target_language (str): Target language code.
+
+        Returns:
+            list: The translated texts, in input order.
+
+        Raises:
+            Exception: The error raised by the model if the batch failed.
+        """
+        results = [self.cache.get(text, target_language) for text in texts]
+        requests = {
+            i: TranslationRequest(text, target_language)
+            for i, (text, result) in enumerate(zip(texts, results)) if result is None
+        }
+        # queue every segment before waiting, so they can share a batch
+        for request in requests.values():
+            self.requests.put(request)
+        for i, request in requests.items():
+            request.done.wait()
+            if request.error is not None:
+                raise request.error
+            results[i] = request.result
+            self.cache.put(request.text, target_language, request.result)
+        return results
+
+    def process_batch(self, requests):
+        """
+        Translate a group of requests sharing the same target language in a single call.
+
+        Args:
+            requests (list): `TranslationRequest` objects with an identical `target_language`.
+        """
+        outputs = self.model.translate([request.text for request in requests], requests[0].target_language)
+        for request, output in zip(requests, outputs):
+            request.result = output
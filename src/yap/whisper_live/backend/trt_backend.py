@@ -1,9 +1,10 @@
 import json
 import logging
 import threading
-import time
+from contextlib import nullcontext
 
 from yap.whisper_live.backend.base import ServeClientBase
+from yap.whisper_live.vad import VoiceActivityDetector
 from yap.whisper_live.transcriber.transcriber_tensorrt import WhisperTRTLLM
 
 
@@ -26,6 +27,7 @@ class ServeClientTensorRT(ServeClientBase):
         no_speech_thresh=0.45,
         clip_audio=False,
         same_output_threshold=10,
+        use_vad=True,
     ):
         """
         Initialize a ServeClient instance.
@@ -47,6 +49,7 @@ class ServeClientTensorRT(ServeClientBase):
             no_speech_thresh (float, optional): Segments with no speech probability above this threshold will be discarded. Defaults to 0.45.
             clip_audio (bool, optional): Whether to clip audio with no valid segments. Defaults to False.
             same_output_threshold (int, optional): Number of repeated outputs before considering it as a valid segment. Defaults to 10.
+            use_vad (bool, optional): Whether to drop frames without voice activity. Defaults to True.
         """
         super().__init__(
             client_uid,
@@ -60,7 +63,14 @@ class ServeClientTensorRT(ServeClientBase):
         self.language = language if multilingual else "en"
         self.task = task
         self.eos = False
+        # set when speech ends, until a transcription pass has seen it
+        self.eos_pending = False
         self.max_new_tokens = max_new_tokens
+        self.use_vad = use_vad
+
+        # per-connection VAD state and silence counters, evaluated in batches with all other connections
+        self.vad_detector = VoiceActivityDetector(frame_rate=self.RATE, model=self.get_vad_engine())
+        self.no_voice_activity_chunks = 0
 
         if single_model:
             if ServeClientTensorRT.SINGLE_MODEL is None:
@@ -114,12 +124,44 @@ class ServeClientTensorRT(ServeClientBase):
         """
         Sets the End of Speech (EOS) flag.
 
+        Setting it wakes the transcription loop, since frames without voice activity are
+        dropped and no new audio may arrive to trigger the pass that finalizes the segment.
+
         Args:
             eos (bool): The value to set for the EOS flag.
         """
-        self.lock.acquire()
-        self.eos = eos
-        self.lock.release()
+        with self.audio_available:
+            if eos and not self.eos:
+                self.eos_pending = True
+                self.audio_available.notify_all()
+            self.eos = eos
+
+    def _has_new_audio(self):
+        # a pending end of speech needs one more pass over the buffered audio
+        return self.eos_pending or super()._has_new_audio()
+
+    def voice_activity(self, frame_np):
+        """
+        Evaluates the voice activity in an incoming audio frame and updates the EOS flag.
+
+        After more than 3 consecutive frames without voice activity the client is marked as
+        end of speech. This runs on the receive path, so it never sleeps.
+
+        Args:
+            frame_np (np.ndarray): The audio frame.
+
+        Returns:
+            bool: True if the frame contains voice activity.
+        """
+        if self.vad_detector(frame_np):
+            self.no_voice_activity_chunks = 0
+            self.set_eos(False)
+            return True
+
+        self.no_voice_activity_chunks += 1
+        if self.no_voice_activity_chunks > 3 and not self.eos:
+            self.set_eos(True)
+        return False
 
     def handle_transcription_output(self, last_segment, duration):
         """
@@ -142,16 +184,14 @@ class ServeClientTensorRT(ServeClientBase):
         Args:
             input_bytes (np.array): The audio chunk to transcribe.
         """
-        if ServeClientTensorRT.SINGLE_MODEL:
-            ServeClientTensorRT.SINGLE_MODEL_LOCK.acquire()
-        logging.info(f"[WhisperTensorRT:] Processing audio with duration: {input_bytes.shape[0] / self.RATE}")
-        mel, duration = self.transcriber.log_mel_spectrogram(input_bytes)
-        last_segment = self.transcriber.transcribe(
-            mel,
-            text_prefix=f"<|startoftranscript|><|{self.language}|><|{self.task}|><|notimestamps|>",
-        )
-        if ServeClientTensorRT.SINGLE_MODEL:
-            ServeClientTensorRT.SINGLE_MODEL_LOCK.release()
+        model_lock = ServeClientTensorRT.SINGLE_MODEL_LOCK if ServeClientTensorRT.SINGLE_MODEL else nullcontext()
+        with model_lock:
+            logging.info(f"[WhisperTensorRT:] Processing audio with duration: {input_bytes.shape[0] / self.RATE}")
+            mel, duration = self.transcriber.log_mel_spectrogram(input_bytes)
+            last_segment = self.transcriber.transcribe(
+                mel,
+                text_prefix=f"<|startoftranscript|><|{self.language}|><|{self.task}|><|notimestamps|>",
+            )
         if last_segment:
             self.handle_transcription_output(last_segment, duration)
 
@@ -164,9 +204,9 @@ class ServeClientTensorRT(ServeClientBase):
             duration (float): Duration of the last audio chunk.
         """
         if not len(self.transcript):
-            self.transcript.append({"text": last_segment + " "})
+            self.add_completed_segment({"text": last_segment + " "})
         elif self.transcript[-1]["text"].strip() != last_segment:
-            self.transcript.append({"text": last_segment + " "})
+            self.add_completed_segment({"text": last_segment + " "})
         
         with self.lock:
             self.timestamp_offset += duration
@@ -191,8 +231,10 @@ class ServeClientTensorRT(ServeClientBase):
                 logging.info("Exiting speech to text thread")
                 break
 
-            if self.frames_np is None:
-                time.sleep(0.02)    # wait for any audio to arrive
+            has_audio = self.wait_for_audio()
+            with self.lock:
+                self.eos_pending = False
+            if not has_audio:
                 continue
 
             self.clip_audio_if_no_valid_segment()
@@ -208,3 +250,8 @@ class ServeClientTensorRT(ServeClientBase):
 
             except Exception as e:
                 logging.error(f"[ERROR]: {e}")
+
+    def cleanup(self):
+        """Stop the transcription loop and release this connection's slot in the shared VAD engine."""
+        super().cleanup()
+        self.vad_detector.close()
@@ -11,6 +11,7 @@ import uuid
 import time
 import av
 import whisper_live.utils as utils
+from yap.whisper_live.audio_codec import OpusEncoder
 
 
 class Client:
@@ -41,6 +42,8 @@ class Client:
         translation_callback=None,
         translation_srt_file_path="output_translated.srt",
         enable_timestamps=False,
+        audio_encoding="pcm_s16",
+        delta_segments=False,
     ):
         """
         Initializes a Client instance for audio recording and streaming to a server.
@@ -67,6 +70,8 @@ class Client:
             target_language (str, optional): Target language for translation. Defaults to 'fr'.
             translation_callback (callable, optional): A callback function to handle translation results. Default is None.
             translation_srt_file_path (str, optional): The file path to save the translated output SRT file. Default is "output_translated.srt".
+            audio_encoding (str, optional): Wire format for audio, "pcm_s16", "pcm_f32" or "opus". Default is "pcm_s16".
+            delta_segments (bool, optional): Ask the server for only new segments and the current partial on each update. Default is False.
         """
         self.recording = False
         self.task = "transcribe"
@@ -98,6 +103,9 @@ class Client:
         if translate:
             self.task = "translate"
         self.enable_timestamps = enable_timestamps
+        self.audio_encoding = audio_encoding
+        self.opus_encoder = OpusEncoder() if audio_encoding == "opus" else None
+        self.delta_segments = delta_segments
 
         self.audio_bytes = None
 
@@ -296,6 +304,8 @@ class Client:
                     "same_output_threshold": self.same_output_threshold,
                     "enable_translation": self.enable_translation,
                     "target_language": self.target_language,
+                    "audio_encoding": self.audio_encoding,
+                    "delta_segments": self.delta_segments,
                 }
             )
         )
@@ -313,6 +323,21 @@ class Client:
         except Exception as e:
             print(e)
 
+    def send_audio_to_server(self, audio_bytes):
+        """
+        Encode 16 kHz mono int16 audio with the negotiated `audio_encoding` and send it.
+
+        Args:
+            audio_bytes (bytes): 16-bit PCM audio data.
+        """
+        if self.audio_encoding == "pcm_s16":
+            self.send_packet_to_server(audio_bytes)
+        elif self.audio_encoding == "opus":
+            for packet in self.opus_encoder.encode(np.frombuffer(audio_bytes, dtype=np.int16)):
+                self.send_packet_to_server(packet)
+        else:
+            self.send_packet_to_server(TranscriptionTeeClient.bytes_to_float_array(audio_bytes).tobytes())
+
     def close_websocket(self):
         """
         Close the WebSocket connection and join the WebSocket thread.
@@ -461,14 +486,25 @@ class TranscriptionTeeClient:
             if (unconditional or client.recording):
                 client.send_packet_to_server(packet)
 
+    def multicast_audio(self, audio_bytes):
+        """
+        Sends 16 kHz mono int16 audio via all recording clients, each in its own audio encoding.
+
+        Args:
+            audio_bytes (bytes): 16-bit PCM audio data.
+        """
+        for client in self.clients:
+            if client.recording:
+                client.send_audio_to_server(audio_bytes)
+
     def play_file(self, filename):
         """
         Play an audio file and send it to the server for processing.
 
         Reads an audio file, plays it through the audio output, and simultaneously sends
         the audio data to the server for processing. It uses PyAudio to create an audio
-        stream for playback. The audio data is read from the file in chunks, converted to
-        floating-point format, and sent to the server using WebSocket communication.
+        stream for playback. The audio data is read from the file in chunks, encoded in each
+        client's audio encoding, and sent to the server using WebSocket communication.
         This method is typically used when you want to process pre-recorded audio and send it
         to the server in real-time.
 
@@ -497,8 +533,7 @@ class TranscriptionTeeClient:
                     if data == b"":
                         break
 
-                    audio_array = self.bytes_to_float_array(data)
-                    self.multicast_packet(audio_array.tobytes())
+                    self.multicast_audio(data)
                     if self.mute_audio_playback:
                         time.sleep(chunk_duration)
                     else:
@@ -585,11 +620,12 @@ class TranscriptionTeeClient:
             output_container = av.open(save_file, mode="w")
             output_container.add_stream(codec_name="pcm_s16le", rate=self.rate)
 
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=self.rate)
         try:
             for packet in container.demux(audio_stream):
                 for frame in packet.decode():
-                    audio_data = frame.to_ndarray().tobytes()
-                    self.multicast_packet(audio_data)
+                    for resampled in resampler.resample(frame):
+                        self.multicast_audio(resampled.to_ndarray().tobytes())
 
                     if save_file:
                         output_container.mux(frame)
@@ -664,9 +700,7 @@ class TranscriptionTeeClient:
                 data = self.stream.read(self.chunk, exception_on_overflow=False)
                 self.frames += data
 
-                audio_array = self.bytes_to_float_array(data)
-
-                self.multicast_packet(audio_array.tobytes())
+                self.multicast_audio(data)
 
                 # save frames if more than a minute
                 if len(self.frames) > 60 * self.rate:
@@ -782,6 +816,7 @@ class TranscriptionClient(TranscriptionTeeClient):
         target_language (str, optional): Target language for translation. Defaults to 'fr'.
         translation_callback (callable, optional): A callback function to handle translation results. Default is None.
         translation_srt_file_path (str, optional): The file path to save the translated output SRT file. Default is "output_translated.srt".
+        audio_encoding (str, optional): Wire format for audio, "pcm_s16", "pcm_f32" or "opus". Default is "pcm_s16".
 
     Attributes:
         client (Client): An instance of the underlying Client class responsible for handling the WebSocket connection.
@@ -817,7 +852,8 @@ class TranscriptionClient(TranscriptionTeeClient):
         translation_callback=None,
         translation_srt_file_path="./output_translated.srt",
         enable_timestamps=False,
-        input_device_index=None
+        input_device_index=None,
+        audio_encoding="pcm_s16",
     ):
         self.client = Client(
             host,
@@ -839,6 +875,7 @@ class TranscriptionClient(TranscriptionTeeClient):
             translation_callback=translation_callback,
             translation_srt_file_path=translation_srt_file_path,
             enable_timestamps=enable_timestamps,
+            audio_encoding=audio_encoding,
         )
 
         if save_output_recording and not output_recording_filename.endswith(".wav"):
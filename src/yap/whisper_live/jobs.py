@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import logging
+import sqlite3
+import threading
+
+from faster_whisper.audio import decode_audio
+
+
+"""
+Persistent batch transcription jobs.
+
+`TranscriptionJobStore` keeps jobs and their uploaded audio on local disk (SQLite + files)
+so queued work survives daemon restarts. `TranscriptionJobRunner` drains the queue with a
+pool of worker threads that share the server's loaded models.
+"""
+
+
+class TranscriptionJobStore:
+    """
+    SQLite-backed job queue.
+
+    Job status moves from "queued" to "running" to either "completed" or "failed". Jobs that
+    were "running" when the daemon stopped are put back in the queue on startup.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Directory holding the job database and uploaded audio.
+        """
+        self.directory = os.path.expanduser(directory)
+        self.audio_dir = os.path.join(self.directory, "audio")
+        os.makedirs(self.audio_dir, exist_ok=True)
+        self.db_path = os.path.join(self.directory, "jobs.sqlite3")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock, self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    filename TEXT,
+                    audio_path TEXT,
+                    language TEXT,
+                    prompt TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    result TEXT,
+                    error TEXT
+                )
+                """
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+            requeued = self.conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (self.QUEUED, time.time(), self.RUNNING),
+            ).rowcount
+        if requeued:
+            logging.info(f"Requeued {requeued} interrupted transcription jobs")
+
+    def submit(self, fileobj, filename=None, language=None, prompt=None):
+        """
+        Persist an uploaded file and queue a job for it.
+
+        Args:
+            fileobj: Binary file object with the audio.
+            filename (str, optional): Original file name, kept for reference.
+            language (str, optional): Language code, or None for auto-detection.
+            prompt (str, optional): Initial prompt for whisper inference.
+
+        Returns:
+            dict: The new job.
+        """
+        job_id = uuid.uuid4().hex
+        suffix = os.path.splitext(filename or "")[1] or ".bin"
+        audio_path = os.path.join(self.audio_dir, job_id + suffix)
+        with open(audio_path, "wb") as f:
+            shutil.copyfileobj(fileobj, f)
+
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO jobs (id, status, filename, audio_path, language, prompt, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, self.QUEUED, filename, audio_path, language, prompt, now, now),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id, include_result=False):
+        """
+        Returns:
+            dict or None: The job, without its result unless `include_result` is set.
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row, include_result) if row else None
+
+    def list(self, status=None, limit=100):
+        """
+        Returns:
+            list: Most recently created jobs first, optionally filtered by status.
+        """
+        query = "SELECT * FROM jobs"
+        params = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def claim_next(self):
+        """
+        Atomically move the oldest queued job to "running".
+
+        Returns:
+            dict or None: The claimed job, or None if the queue is empty.
+        """
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (self.QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?",
+                (self.RUNNING, time.time(), row["id"]),
+            )
+        job = self._to_dict(row)
+        job["status"] = self.RUNNING
+        job["audio_path"] = row["audio_path"]
+        job["prompt"] = row["prompt"]
+        return job
+
+    def complete(self, job_id, result):
+        self._finish(job_id, self.COMPLETED, result=json.dumps(result))
+
+    def fail(self, job_id, error):
+        self._finish(job_id, self.FAILED, error=error)
+
+    def _finish(self, job_id, status, result=None, error=None):
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT audio_path FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, audio_path = NULL, updated_at = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id),
+            )
+        if row and row["audio_path"] and os.path.exists(row["audio_path"]):
+            os.unlink(row["audio_path"])
+
+    def _to_dict(self, row, include_result=False):
+        job = {
+            "id": row["id"],
+            "status": row["status"],
+            "filename": row["filename"],
+            "language": row["language"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+        if row["error"]:
+            job["error"] = row["error"]
+        if include_result and row["result"]:
+            job["result"] = json.loads(row["result"])
+        return job
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class TranscriptionJobRunner:
+    """
+    Pool of worker threads draining a `TranscriptionJobStore`.
+    """
+
+    def __init__(self, store, use_model, num_workers=1, sampling_rate=16000):
+        """
+        Args:
+            store (TranscriptionJobStore): The job queue.
+            use_model (callable): Returns a context manager yielding the `WhisperModel` to
+                transcribe with. Each job is decoded entirely inside it.
+            num_workers (int): Number of concurrent jobs. Defaults to 1.
+            sampling_rate (int): Sample rate audio is decoded to. Defaults to 16000.
+        """
+        self.store = store
+        self.use_model = use_model
+        self.sampling_rate = sampling_rate
+        self.wakeup = threading.Event()
+        self.exit = False
+        self.workers = [
+            threading.Thread(target=self.process_jobs, name=f"job-worker-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def notify(self):
+        """Wake idle workers after new jobs were submitted."""
+        self.wakeup.set()
+
+    def process_jobs(self):
+        while not self.exit:
+            self.wakeup.clear()
+            job = self.store.claim_next()
+            if job is None:
+                self.wakeup.wait(timeout=5.0)
+                continue
+            self.run_job(job)
+
+    def run_job(self, job):
+        logging.info(f"Running transcription job {job['id']} ({job['filename']})")
+        try:
+            audio = decode_audio(job["audio_path"], sampling_rate=self.sampling_rate)
+            with self.use_model() as model:
+                segments, info = model.transcribe(
+                    audio,
+                    language=job["language"],
+                    initial_prompt=job["prompt"],
+                    vad_filter=True,
+                )
+                segments = [
+                    {"id": s.id, "start": s.start, "end": s.end, "text": s.text.strip()}
+                    for s in segments
+                ]
+            self.store.complete(job["id"], {
+                "language": info.language,
+                "duration": info.duration,
+                "text": " ".join(s["text"] for s in segments),
+                "segments": segments,
+            })
+        except Exception as e:
+            logging.error(f"Transcription job {job['id']} failed: {e}")
+            self.store.fail(job["id"], str(e))
+
+    def stop(self):
+        self.exit = True
+        self.wakeup.set()
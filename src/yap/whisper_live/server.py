@@ -1,26 +1,30 @@
 import os
+import sys
 import time
+import asyncio
 import threading
 import queue
 import json
 import functools
 import logging
-import shutil
-import tempfile
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from typing import Optional, List
 
-import numpy as np
 import uvicorn
 import torch
 from fastapi import FastAPI, UploadFile, Form
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.responses import PlainTextResponse, JSONResponse
-from faster_whisper import WhisperModel
+from starlette.responses import PlainTextResponse, JSONResponse, StreamingResponse
+from faster_whisper.audio import decode_audio
 from websockets.sync.server import serve
+from websockets.asyncio.server import serve as async_serve
 from websockets.exceptions import ConnectionClosed
 
-from yap.whisper_live.vad import VoiceActivityDetector
+from yap.whisper_live.utils import format_subtitles
+from yap.whisper_live.audio_codec import AudioFrameDecoder
+from yap.whisper_live.jobs import TranscriptionJobStore, TranscriptionJobRunner
 from yap.whisper_live.backend.base import ServeClientBase
 
 """
@@ -99,6 +103,82 @@ class ClientManager:
         return False
 
 
+class AsyncWebSocketAdapter:
+    """
+    Blocking `send`/`close` interface on top of an asyncio websocket connection.
+
+    Serve clients and the client manager talk to websockets synchronously from worker
+    threads. In asyncio server mode each connection is wrapped in this adapter so that
+    those calls are forwarded to the event loop that owns the connection.
+    """
+
+    def __init__(self, websocket, loop, send_timeout=10.0):
+        self.websocket = websocket
+        self.loop = loop
+        self.send_timeout = send_timeout
+        self._tasks = set()
+
+    def _submit(self, coro):
+        try:
+            in_loop = asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            in_loop = False
+
+        if in_loop:
+            # Called from the event loop itself (e.g. timeout disconnects); don't block it.
+            task = self.loop.create_task(coro)
+            self._tasks.add(task)
+            task.add_done_callback(self._task_done)
+            return
+        asyncio.run_coroutine_threadsafe(coro, self.loop).result(self.send_timeout)
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logging.debug(f"Websocket operation failed: {task.exception()}")
+
+    def send(self, message):
+        self._submit(self.websocket.send(message))
+
+    def close(self):
+        self._submit(self.websocket.close())
+
+
+class BoundedExecutor:
+    """
+    Thread pool with admission control for blocking work started from an event loop.
+
+    At most `max_workers` jobs run concurrently and at most `max_queue` more may wait.
+    Callers must `try_acquire` a slot before `run` and `release` it afterwards; when
+    `try_acquire` fails the caller should reject the request instead of queueing it.
+    Slot accounting is not thread-safe and must only be done from the event loop thread.
+    """
+
+    def __init__(self, max_workers=2, max_queue=8, retry_after=5):
+        """
+        Args:
+            max_workers (int): Number of worker threads. Defaults to 2.
+            max_queue (int): Number of jobs allowed to wait for a worker. Defaults to 8.
+            retry_after (int): Seconds suggested to rejected callers. Defaults to 5.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rest")
+        self.capacity = max_workers + max_queue
+        self.retry_after = retry_after
+        self.in_flight = 0
+
+    def try_acquire(self):
+        if self.in_flight >= self.capacity:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+
+    async def run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+
 class BackendType(Enum):
     FASTER_WHISPER = "faster_whisper"
     TENSORRT = "tensorrt"
@@ -133,19 +213,30 @@ class TranscriptionServer:
 
     def __init__(self):
         self.client_manager = None
-        self.no_voice_activity_chunks = 0
-        self.use_vad = True
         self.single_model = False
         self.backend = None
-        self.vad_detector = None
         self.cache_path = None
         self.client_uid = None
+        self.max_batch_size = 1
+        self.max_batch_wait_ms = 10
+        self.loop = None
+        self.inference_executor = None
+        self.pending_passes = {}
+        self.model_pool = None
+        self.rest_executor = None
+        self.job_store = None
+        self.job_runner = None
+        self.transcript_dir = None
+        self.translation_engine = "transformers"
 
     def initialize_client(
         self, websocket, options, faster_whisper_custom_model_path,
         whisper_tensorrt_path, trt_multilingual, trt_py_session=False,
+        audio_decoder=None,
     ):
         client: Optional[ServeClientBase] = None
+        # per connection; initialize_client runs concurrently for several connections in asyncio mode
+        use_vad = options.get("use_vad")
 
         # Check if client wants translation
         enable_translation = options.get("enable_translation", False)
@@ -164,7 +255,9 @@ class TranscriptionServer:
                 websocket=websocket,
                 translation_queue=translation_queue,
                 target_language=target_language,
-                send_last_n_segments=options.get("send_last_n_segments", 10)
+                send_last_n_segments=options.get("send_last_n_segments", 10),
+                engine=self.translation_engine,
+                cache_path=self.cache_path or "~/.cache/whisper-live/",
             )
             
             # Start translation thread
@@ -192,6 +285,7 @@ class TranscriptionServer:
                     no_speech_thresh=options.get("no_speech_thresh", 0.45),
                     clip_audio=options.get("clip_audio", False),
                     same_output_threshold=options.get("same_output_threshold", 10),
+                    use_vad=use_vad,
                 )
                 logging.info("Running TensorRT backend.")
             except Exception as e:
@@ -219,6 +313,7 @@ class TranscriptionServer:
                     no_speech_thresh=options.get("no_speech_thresh", 0.45),
                     clip_audio=options.get("clip_audio", False),
                     same_output_threshold=options.get("same_output_threshold", 10),
+                    start_thread=self.inference_executor is None,
                 )
                 logging.info("Running OpenVINO backend.")
             except Exception as e:
@@ -247,7 +342,7 @@ class TranscriptionServer:
                     model=options["model"],
                     initial_prompt=options.get("initial_prompt"),
                     vad_parameters=options.get("vad_parameters"),
-                    use_vad=self.use_vad,
+                    use_vad=use_vad,
                     single_model=self.single_model,
                     send_last_n_segments=options.get("send_last_n_segments", 10),
                     no_speech_thresh=options.get("no_speech_thresh", 0.45),
@@ -255,7 +350,11 @@ class TranscriptionServer:
                     same_output_threshold=options.get("same_output_threshold", 10),
                     cache_path=self.cache_path,
                     translation_queue=translation_queue,
-                    monitor_callback=lambda msg: self.client_manager.broadcast(msg)
+                    monitor_callback=lambda msg: self.client_manager.broadcast(msg),
+                    max_batch_size=self.max_batch_size,
+                    max_batch_wait_ms=self.max_batch_wait_ms,
+                    min_new_audio=options.get("min_new_audio", 0.1),
+                    start_thread=self.inference_executor is None,
                 )
 
                 logging.debug("Running faster_whisper backend.")
@@ -270,13 +369,26 @@ class TranscriptionServer:
             client.translation_client = translation_client
             client.translation_thread = translation_thread
 
+        client.audio_decoder = audio_decoder or AudioFrameDecoder()
+        client.delta_segments = bool(options.get("delta_segments", False))
+        if self.transcript_dir:
+            client.enable_transcript_log(self.transcript_dir)
         self.client_manager.add_client(websocket, client)
 
     def get_audio_from_websocket(self, websocket):
-        frame_data = websocket.recv()
+        return self.decode_audio_frame(websocket, websocket.recv())
+
+    def decode_audio_frame(self, websocket, frame_data):
+        """
+        Decode a binary audio message with the connection's negotiated `audio_encoding`.
+
+        Returns:
+            np.ndarray or False: float32 samples, or False at the end of the audio stream.
+        """
         if frame_data == b"END_OF_AUDIO":
             return False
-        return np.frombuffer(frame_data, dtype=np.float32)
+        client = self.client_manager.get_client(websocket)
+        return client.audio_decoder.decode(frame_data)
 
     def handle_new_connection(self, websocket, faster_whisper_custom_model_path,
                               whisper_tensorrt_path, trt_multilingual, trt_py_session=False,
@@ -289,15 +401,25 @@ class TranscriptionServer:
             else:
                 options = initial_options
 
-            self.use_vad = options.get('use_vad')
             if self.client_manager.is_server_full(websocket, options):
                 websocket.close()
                 return False  # Indicates that the connection should not continue
 
-            if self.backend.is_tensorrt():
-                self.vad_detector = VoiceActivityDetector(frame_rate=self.RATE)
+            try:
+                audio_decoder = AudioFrameDecoder(
+                    options.get("audio_encoding", "pcm_f32"),
+                    sample_rate=options.get("sample_rate", ServeClientBase.RATE),
+                    channels=options.get("channels", 1),
+                    rate=ServeClientBase.RATE,
+                )
+            except ValueError as e:
+                websocket.send(json.dumps({"uid": options.get("uid"), "status": "ERROR", "message": str(e)}))
+                websocket.close()
+                return False
+
             self.initialize_client(websocket, options, faster_whisper_custom_model_path,
-                                   whisper_tensorrt_path, trt_multilingual, trt_py_session=trt_py_session)
+                                   whisper_tensorrt_path, trt_multilingual, trt_py_session=trt_py_session,
+                                   audio_decoder=audio_decoder)
             return True
         except json.JSONDecodeError:
             logging.error("Failed to decode JSON from client")
@@ -311,6 +433,12 @@ class TranscriptionServer:
 
     def process_audio_frames(self, websocket):
         frame_np = self.get_audio_from_websocket(websocket)
+        return self.handle_audio_frame(websocket, frame_np)
+
+    def handle_audio_message(self, websocket, frame_data):
+        return self.handle_audio_frame(websocket, self.decode_audio_frame(websocket, frame_data))
+
+    def handle_audio_frame(self, websocket, frame_np):
         client = self.client_manager.get_client(websocket)
         if frame_np is False:
             if self.backend.is_tensorrt():
@@ -318,11 +446,8 @@ class TranscriptionServer:
             return False
 
         if self.backend.is_tensorrt():
-            voice_active = self.voice_activity(websocket, frame_np)
-            if voice_active:
-                self.no_voice_activity_chunks = 0
-                client.set_eos(False)
-            if self.use_vad and not voice_active:
+            voice_active = client.voice_activity(frame_np)
+            if client.use_vad and not voice_active:
                 return True
 
         client.add_frames(frame_np)
@@ -387,6 +512,131 @@ class TranscriptionServer:
             self.client_manager.remove_monitor(websocket)
             logging.debug("Monitor disconnected")
 
+    async def recv_audio_async(self,
+                               websocket,
+                               backend: BackendType = BackendType.FASTER_WHISPER,
+                               faster_whisper_custom_model_path=None,
+                               whisper_tensorrt_path=None,
+                               trt_multilingual=False,
+                               trt_py_session=False):
+        """
+        Asyncio counterpart of `recv_audio`.
+
+        Connection I/O stays on the event loop; client initialization (model loading) and
+        transcription passes run on the bounded `inference_executor`. Frames are decoded,
+        resampled and (for TensorRT) run through VAD on the loop's default executor, one at a
+        time per connection so they are buffered in order.
+        """
+        self.backend = backend
+        try:
+            options = json.loads(await websocket.recv())
+        except Exception:
+            return
+
+        connection = AsyncWebSocketAdapter(websocket, self.loop)
+        if options.get("task") == "monitor":
+            await self.handle_monitor_client_async(websocket, connection)
+            return
+
+        initialized = await self.loop.run_in_executor(
+            self.inference_executor,
+            functools.partial(
+                self.handle_new_connection, connection, faster_whisper_custom_model_path,
+                whisper_tensorrt_path, trt_multilingual, trt_py_session=trt_py_session,
+                initial_options=options,
+            ),
+        )
+        client = self.client_manager.get_client(connection)
+        if not initialized or not client:
+            return
+
+        try:
+            async for frame_data in websocket:
+                if self.client_manager.is_client_timeout(connection):
+                    break
+                handled = await self.loop.run_in_executor(
+                    None, self.handle_audio_message, connection, frame_data)
+                if not handled:
+                    break
+                self.schedule_transcription(client)
+        except ConnectionClosed:
+            logging.debug("Connection closed by client")
+        except Exception as e:
+            logging.debug(f"Unexpected error: {str(e)}")
+        finally:
+            if self.client_manager.get_client(connection):
+                # cleanup may wait on the translation thread, keep it off the event loop
+                await self.loop.run_in_executor(None, self.cleanup, connection)
+                await websocket.close()
+
+    async def handle_monitor_client_async(self, websocket, connection):
+        logging.debug("New monitor connected")
+        self.client_manager.add_monitor(connection)
+        try:
+            await websocket.send(json.dumps({"status": "MONITOR_READY"}))
+            # Keep connection open until client disconnects
+            async for _ in websocket:
+                pass
+        except ConnectionClosed:
+            pass
+        finally:
+            self.client_manager.remove_monitor(connection)
+            logging.debug("Monitor disconnected")
+
+    def schedule_transcription(self, client, force=False):
+        """
+        Submit a transcription pass for `client` to the inference executor if one is due.
+
+        At most one pass per client is in flight. Must be called on the event loop thread.
+        Clients running their own transcription thread (`trans_thread`, e.g. TensorRT) are
+        left alone, so they are never driven twice.
+
+        Args:
+            client (ServeClientBase): The client to transcribe for.
+            force (bool): Run a pass even without new audio, used to re-run an incomplete segment
+                so the repeated-output logic can finalize it.
+        """
+        if client.exit or client.trans_thread is not None or client in self.pending_passes:
+            return
+        if not force and not client.has_new_audio():
+            return
+        future = self.loop.run_in_executor(self.inference_executor, client.process_audio_chunk)
+        self.pending_passes[client] = future
+        future.add_done_callback(functools.partial(self.on_transcription_done, client))
+
+    def on_transcription_done(self, client, future):
+        self.pending_passes.pop(client, None)
+        if client.exit:
+            return
+        if client.has_new_audio():
+            self.schedule_transcription(client)
+        elif client.current_out:
+            self.loop.call_later(client.repeat_interval, self.schedule_transcription, client, True)
+
+    async def serve_asyncio(self, host, port, inference_workers=4, **connection_kwargs):
+        """
+        Serve websocket connections from a single asyncio event loop.
+
+        Args:
+            host (str): Interface to listen on.
+            port (int): Port to listen on.
+            inference_workers (int): Size of the executor running client setup and transcription passes.
+            **connection_kwargs: Forwarded to `recv_audio_async` for every connection.
+        """
+        self.loop = asyncio.get_running_loop()
+        self.inference_executor = ThreadPoolExecutor(
+            max_workers=inference_workers, thread_name_prefix="inference")
+        try:
+            async with async_serve(
+                functools.partial(self.recv_audio_async, **connection_kwargs),
+                host,
+                port
+            ) as server:
+                await server.serve_forever()
+        finally:
+            self.inference_executor.shutdown(wait=False)
+            self.inference_executor = None
+
     def run(self,
             host,
             port=9090,
@@ -401,8 +651,26 @@ class TranscriptionServer:
             cache_path="~/.cache/whisper-live/",
             rest_port=8000,
             enable_rest=False,
-            cors_origins: Optional[str] = None):
+            cors_origins: Optional[str] = None,
+            max_batch_size=1,
+            max_batch_wait_ms=10,
+            server_mode="sync",
+            inference_workers=4,
+            rest_max_models=2,
+            rest_workers=2,
+            rest_queue_depth=8,
+            rest_retry_after=5,
+            job_workers=1,
+            transcript_dir=None,
+            translation_engine="transformers",
+            max_models=None,
+            max_memory_mb=None,
+            max_model_concurrency=1):
         self.cache_path = cache_path
+        self.transcript_dir = transcript_dir
+        self.translation_engine = translation_engine
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait_ms = max_batch_wait_ms
         self.client_manager = ClientManager(max_clients, max_connection_time)
         if faster_whisper_custom_model_path is not None and not os.path.exists(faster_whisper_custom_model_path):
             if "/" not in faster_whisper_custom_model_path:
@@ -413,66 +681,148 @@ class TranscriptionServer:
             if faster_whisper_custom_model_path or whisper_tensorrt_path:
                 logging.debug("Custom model provided. Switching to single model mode.")
                 self.single_model = True
-
+            elif backend == BackendType.FASTER_WHISPER.value and self.has_preloaded_model():
+                logging.debug("Preloaded model found. Switching to single model mode.")
+                self.single_model = True
             else:
                 logging.debug("Single model mode currently only works with custom models.")
         if not BackendType.is_valid(backend):
             raise ValueError(f"{backend} is not a valid backend type. Choose backend from {BackendType.valid_types()}")
+        if server_mode not in ("sync", "asyncio"):
+            raise ValueError(f"{server_mode} is not a valid server mode. Choose from ['sync', 'asyncio']")
+
+        if backend == BackendType.FASTER_WHISPER.value:
+            self.model_pool = self.create_model_pool(
+                max_models or rest_max_models, max_memory_mb, max_model_concurrency)
 
         # New OpenAI-compatible REST API (toggleable via enable_rest boolean)
         if enable_rest:
-            app = FastAPI(title="WhisperLive OpenAI-Compatible API")
-            origins = [o.strip() for o in cors_origins.split(',')] if cors_origins else []
-            app.add_middleware(
-                CORSMiddleware,
-                allow_origins=origins,
-                allow_credentials=True,
-                allow_methods=["*"],  # Allows all methods (GET, POST, etc.)
-                allow_headers=["*"],  # Allows all headers
-            )
+            if self.model_pool is None:
+                self.model_pool = self.create_model_pool(
+                    max_models or rest_max_models, max_memory_mb, max_model_concurrency)
+            self.rest_executor = BoundedExecutor(rest_workers, rest_queue_depth, retry_after=rest_retry_after)
+            app = self.create_rest_app(
+                faster_whisper_custom_model_path, cors_origins, cache_path, job_workers, transcript_dir)
 
+            threading.Thread(
+                target=uvicorn.run,
+                args=(app,),
+                kwargs={"host": "0.0.0.0", "port": rest_port, "log_level": "info"},
+                daemon=True
+            ).start()
+            logging.info(f"✅ REST API started on http://0.0.0.0:{rest_port}")
+
+        connection_kwargs = dict(
+            backend=BackendType(backend),
+            faster_whisper_custom_model_path=faster_whisper_custom_model_path,
+            whisper_tensorrt_path=whisper_tensorrt_path,
+            trt_multilingual=trt_multilingual,
+            trt_py_session=trt_py_session,
+        )
+        try:
+            if server_mode == "asyncio":
+                asyncio.run(self.serve_asyncio(host, port, inference_workers=inference_workers, **connection_kwargs))
+                return
 
-            @app.post("/v1/audio/transcriptions")
-            async def transcribe(
-                file: UploadFile,
-                model: str = Form(default="whisper-1"),
-                language: Optional[str] = Form(default=None),
-                prompt: Optional[str] = Form(default=None),
-                response_format: str = Form(default="json"),
-                temperature: float = Form(default=0.0),
-                timestamp_granularities: Optional[List[str]] = Form(default=None),
-                # Stubs for unsupported OpenAI params
-                chunking_strategy: Optional[str] = Form(default=None),
-                include: Optional[List[str]] = Form(default=None),
-                known_speaker_names: Optional[List[str]] = Form(default=None),
-                known_speaker_references: Optional[List[str]] = Form(default=None),
-                stream: bool = Form(default=False)
-            ):
-                if stream:
-                    return JSONResponse({"error": "Streaming not supported in this backend."}, status_code=400)
-                if chunking_strategy or known_speaker_names or known_speaker_references:
-                    logging.debug("Diarization/chunking params ignored; not supported.")
-
-                supported_formats = ["json", "text", "srt", "verbose_json", "vtt"]
-                if response_format not in supported_formats:
-                    return JSONResponse({"error": f"Unsupported response_format. Supported: {supported_formats}"}, status_code=400)
-
-                if model != "whisper-1":
-                    logging.debug(f"Model '{model}' requested; using 'small' as fallback.")
-                model_name = faster_whisper_custom_model_path or "small"
+            # Original WebSocket server (always supported)
+            with serve(
+                functools.partial(self.recv_audio, **connection_kwargs),
+                host,
+                port
+            ) as server:
+                server.serve_forever()
+        finally:
+            self.shutdown()
 
-                try:
-                    suffix = os.path.splitext(file.filename)[1] or ".wav"
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                        shutil.copyfileobj(file.file, tmp)
-                        tmp_path = tmp.name
+    def status(self):
+        """
+        Server status for the REST `/v1/status` endpoint.
+
+        Returns:
+            dict: Number of connected clients and the hit/miss statistics of the translation
+                caches (empty until a translation client connected).
+        """
+        translation_cache = []
+        translation_backend = sys.modules.get("yap.whisper_live.backend.translation_backend")
+        if translation_backend is not None:
+            translation_cache = translation_backend.ServeClientTranslation.translation_cache_stats()
+        return {
+            "clients": len(self.client_manager.clients) if self.client_manager is not None else 0,
+            "translation_cache": translation_cache,
+        }
 
-                    device = "cuda" if torch.cuda.is_available() else "cpu"
-                    compute_type = "float16" if device == "cuda" else "int8"
+    def shutdown(self):
+        """
+        Stop the process-wide batching workers and the job runner once the server stops.
+
+        Backends are only imported on first use, so only workers of loaded backends are stopped.
+        """
+        if self.job_runner is not None:
+            self.job_runner.stop()
+        faster_whisper_backend = sys.modules.get("yap.whisper_live.backend.faster_whisper_backend")
+        if faster_whisper_backend is not None:
+            faster_whisper_backend.ServeClientFasterWhisper.stop_batch_scheduler()
+        translation_backend = sys.modules.get("yap.whisper_live.backend.translation_backend")
+        if translation_backend is not None:
+            translation_backend.ServeClientTranslation.unload_translation_models()
 
-                    transcriber = WhisperModel(model_name, device=device, compute_type=compute_type)
-                    segments, info = transcriber.transcribe(
-                        tmp_path,
+    def create_rest_app(self, faster_whisper_custom_model_path=None, cors_origins=None,
+                        cache_path="~/.cache/whisper-live/", job_workers=1, transcript_dir=None):
+        """
+        Build the OpenAI-compatible REST app.
+
+        `model_pool` and `rest_executor` must already be set up.
+
+        Returns:
+            FastAPI: The app, with the job and transcript endpoints registered when enabled.
+        """
+        app = FastAPI(title="WhisperLive OpenAI-Compatible API")
+        origins = [o.strip() for o in cors_origins.split(',')] if cors_origins else []
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=origins,
+            allow_credentials=True,
+            allow_methods=["*"],  # Allows all methods (GET, POST, etc.)
+            allow_headers=["*"],  # Allows all headers
+        )
+
+
+        @app.post("/v1/audio/transcriptions")
+        async def transcribe(
+            file: UploadFile,
+            model: str = Form(default="whisper-1"),
+            language: Optional[str] = Form(default=None),
+            prompt: Optional[str] = Form(default=None),
+            response_format: str = Form(default="json"),
+            temperature: float = Form(default=0.0),
+            timestamp_granularities: Optional[List[str]] = Form(default=None),
+            # Stubs for unsupported OpenAI params
+            chunking_strategy: Optional[str] = Form(default=None),
+            include: Optional[List[str]] = Form(default=None),
+            known_speaker_names: Optional[List[str]] = Form(default=None),
+            known_speaker_references: Optional[List[str]] = Form(default=None),
+            stream: bool = Form(default=False)
+        ):
+            if chunking_strategy or known_speaker_names or known_speaker_references:
+                logging.debug("Diarization/chunking params ignored; not supported.")
+
+            supported_formats = ["json", "text", "srt", "verbose_json", "vtt"]
+            if response_format not in supported_formats:
+                return JSONResponse({"error": f"Unsupported response_format. Supported: {supported_formats}"}, status_code=400)
+
+            model_name = self.rest_model_name(faster_whisper_custom_model_path)
+            if model != "whisper-1":
+                logging.debug(f"Model '{model}' requested; using '{model_name}' instead.")
+
+            @contextlib.contextmanager
+            def transcribe_segments():
+                # Decode straight from the spooled upload (in memory for small files)
+                # with PyAV into 16 kHz float32, without a temp file round trip.
+                file.file.seek(0)
+                audio = decode_audio(file.file, sampling_rate=self.RATE)
+                with self.use_pooled_model(model_name) as transcriber:
+                    yield transcriber.transcribe(
+                        audio,
                         language=language,
                         initial_prompt=prompt,
                         temperature=temperature,
@@ -480,87 +830,294 @@ class TranscriptionServer:
                         word_timestamps=(timestamp_granularities and "word" in timestamp_granularities)
                     )
 
-                    text = " ".join([s.text.strip() for s in segments])
-                    os.unlink(tmp_path)
-
-                    if response_format == "text":
-                        return PlainTextResponse(text)
-                    elif response_format == "json":
-                        return {"text": text}
-                    elif response_format == "verbose_json":
-                        verbose = {
-                            "task": "transcribe",
-                            "language": info.language,
-                            "duration": info.duration,
-                            "text": text,
-                            "segments": []
+            if not self.rest_executor.try_acquire():
+                return JSONResponse(
+                    {"error": "Server is busy, retry later."},
+                    status_code=503,
+                    headers={"Retry-After": str(self.rest_executor.retry_after)},
+                )
+
+            if stream:
+                return self.stream_transcription(transcribe_segments)
+
+            try:
+                def run_transcription():
+                    with transcribe_segments() as (segments, info):
+                        # decode fully inside the worker, not lazily on the event loop
+                        return list(segments), info
+
+                segments, info = await self.rest_executor.run(run_transcription)
+                text = " ".join([s.text.strip() for s in segments])
+
+                if response_format == "text":
+                    return PlainTextResponse(text)
+                elif response_format == "json":
+                    return {"text": text}
+                elif response_format == "verbose_json":
+                    verbose = {
+                        "task": "transcribe",
+                        "language": info.language,
+                        "duration": info.duration,
+                        "text": text,
+                        "segments": []
+                    }
+                    for seg in segments:
+                        seg_dict = {
+                            "id": seg.id,
+                            "seek": seg.seek,
+                            "start": seg.start,
+                            "end": seg.end,
+                            "text": seg.text.strip(),
+                            "tokens": seg.tokens,
+                            "temperature": seg.temperature,
+                            "avg_logprob": seg.avg_logprob,
+                            "compression_ratio": seg.compression_ratio,
+                            "no_speech_prob": seg.no_speech_prob
                         }
-                        for seg in segments:
-                            seg_dict = {
-                                "id": seg.id,
-                                "seek": seg.seek,
-                                "start": seg.start,
-                                "end": seg.end,
-                                "text": seg.text.strip(),
-                                "tokens": seg.tokens,
-                                "temperature": seg.temperature,
-                                "avg_logprob": seg.avg_logprob,
-                                "compression_ratio": seg.compression_ratio,
-                                "no_speech_prob": seg.no_speech_prob
-                            }
-                            if timestamp_granularities and "word" in timestamp_granularities:
-                                seg_dict["words"] = [{"word": w.word, "start": w.start, "end": w.end, "probability": w.probability} for w in seg.words]
-                            verbose["segments"].append(seg_dict)
-                        return verbose
-                    elif response_format in ["srt", "vtt"]:
-                        output = []
-                        for i, seg in enumerate(segments, 1):
-                            start = f"{int(seg.start // 3600):02}:{int((seg.start % 3600) // 60):02}:{seg.start % 60:06.3f}"
-                            end = f"{int(seg.end // 3600):02}:{int((seg.end % 3600) // 60):02}:{seg.end % 60:06.3f}"
-                            if response_format == "srt":
-                                output.append(f"{i}\n{start.replace('.', ',')} --> {end.replace('.', ',')}\n{seg.text.strip()}\n")
-                            else:  # vtt
-                                output.append(f"{start} --> {end}\n{seg.text.strip()}\n")
-                        return PlainTextResponse("\n".join(output))
-                except Exception as e:
-                    return JSONResponse({"error": str(e)}, status_code=500)
+                        if timestamp_granularities and "word" in timestamp_granularities:
+                            seg_dict["words"] = [{"word": w.word, "start": w.start, "end": w.end, "probability": w.probability} for w in seg.words]
+                        verbose["segments"].append(seg_dict)
+                    return verbose
+                elif response_format in ["srt", "vtt"]:
+                    return PlainTextResponse(format_subtitles(
+                        [{"start": seg.start, "end": seg.end, "text": seg.text} for seg in segments],
+                        response_format,
+                    ))
+            except Exception as e:
+                return JSONResponse({"error": str(e)}, status_code=500)
+            finally:
+                self.rest_executor.release()
 
-            threading.Thread(
-                target=uvicorn.run,
-                args=(app,),
-                kwargs={"host": "0.0.0.0", "port": rest_port, "log_level": "info"},
-                daemon=True
-            ).start()
-            logging.info(f"✅ REST API started on http://0.0.0.0:{rest_port}")
+        @app.get("/v1/status")
+        async def get_status():
+            return self.status()
 
-        # Original WebSocket server (always supported)
-        with serve(
-            functools.partial(
-                self.recv_audio,
-                backend=BackendType(backend),
-                faster_whisper_custom_model_path=faster_whisper_custom_model_path,
-                whisper_tensorrt_path=whisper_tensorrt_path,
-                trt_multilingual=trt_multilingual,
-                trt_py_session=trt_py_session,
-            ),
-            host,
-            port
-        ) as server:
-            server.serve_forever()
+        if job_workers > 0:
+            self.setup_job_api(app, faster_whisper_custom_model_path, cache_path, job_workers)
+        if transcript_dir:
+            self.setup_transcript_api(app, transcript_dir)
+        return app
 
-    def voice_activity(self, websocket, frame_np):
+    def stream_transcription(self, transcribe_segments):
         """
-        Evaluates the voice activity in a given audio frame.
+        Stream a REST transcription as Server-Sent Events.
+
+        Segments are pulled from faster-whisper's lazy generator on a REST worker thread and
+        emitted as OpenAI-style `transcript.text.delta` events as soon as each one is decoded,
+        followed by a final `transcript.text.done` event. The caller must already hold a
+        `rest_executor` slot; it is released when the worker finishes.
+
+        Args:
+            transcribe_segments (callable): Returns a context manager yielding the (segments, info)
+                pair from `WhisperModel.transcribe`, kept open while the segments are consumed.
+
+        Returns:
+            StreamingResponse: The `text/event-stream` response.
         """
-        if not self.vad_detector(frame_np):
-            self.no_voice_activity_chunks += 1
-            if self.no_voice_activity_chunks > 3:
-                client = self.client_manager.get_client(websocket)
-                if not client.eos:
-                    client.set_eos(True)
-                time.sleep(0.1)    # Sleep 100m; wait some voice activity.
-            return False
-        return True
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def produce():
+            try:
+                with transcribe_segments() as (segments, _):
+                    for segment in segments:
+                        if cancelled.is_set():
+                            break
+                        loop.call_soon_threadsafe(events.put_nowait, ("delta", segment.text.strip()))
+            except Exception as e:
+                loop.call_soon_threadsafe(events.put_nowait, ("error", str(e)))
+            finally:
+                loop.call_soon_threadsafe(events.put_nowait, ("end", None))
+
+        worker = asyncio.ensure_future(self.rest_executor.run(produce))
+        worker.add_done_callback(lambda _: self.rest_executor.release())
+
+        def sse(event):
+            return f"data: {json.dumps(event)}\n\n"
+
+        async def event_stream():
+            texts = []
+            try:
+                while True:
+                    kind, payload = await events.get()
+                    if kind == "end":
+                        break
+                    if kind == "error":
+                        yield sse({"type": "error", "error": payload})
+                        return
+                    if not payload:
+                        continue
+                    yield sse({"type": "transcript.text.delta", "delta": payload if not texts else " " + payload})
+                    texts.append(payload)
+                yield sse({"type": "transcript.text.done", "text": " ".join(texts)})
+            finally:
+                # stop decoding if the client went away
+                cancelled.set()
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    def setup_job_api(self, app, faster_whisper_custom_model_path, cache_path, job_workers):
+        """
+        Register the batch transcription job endpoints on the REST app.
+
+        Jobs are persisted under `<cache_path>/jobs` and processed by `job_workers` threads
+        sharing the REST model pool and model (see `rest_model_name`).
+
+        Endpoints:
+            POST /v1/jobs: submit one or more files, returns the queued jobs.
+            GET /v1/jobs: list jobs, optionally filtered by `status`.
+            GET /v1/jobs/{job_id}: job status.
+            GET /v1/jobs/{job_id}/result: result as json, verbose_json, text, srt or vtt.
+        """
+        self.job_store = TranscriptionJobStore(os.path.join(cache_path, "jobs"))
+        self.job_runner = TranscriptionJobRunner(
+            self.job_store,
+            lambda: self.use_pooled_model(self.rest_model_name(faster_whisper_custom_model_path)),
+            num_workers=job_workers,
+            sampling_rate=self.RATE,
+        )
+
+        @app.post("/v1/jobs")
+        async def submit_jobs(
+            files: List[UploadFile],
+            language: Optional[str] = Form(default=None),
+            prompt: Optional[str] = Form(default=None),
+        ):
+            jobs = []
+            for upload in files:
+                # writing the upload to the job directory is blocking disk I/O
+                jobs.append(await asyncio.to_thread(
+                    self.job_store.submit, upload.file, upload.filename, language, prompt))
+            self.job_runner.notify()
+            return {"jobs": jobs}
+
+        @app.get("/v1/jobs")
+        async def list_jobs(status: Optional[str] = None, limit: int = 100):
+            return {"jobs": self.job_store.list(status=status, limit=limit)}
+
+        @app.get("/v1/jobs/{job_id}")
+        async def get_job(job_id: str):
+            job = self.job_store.get(job_id)
+            if job is None:
+                return JSONResponse({"error": "Job not found."}, status_code=404)
+            return job
+
+        @app.get("/v1/jobs/{job_id}/result")
+        async def get_job_result(job_id: str, response_format: str = "json"):
+            supported_formats = ["json", "text", "srt", "verbose_json", "vtt"]
+            if response_format not in supported_formats:
+                return JSONResponse({"error": f"Unsupported response_format. Supported: {supported_formats}"}, status_code=400)
+
+            job = self.job_store.get(job_id, include_result=True)
+            if job is None:
+                return JSONResponse({"error": "Job not found."}, status_code=404)
+            if job["status"] != TranscriptionJobStore.COMPLETED:
+                return JSONResponse(
+                    {"error": f"Job is {job['status']}.", "status": job["status"], "detail": job.get("error")},
+                    status_code=409,
+                )
+
+            result = job["result"]
+            if response_format == "text":
+                return PlainTextResponse(result["text"])
+            elif response_format == "json":
+                return {"text": result["text"]}
+            elif response_format == "verbose_json":
+                return {"task": "transcribe", **result}
+            return PlainTextResponse(format_subtitles(result["segments"], response_format))
+
+    def setup_transcript_api(self, app, transcript_dir):
+        """
+        Register the endpoint serving the transcript logs of websocket sessions.
+
+        Endpoints:
+            GET /v1/transcripts/{uid}: every completed segment of the session as json, text, srt or vtt.
+        """
+        @app.get("/v1/transcripts/{uid}")
+        async def get_transcript(uid: str, response_format: str = "json"):
+            supported_formats = ["json", "text", "srt", "vtt"]
+            if response_format not in supported_formats:
+                return JSONResponse({"error": f"Unsupported response_format. Supported: {supported_formats}"}, status_code=400)
+
+            path = ServeClientBase.transcript_log_path(transcript_dir, uid)
+            if not os.path.exists(path):
+                return JSONResponse({"error": "Transcript not found."}, status_code=404)
+
+            def read_segments():
+                with open(path, encoding="utf-8") as f:
+                    return [json.loads(line) for line in f if line.strip()]
+
+            segments = await asyncio.to_thread(read_segments)
+            if response_format == "json":
+                return {"uid": uid, "segments": segments}
+            if response_format == "text":
+                return PlainTextResponse(" ".join(seg["text"].strip() for seg in segments))
+            return PlainTextResponse(format_subtitles(
+                [{"start": float(seg["start"]), "end": float(seg["end"]), "text": seg["text"]} for seg in segments],
+                response_format,
+            ))
+
+    def resolve_model_config(self, model_name):
+        """
+        Pick the (device, compute_type) to load `model_name` with for REST and job requests.
+
+        Reuses any resident configuration of the model (e.g. the preloaded one).
+        """
+        resident = self.model_pool.find(model_name)
+        if resident is not None:
+            return resident
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        compute_type = "float16" if device == "cuda" else "int8"
+        return device, compute_type
+
+    @staticmethod
+    def rest_model_name(faster_whisper_custom_model_path=None):
+        """
+        Model used by the REST and job endpoints: the custom model if one was given, otherwise
+        the preloaded model, so the API shares it instead of loading a second one. Falls back
+        to "small" when nothing was preloaded.
+        """
+        from yap.whisper_live.backend.faster_whisper_backend import ServeClientFasterWhisper
+
+        if faster_whisper_custom_model_path:
+            return faster_whisper_custom_model_path
+        single_config = ServeClientFasterWhisper.SINGLE_MODEL_CONFIG
+        return single_config[0] if single_config is not None else "small"
+
+    @contextlib.contextmanager
+    def use_pooled_model(self, model_name):
+        """
+        Yield the pooled `model_name` while holding one of its decode slots, so REST and job
+        decodes count against `max_concurrency` like websocket clients do. The model is
+        acquired for the whole block, so it cannot be evicted while a decode is using it.
+
+        faster-whisper decodes segments lazily, so they must be consumed inside the block.
+        """
+        device, compute_type = self.resolve_model_config(model_name)
+        model = self.model_pool.acquire(model_name, device, compute_type)
+        try:
+            with self.model_pool.slot(model_name, device, compute_type):
+                yield model
+        finally:
+            self.model_pool.release(model_name, device, compute_type)
+
+    @staticmethod
+    def create_model_pool(max_models, max_memory_mb=None, max_concurrency=None):
+        """
+        Configure the model pool shared by websocket clients and the REST API. It is seeded
+        with the preloaded model if there is one.
+        """
+        from yap.whisper_live.backend.faster_whisper_backend import ServeClientFasterWhisper
+
+        return ServeClientFasterWhisper.get_model_pool(
+            max_models=max_models, max_memory_mb=max_memory_mb, max_concurrency=max_concurrency)
+
+    @staticmethod
+    def has_preloaded_model():
+        """Whether `ServeClientFasterWhisper.preload_model` has already loaded the shared model."""
+        from yap.whisper_live.backend.faster_whisper_backend import ServeClientFasterWhisper
+        return ServeClientFasterWhisper.SINGLE_MODEL is not None
 
     def cleanup(self, websocket):
         client = self.client_manager.get_client(websocket)
@@ -30,6 +30,28 @@ def format_time(s):
     return f"{hours:02}:{minutes:02}:{seconds:02},{milliseconds:03}"
 
 
+def format_subtitles(segments, response_format="srt"):
+    """
+    Render segments as SRT or WebVTT cues.
+
+    Args:
+        segments (list): Dicts with 'start' and 'end' (seconds) and 'text'.
+        response_format (str): "srt" or "vtt". Defaults to "srt".
+
+    Returns:
+        str: The subtitle document body.
+    """
+    output = []
+    for i, seg in enumerate(segments, 1):
+        start = f"{int(seg['start'] // 3600):02}:{int((seg['start'] % 3600) // 60):02}:{seg['start'] % 60:06.3f}"
+        end = f"{int(seg['end'] // 3600):02}:{int((seg['end'] % 3600) // 60):02}:{seg['end'] % 60:06.3f}"
+        if response_format == "srt":
+            output.append(f"{i}\n{start.replace('.', ',')} --> {end.replace('.', ',')}\n{seg['text'].strip()}\n")
+        else:  # vtt
+            output.append(f"{start} --> {end}\n{seg['text'].strip()}\n")
+    return "\n".join(output)
+
+
 def create_srt_file(segments, resampled_file):
     with open(resampled_file, 'w', encoding='utf-8') as srt_file:
         segment_number = 1
@@ -1,5 +1,7 @@
 import os
+import logging
 import subprocess
+import threading
 import torch
 import numpy as np
 import onnxruntime
@@ -7,20 +9,24 @@ import warnings
 
 
 class VoiceActivityDetection():
+    # process-wide ONNX sessions keyed by (model path, provider), shared by every instance
+    SESSIONS = {}
+    SESSIONS_LOCK = threading.Lock()
+    MODEL_PATH = None
 
-    def __init__(self, force_onnx_cpu=True):
-        path = self.download()
-
-        opts = onnxruntime.SessionOptions()
-        opts.log_severity_level = 3
-
-        opts.inter_op_num_threads = 1
-        opts.intra_op_num_threads = 1
-
+    def __init__(self, force_onnx_cpu=True, save_optimized_model=True):
+        """
+        Args:
+            force_onnx_cpu (bool): Run on the CPU execution provider when available. Defaults to True.
+            save_optimized_model (bool): Serialize the optimized graph next to the model file and load
+                it on later starts instead of re-optimizing. Defaults to True.
+        """
+        path = self.model_path()
         if force_onnx_cpu and 'CPUExecutionProvider' in onnxruntime.get_available_providers():
-            self.session = onnxruntime.InferenceSession(path, providers=['CPUExecutionProvider'], sess_options=opts)
+            provider = 'CPUExecutionProvider'
         else:
-            self.session = onnxruntime.InferenceSession(path, providers=['CUDAExecutionProvider'], sess_options=opts)
+            provider = 'CUDAExecutionProvider'
+        self.session = self.get_session(path, provider, save_optimized_model)
 
         self.reset_states()
         if '16k' in path:
@@ -29,6 +35,66 @@ class VoiceActivityDetection():
         else:
             self.sample_rates = [8000, 16000]
 
+    @classmethod
+    def model_path(cls):
+        """Locate (downloading on first use) the model file once per process."""
+        with cls.SESSIONS_LOCK:
+            if cls.MODEL_PATH is None:
+                cls.MODEL_PATH = cls.download()
+            return cls.MODEL_PATH
+
+    @classmethod
+    def get_session(cls, path, provider, save_optimized_model=True):
+        """
+        Return the shared `InferenceSession` for a model file and execution provider.
+
+        onnxruntime supports concurrent `run` calls on one session, so the session is shared
+        directly between all detectors and streams. Each stream keeps its own recurrent state.
+
+        Args:
+            path (str): Path to the ONNX model.
+            provider (str): onnxruntime execution provider.
+            save_optimized_model (bool): Cache the optimized graph on disk. Defaults to True.
+
+        Returns:
+            onnxruntime.InferenceSession: The shared session.
+        """
+        key = (path, provider)
+        with cls.SESSIONS_LOCK:
+            if key not in cls.SESSIONS:
+                cls.SESSIONS[key] = cls.create_session(path, provider, save_optimized_model)
+            return cls.SESSIONS[key]
+
+    @staticmethod
+    def create_session(path, provider, save_optimized_model=True):
+        opts = onnxruntime.SessionOptions()
+        opts.log_severity_level = 3
+
+        opts.inter_op_num_threads = 1
+        opts.intra_op_num_threads = 1
+
+        if save_optimized_model:
+            # optimized graphs may contain provider specific nodes, so keep one file per provider
+            optimized_path = f"{os.path.splitext(path)[0]}.{provider}.opt.onnx"
+            if os.path.exists(optimized_path) and os.path.getmtime(optimized_path) >= os.path.getmtime(path):
+                opts.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
+                try:
+                    return onnxruntime.InferenceSession(optimized_path, providers=[provider], sess_options=opts)
+                except Exception as e:
+                    logging.warning(f"Failed to load optimized VAD model {optimized_path}: {e}")
+                opts.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            opts.optimized_model_filepath = optimized_path
+
+        try:
+            return onnxruntime.InferenceSession(path, providers=[provider], sess_options=opts)
+        except Exception as e:
+            if not save_optimized_model:
+                raise
+            # e.g. the cache directory is read-only
+            logging.warning(f"Failed to save optimized VAD model: {e}")
+            opts.optimized_model_filepath = ""
+            return onnxruntime.InferenceSession(path, providers=[provider], sess_options=opts)
+
     def _validate_input(self, x, sr: int):
         if x.dim() == 1:
             x = x.unsqueeze(0)
@@ -108,6 +174,18 @@ class VoiceActivityDetection():
         stacked = torch.cat(outs, dim=1)
         return stacked.cpu()
 
+    def stream(self, sr: int = 16000):
+        """
+        Create a streaming VAD context sharing this model's ONNX session.
+
+        Args:
+            sr (int): Sample rate of the audio that will be fed to the stream. Defaults to 16000.
+
+        Returns:
+            VoiceActivityStream: A new stream with zeroed recurrent state.
+        """
+        return VoiceActivityStream(self.session, sr)
+
     @staticmethod
     def download(model_url="https://github.com/snakers4/silero-vad/raw/v5.0/files/silero_vad.onnx"):
         target_dir = os.path.expanduser("~/.cache/whisper-live/")
@@ -128,23 +206,239 @@ class VoiceActivityDetection():
         return model_filename
 
 
+class VoiceActivityStream:
+    """
+    Streaming Silero VAD over NumPy buffers.
+
+    Keeps the recurrent state, the model's audio context and any samples left over from
+    an incomplete window across calls, so audio can be fed in arbitrary packet sizes and
+    every 512-sample window (256 at 8 kHz) is evaluated exactly once, with the same result
+    as running the whole stream at once.
+    """
+
+    def __init__(self, session, sr: int = 16000):
+        """
+        Args:
+            session (onnxruntime.InferenceSession): Silero VAD session, may be shared between streams.
+            sr (int): Sample rate, 8000 or 16000. Defaults to 16000.
+        """
+        if sr not in (8000, 16000):
+            raise ValueError("Supported sampling rates: [8000, 16000]")
+        self.session = session
+        self.sr = sr
+        self.num_samples = 512 if sr == 16000 else 256
+        self.context_size = 64 if sr == 16000 else 32
+        self._sr = np.array(sr, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        """Reset the recurrent state, context and pending samples."""
+        self._state = np.zeros((2, 1, 128), dtype=np.float32)
+        # model input: [context | window], the context is the tail of the previous input
+        self._input = np.zeros((1, self.context_size + self.num_samples), dtype=np.float32)
+        self._pending = np.zeros(0, dtype=np.float32)
+
+    def __call__(self, audio):
+        """
+        Feed audio to the stream.
+
+        Args:
+            audio (np.ndarray): 1-D float32 audio samples, any length.
+
+        Returns:
+            np.ndarray: Speech probability of every window completed by this call (possibly empty).
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        if self._pending.shape[0]:
+            audio = np.concatenate((self._pending, audio))
+
+        n_windows = audio.shape[0] // self.num_samples
+        probs = np.empty(n_windows, dtype=np.float32)
+        for i in range(n_windows):
+            self._input[:, :self.context_size] = self._input[:, -self.context_size:]
+            self._input[0, self.context_size:] = audio[i * self.num_samples:(i + 1) * self.num_samples]
+            out, self._state = self.session.run(
+                None, {'input': self._input, 'state': self._state, 'sr': self._sr})
+            probs[i] = out[0, 0]
+
+        self._pending = audio[n_windows * self.num_samples:].copy()
+        return probs
+
+
+class BatchedVoiceActivityDetection:
+    """
+    Silero VAD engine that evaluates many streams together.
+
+    Every stream keeps its own slot of recurrent state and context. Whenever streams have
+    complete windows pending, the next window of each is stacked into one `(B, 576)` input
+    and evaluated with a single ONNX call, so the number of session runs per 32 ms of audio
+    stays constant as the number of connections grows.
+
+    Callers don't need a separate worker thread: a caller with windows pending runs one batch
+    holding the next window of every stream, then hands over to the next waiting caller, so
+    windows submitted concurrently by different connections end up in the same batch while
+    no caller evaluates more batches than its own audio needs.
+    """
+
+    def __init__(self, model=None, sr: int = 16000, max_batch_size: int = 128):
+        """
+        Args:
+            model (VoiceActivityDetection, optional): Model whose ONNX session is used. A new one
+                is created if not given.
+            sr (int): Sample rate of all streams, 8000 or 16000. Defaults to 16000.
+            max_batch_size (int): Maximum number of windows evaluated in one call. Defaults to 128.
+        """
+        if sr not in (8000, 16000):
+            raise ValueError("Supported sampling rates: [8000, 16000]")
+        self.session = (model or VoiceActivityDetection()).session
+        self.sr = sr
+        self.num_samples = 512 if sr == 16000 else 256
+        self.context_size = 64 if sr == 16000 else 32
+        self.max_batch_size = max_batch_size
+        self._sr = np.array(sr, dtype=np.int64)
+        self.streams = []
+        self.running = False
+        self.cond = threading.Condition()
+
+    def stream(self, sr: int = 16000):
+        """
+        Register a new stream with zeroed state.
+
+        Returns:
+            BatchedVoiceActivityStream: The stream, to be closed when the connection ends.
+        """
+        if sr != self.sr:
+            raise ValueError(f"Engine runs at {self.sr} Hz, got a stream at {sr} Hz")
+        stream = BatchedVoiceActivityStream(self)
+        with self.cond:
+            self.streams.append(stream)
+        return stream
+
+    def close_stream(self, stream):
+        with self.cond:
+            if stream in self.streams:
+                self.streams.remove(stream)
+
+    def process(self, stream, audio):
+        """
+        Queue audio on `stream` and wait until all of its complete windows are evaluated.
+
+        Audio for a stream that was closed (or never registered with this engine) is dropped,
+        since no batch would ever evaluate it.
+
+        Returns:
+            np.ndarray: Speech probability of every window completed by this call (possibly empty).
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        with self.cond:
+            if stream not in self.streams:
+                stream._pending = np.zeros(0, dtype=np.float32)
+                stream._results.clear()
+                return np.zeros(0, dtype=np.float32)
+            stream._pending = np.concatenate((stream._pending, audio))
+            # the stream may be closed by another thread while this one waits; windows taken by
+            # another caller's batch are in flight until that batch's results are stored
+            while stream in self.streams and (
+                    stream._pending.shape[0] >= self.num_samples or stream._in_flight):
+                if self.running:
+                    self.cond.wait()
+                    continue
+                self.running = True
+                try:
+                    self._run_batch(stream)
+                finally:
+                    self.running = False
+                    self.cond.notify_all()
+            probs = np.array(stream._results, dtype=np.float32)
+            stream._results.clear()
+        return probs
+
+    def _run_batch(self, stream):
+        """
+        Evaluate the next pending window of `stream` together with the next window of up to
+        `max_batch_size - 1` other streams. Called with `cond` held.
+        """
+        others = [s for s in self.streams if s is not stream and s._pending.shape[0] >= self.num_samples]
+        batch = [stream] + others[:self.max_batch_size - 1]
+        x = np.empty((len(batch), self.context_size + self.num_samples), dtype=np.float32)
+        state = np.empty((2, len(batch), 128), dtype=np.float32)
+        for i, s in enumerate(batch):
+            x[i, :self.context_size] = s._context
+            x[i, self.context_size:] = s._pending[:self.num_samples]
+            state[:, i] = s._state
+            s._pending = s._pending[self.num_samples:]
+            s._in_flight += 1
+
+        # let other connections queue audio while the model runs
+        self.cond.release()
+        try:
+            out, state = self.session.run(None, {'input': x, 'state': state, 'sr': self._sr})
+        finally:
+            self.cond.acquire()
+            for s in batch:
+                s._in_flight -= 1
+
+        for i, s in enumerate(batch):
+            s._state = state[:, i]
+            s._context = x[i, -self.context_size:]
+            s._results.append(out[i, 0])
+
+
+class BatchedVoiceActivityStream:
+    """
+    One connection's slot in a `BatchedVoiceActivityDetection` engine.
+
+    Has the same interface as `VoiceActivityStream` and produces the same probabilities.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.sr = engine.sr
+        self.num_samples = engine.num_samples
+        # windows taken by a batch that is still running, kept across `reset`
+        self._in_flight = 0
+        self.reset()
+
+    def reset(self):
+        """Reset the recurrent state, context and pending samples."""
+        with self.engine.cond:
+            self._state = np.zeros((2, 128), dtype=np.float32)
+            self._context = np.zeros(self.engine.context_size, dtype=np.float32)
+            self._pending = np.zeros(0, dtype=np.float32)
+            self._results = []
+
+    def __call__(self, audio):
+        return self.engine.process(self, audio)
+
+    def close(self):
+        """Release this stream's slot in the engine."""
+        self.engine.close_stream(self)
+
+
 class VoiceActivityDetector:
-    def __init__(self, threshold=0.5, frame_rate=16000):
+    def __init__(self, threshold=0.5, frame_rate=16000, model=None):
         """
         Initializes the VoiceActivityDetector with a voice activity detection model and a threshold.
 
         Args:
             threshold (float, optional): The probability threshold for detecting voice activity. Defaults to 0.5.
+            model (optional): A `VoiceActivityDetection` or shared `BatchedVoiceActivityDetection` to create
+                the stream from. A new `VoiceActivityDetection` is created if not given.
         """
-        self.model = VoiceActivityDetection()
+        self.model = model or VoiceActivityDetection()
         self.threshold = threshold
         self.frame_rate = frame_rate
+        self.stream = self.model.stream(frame_rate)
+        self.voice_active = False
 
     def __call__(self, audio_frame):
         """
         Determines if the given audio frame contains speech by comparing the detected speech probability against
         the threshold.
 
+        Frames are fed to a streaming VAD, so the model state carries over between consecutive frames.
+        If a frame is too short to complete a VAD window, the previous decision is returned.
+
         Args:
             audio_frame (np.ndarray): The audio frame to be analyzed for voice activity. It is expected to be a
                                       NumPy array of audio samples.
@@ -153,5 +447,18 @@ class VoiceActivityDetector:
             bool: True if the speech probability exceeds the threshold, indicating the presence of voice activity;
                   False otherwise.
         """
-        speech_probs = self.model.audio_forward(torch.from_numpy(audio_frame.copy()), self.frame_rate)[0]
-        return torch.any(speech_probs > self.threshold).item()
+        speech_probs = self.stream(audio_frame)
+        if speech_probs.shape[0]:
+            self.voice_active = bool(np.any(speech_probs > self.threshold))
+        return self.voice_active
+
+    def reset(self):
+        """Reset the streaming state, e.g. at the start of a new utterance."""
+        self.stream.reset()
+        self.voice_active = False
+
+    def close(self):
+        """Release the stream, e.g. its slot in a shared batched engine."""
+        close = getattr(self.stream, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+from yap.whisper_live.audio_buffer import AudioRingBuffer
+
+
+class TestAudioRingBuffer(unittest.TestCase):
+    def test_append_and_read(self):
+        buf = AudioRingBuffer(max_seconds=1, discard_seconds=0.5, rate=10)
+        buf.append(np.arange(4, dtype=np.float32))
+        buf.append(np.arange(4, 7, dtype=np.float32))
+        self.assertEqual(len(buf), 7)
+        np.testing.assert_array_equal(buf.read(), np.arange(7))
+        np.testing.assert_array_equal(buf.read(5), [5, 6])
+
+    def test_discards_oldest_block_when_full(self):
+        buf = AudioRingBuffer(max_seconds=1, discard_seconds=0.5, rate=10)
+        buf.append(np.arange(8, dtype=np.float32))
+        dropped = buf.append(np.arange(8, 12, dtype=np.float32))
+        self.assertEqual(dropped, 5)
+        self.assertEqual(buf.start_index, 5)
+        self.assertEqual(buf.end_index, 12)
+        # Read wraps around the end of the underlying storage
+        np.testing.assert_array_equal(buf.read(), np.arange(5, 12))
+        # Indices older than the retained window are clamped
+        np.testing.assert_array_equal(buf.read(0), np.arange(5, 12))
+        self.assertEqual(buf.samples_since(10), 2)
+
+    def test_frame_larger_than_capacity(self):
+        buf = AudioRingBuffer(max_seconds=1, discard_seconds=0.5, rate=10)
+        buf.append(np.arange(3, dtype=np.float32))
+        buf.append(np.arange(3, 28, dtype=np.float32))
+        self.assertEqual(buf.end_index, 28)
+        self.assertEqual(buf.start_index, 18)
+        np.testing.assert_array_equal(buf.read(), np.arange(18, 28))
+
+    def test_no_reallocation(self):
+        buf = AudioRingBuffer(max_seconds=1, discard_seconds=0.5, rate=10)
+        storage = buf._data
+        for i in range(20):
+            buf.append(np.full(3, i, dtype=np.float32))
+        self.assertIs(buf._data, storage)
+        self.assertLessEqual(len(buf), buf.capacity)
+
+
+    def test_rejects_invalid_discard_block(self):
+        for discard_seconds in (0, 0.01, 2):
+            with self.assertRaises(ValueError):
+                AudioRingBuffer(max_seconds=1, discard_seconds=discard_seconds, rate=10)
+        self.assertEqual(AudioRingBuffer(max_seconds=1, discard_seconds=1, rate=10).discard_samples, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
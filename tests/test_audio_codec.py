@@ -0,0 +1,95 @@
+import unittest
+import numpy as np
+from scipy.signal import upfirdn
+from yap.whisper_live.audio_codec import AudioFrameDecoder, OpusEncoder, StreamingResampler
+
+
+class TestAudioFrameDecoder(unittest.TestCase):
+    def setUp(self):
+        t = np.arange(16000) / 16000
+        self.audio = (0.3 * np.sin(2 * np.pi * 300 * t)).astype(np.float32)
+        self.audio_int16 = (self.audio * 32767).astype(np.int16)
+
+    def test_pcm_f32(self):
+        decoded = AudioFrameDecoder("pcm_f32").decode(self.audio.tobytes())
+        np.testing.assert_array_equal(decoded, self.audio)
+
+    def test_pcm_s16(self):
+        decoded = AudioFrameDecoder("pcm_s16").decode(self.audio_int16.tobytes())
+        self.assertEqual(decoded.dtype, np.float32)
+        np.testing.assert_allclose(decoded, self.audio, atol=1e-4)
+
+    def test_split_frames_are_reassembled(self):
+        t = np.arange(1600) / 16000
+        left = (0.3 * np.sin(2 * np.pi * 300 * t) * 32767).astype(np.int16)
+        stereo = np.stack((left, left), axis=1).reshape(-1).tobytes()
+        decoder = AudioFrameDecoder("pcm_s16", channels=2)
+        # cut in the middle of a sample and in the middle of a stereo frame
+        decoded = [decoder.decode(stereo[i:j]) for i, j in ((0, 1001), (1001, 1003), (1003, len(stereo)))]
+        self.assertEqual([d.shape[0] for d in decoded], [250, 0, 1350])
+        np.testing.assert_allclose(np.concatenate(decoded), left / 32768.0, atol=1e-6)
+
+        decoder = AudioFrameDecoder("pcm_f32")
+        data = self.audio.tobytes()
+        decoded = np.concatenate([decoder.decode(data[i:i + 1001]) for i in range(0, len(data), 1001)])
+        np.testing.assert_array_equal(decoded, self.audio)
+
+    def test_opus_round_trip(self):
+        encoder = OpusEncoder()
+        decoder = AudioFrameDecoder("opus")
+        packets = []
+        for start in range(0, 16000, 1000):
+            packets += encoder.encode(self.audio_int16[start:start + 1000])
+        self.assertEqual(len(packets), 50)
+        self.assertLess(sum(len(p) for p in packets), self.audio_int16.nbytes / 4)
+
+        decoded = np.concatenate([decoder.decode(p) for p in packets])
+        self.assertEqual(decoded.dtype, np.float32)
+        # roughly the same level once the codec has settled
+        rms = np.sqrt(np.mean(decoded[4000:] ** 2))
+        self.assertAlmostEqual(rms, 0.3 / np.sqrt(2), delta=0.02)
+
+    def test_unknown_encoding(self):
+        with self.assertRaises(ValueError):
+            AudioFrameDecoder("mp3")
+        with self.assertRaises(ValueError):
+            AudioFrameDecoder("pcm_s16", channels=6)
+
+    def test_stereo_48k_is_downmixed_and_resampled(self):
+        t = np.arange(48000) / 48000
+        left = (0.3 * np.sin(2 * np.pi * 300 * t) * 32767).astype(np.int16)
+        stereo = np.stack((left, left), axis=1).reshape(-1)
+        decoder = AudioFrameDecoder("pcm_s16", sample_rate=48000, channels=2)
+        decoded = np.concatenate([
+            decoder.decode(stereo[i:i + 4096].tobytes()) for i in range(0, stereo.shape[0], 4096)
+        ])
+        self.assertEqual(decoded.shape[0], 16000)
+        # the causal filter delays the output by half its length, 30 samples at 48 kHz
+        delay = 10
+        np.testing.assert_allclose(decoded[100:], self.audio[100 - delay:16000 - delay], atol=2e-3)
+
+
+class TestStreamingResampler(unittest.TestCase):
+    def test_blockwise_matches_one_shot(self):
+        x = np.random.default_rng(0).standard_normal(44100).astype(np.float32)
+        resampler = StreamingResampler(44100, 16000)
+        parts, i = [], 0
+        for n in [1, 100, 999, 4096, 333, 20000, 18571]:
+            parts.append(resampler(x[i:i + n]))
+            i += n
+        out = np.concatenate(parts)
+        self.assertEqual(out.shape[0], 16000)
+
+        h = resampler.phases.T.reshape(-1).astype(np.float64)
+        expected = upfirdn(h, x.astype(np.float64), resampler.up, resampler.down)[:out.shape[0]]
+        np.testing.assert_allclose(out, expected, atol=1e-5)
+
+    def test_removes_aliases(self):
+        t = np.arange(48000) / 48000
+        out = StreamingResampler(48000, 16000)(np.sin(2 * np.pi * 12000 * t))
+        # 12 kHz would alias to 4 kHz without the anti-aliasing filter
+        self.assertLess(np.sqrt(np.mean(out[1000:] ** 2)), 1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import numpy as np
+from yap.whisper_live.backend import batch_scheduler
+from yap.whisper_live.backend.batch_scheduler import BatchedInferenceScheduler
+
+
+RATE = 16000
+
+
+class FakePipeline:
+    """Stand-in for `BatchedInferencePipeline` echoing each chunk's duration as its text."""
+
+    def __init__(self, model):
+        self.batch_sizes = []
+        self.fail = False
+
+    def forward(self, features, tokenizer, chunks_metadata, options):
+        self.batch_sizes.append(len(chunks_metadata))
+        if self.fail:
+            raise RuntimeError("decoder failed")
+        return [
+            [{
+                "seek": 0, "start": 0.0, "end": chunk["duration"], "text": f"{chunk['duration']:.2f}",
+                "tokens": [], "avg_logprob": 0.0, "compression_ratio": 1.0, "no_speech_prob": 0.0,
+            }]
+            for chunk in chunks_metadata
+        ]
+
+
+def fake_model():
+    feature_extractor = lambda audio: np.zeros((2, 11), dtype=np.float32)
+    feature_extractor.sampling_rate = RATE
+    feature_extractor.n_samples = 30 * RATE
+    return SimpleNamespace(
+        feature_extractor=feature_extractor,
+        hf_tokenizer=None,
+        model=SimpleNamespace(is_multilingual=True),
+    )
+
+
+class TestBatchedInferenceScheduler(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            patch.object(batch_scheduler, "BatchedInferencePipeline", FakePipeline),
+            patch.object(batch_scheduler, "Tokenizer", lambda *args, **kwargs: None),
+            patch.object(batch_scheduler, "get_suppressed_tokens", lambda *args: []),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def make_scheduler(self, **kwargs):
+        scheduler = BatchedInferenceScheduler(fake_model(), **kwargs)
+        self.addCleanup(scheduler.stop)
+        return scheduler
+
+    def submit_concurrently(self, scheduler, durations):
+        results = [None] * len(durations)
+
+        def submit(i, duration):
+            try:
+                results[i] = scheduler.transcribe(np.zeros(int(duration * RATE), dtype=np.float32), language="en")
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=submit, args=(i, d)) for i, d in enumerate(durations)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+            self.assertFalse(thread.is_alive())
+        return results
+
+    def test_concurrent_chunks_are_batched_up_to_max_batch_size(self):
+        scheduler = self.make_scheduler(max_batch_size=4, max_wait_ms=500)
+        self.submit_concurrently(scheduler, [1.0, 1.5, 2.0, 2.5, 3.0])
+        self.assertEqual(scheduler.pipeline.batch_sizes, [4, 1])
+
+    def test_results_are_returned_to_their_caller(self):
+        scheduler = self.make_scheduler(max_batch_size=4, max_wait_ms=200)
+        durations = [1.0, 1.5, 2.0, 2.5]
+        results = self.submit_concurrently(scheduler, durations)
+        for duration, (segments, info) in zip(durations, results):
+            self.assertIsNone(info)
+            self.assertEqual([s.text for s in segments], [f"{duration:.2f}"])
+            self.assertEqual(segments[0].end, duration)
+
+    def test_decoder_error_reaches_every_waiter_and_worker_survives(self):
+        scheduler = self.make_scheduler(max_batch_size=4, max_wait_ms=200)
+        scheduler.pipeline.fail = True
+        results = self.submit_concurrently(scheduler, [1.0, 2.0])
+        for result in results:
+            self.assertIsInstance(result, RuntimeError)
+
+        scheduler.pipeline.fail = False
+        segments, _ = scheduler.transcribe(np.zeros(RATE, dtype=np.float32), language="en")
+        self.assertEqual(segments[0].text, "1.00")
+        self.assertTrue(scheduler.worker.is_alive())
+
+
+    def test_stop_ends_worker(self):
+        scheduler = BatchedInferenceScheduler(fake_model(), max_batch_size=4, max_wait_ms=10)
+        scheduler.stop()
+        scheduler.worker.join(timeout=2)
+        self.assertFalse(scheduler.worker.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import threading
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from yap.whisper_live.backend.faster_whisper_backend import ServeClientFasterWhisper
+
+
+class FakeTranscriber:
+    """Records the VAD arguments of each `transcribe` call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, vad_filter=False, vad_parameters=None, **kwargs):
+        self.calls.append((vad_filter, vad_parameters))
+        return iter([]), SimpleNamespace(language="en", language_probability=1.0)
+
+
+def make_client(use_vad, vad_stream):
+    client = ServeClientFasterWhisper.__new__(ServeClientFasterWhisper)
+    client.transcriber = FakeTranscriber()
+    client.batch_scheduler = None
+    client.model_slot = threading.BoundedSemaphore(1)
+    client.language = "en"
+    client.task = "transcribe"
+    client.initial_prompt = None
+    client.use_vad = use_vad
+    client.vad_parameters = {"threshold": 0.5}
+    client.vad_stream = vad_stream
+    return client
+
+
+class TestTranscribeAudio(unittest.TestCase):
+    def test_silero_filter_trims_windows_passed_by_gate(self):
+        client = make_client(use_vad=True, vad_stream=object())
+        client.transcribe_audio(np.zeros(16000, dtype=np.float32))
+        self.assertEqual(client.transcriber.calls, [(True, {"threshold": 0.5})])
+
+    def test_silero_filter_is_off_without_vad(self):
+        client = make_client(use_vad=False, vad_stream=None)
+        client.transcribe_audio(np.zeros(16000, dtype=np.float32))
+        self.assertEqual(client.transcriber.calls, [(False, None)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import io
+import os
+import wave
+import shutil
+import tempfile
+import unittest
+import contextlib
+from types import SimpleNamespace
+from yap.whisper_live.jobs import TranscriptionJobStore, TranscriptionJobRunner
+
+
+def silent_wav(seconds=0.5, rate=16000):
+    data = io.BytesIO()
+    with wave.open(data, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"\x00\x00" * int(seconds * rate))
+    data.seek(0)
+    return data
+
+
+class SlotCheckingModel:
+    """Fake `WhisperModel` whose lazy segments record whether the decode slot was held."""
+
+    def __init__(self):
+        self.in_slot = False
+        self.decoded_in_slot = []
+
+    def transcribe(self, audio, **kwargs):
+        def segments():
+            self.decoded_in_slot.append(self.in_slot)
+            yield SimpleNamespace(id=0, start=0.0, end=0.5, text=" hello ")
+        return segments(), SimpleNamespace(language="en", duration=0.5)
+
+    @contextlib.contextmanager
+    def use(self):
+        self.in_slot = True
+        try:
+            yield self
+        finally:
+            self.in_slot = False
+
+
+class TestTranscriptionJobStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_job_lifecycle(self):
+        store = TranscriptionJobStore(self.directory)
+        job = store.submit(io.BytesIO(b"audio"), filename="a.wav", language="en")
+        self.assertEqual(job["status"], TranscriptionJobStore.QUEUED)
+
+        claimed = store.claim_next()
+        self.assertEqual(claimed["id"], job["id"])
+        self.assertTrue(os.path.exists(claimed["audio_path"]))
+        self.assertIsNone(store.claim_next())
+
+        store.complete(job["id"], {"text": "hello", "segments": []})
+        finished = store.get(job["id"], include_result=True)
+        self.assertEqual(finished["status"], TranscriptionJobStore.COMPLETED)
+        self.assertEqual(finished["result"]["text"], "hello")
+        self.assertFalse(os.path.exists(claimed["audio_path"]))
+        store.close()
+
+    def test_running_jobs_are_requeued_on_restart(self):
+        store = TranscriptionJobStore(self.directory)
+        job = store.submit(io.BytesIO(b"audio"), filename="a.wav")
+        store.claim_next()
+        store.close()
+
+        store = TranscriptionJobStore(self.directory)
+        self.assertEqual(store.get(job["id"])["status"], TranscriptionJobStore.QUEUED)
+        self.assertEqual([j["id"] for j in store.list(status="queued")], [job["id"]])
+        store.close()
+
+
+class TestTranscriptionJobRunner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = TranscriptionJobStore(self.directory)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_segments_are_decoded_inside_model_context(self):
+        model = SlotCheckingModel()
+        runner = TranscriptionJobRunner(self.store, model.use, num_workers=0)
+        job = self.store.submit(silent_wav(), filename="a.wav")
+        runner.run_job(self.store.claim_next())
+
+        self.assertEqual(model.decoded_in_slot, [True])
+        finished = self.store.get(job["id"], include_result=True)
+        self.assertEqual(finished["status"], TranscriptionJobStore.COMPLETED)
+        self.assertEqual(finished["result"]["text"], "hello")
+
+
+if __name__ == "__main__":
+    unittest.main()
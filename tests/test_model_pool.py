@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from yap.whisper_live.backend.model_pool import WhisperModelPool
+from yap.whisper_live.backend.faster_whisper_backend import ServeClientFasterWhisper
+
+
+class TestWhisperModelPool(unittest.TestCase):
+    @patch('yap.whisper_live.backend.model_pool.WhisperModel')
+    def test_reuses_loaded_model(self, MockWhisperModel):
+        pool = WhisperModelPool(max_models=2)
+        first = pool.get("small", "cpu", "int8")
+        second = pool.get("small", "cpu", "int8")
+        self.assertIs(first, second)
+        MockWhisperModel.assert_called_once_with("small", device="cpu", compute_type="int8")
+
+    @patch('yap.whisper_live.backend.model_pool.WhisperModel')
+    def test_evicts_least_recently_used(self, MockWhisperModel):
+        MockWhisperModel.side_effect = lambda *args, **kwargs: object()
+        pool = WhisperModelPool(max_models=2)
+        pool.get("tiny", "cpu", "int8")
+        pool.get("base", "cpu", "int8")
+        pool.get("tiny", "cpu", "int8")
+        pool.get("small", "cpu", "int8")
+        self.assertIsNotNone(pool.find("tiny"))
+        self.assertIsNone(pool.find("base"))
+        self.assertEqual(len(pool), 2)
+
+    @patch('yap.whisper_live.backend.model_pool.WhisperModel')
+    def test_pinned_model_is_never_evicted(self, MockWhisperModel):
+        MockWhisperModel.side_effect = lambda *args, **kwargs: object()
+        preloaded = object()
+        pool = WhisperModelPool(max_models=1)
+        pool.add("small", "cpu", "int8", preloaded, pinned=True)
+        pool.get("tiny", "cpu", "int8")
+        pool.get("base", "cpu", "int8")
+        self.assertIs(pool.get("small", "cpu", "int8"), preloaded)
+        self.assertEqual(pool.find("small"), ("cpu", "int8"))
+        self.assertIsNone(pool.find("tiny"))
+
+    @patch('yap.whisper_live.backend.model_pool.WhisperModel')
+    def test_acquired_model_is_not_evicted_until_released(self, MockWhisperModel):
+        MockWhisperModel.side_effect = lambda *args, **kwargs: object()
+        pool = WhisperModelPool(max_models=1)
+        acquired = pool.acquire("tiny.en", "cpu", "int8")
+        pool.get("base", "cpu", "int8")
+        self.assertIs(pool.acquire("tiny.en", "cpu", "int8"), acquired)
+        self.assertIsNone(pool.find("base"))
+
+        pool.release("tiny.en", "cpu", "int8")
+        pool.get("base", "cpu", "int8")
+        self.assertIsNotNone(pool.find("tiny.en"))
+        pool.release("tiny.en", "cpu", "int8")
+        pool.get("small", "cpu", "int8")
+        self.assertIsNone(pool.find("tiny.en"))
+
+    @patch('yap.whisper_live.backend.model_pool.WhisperModel')
+    def test_memory_budget_evicts_before_loading(self, MockWhisperModel):
+        MockWhisperModel.side_effect = lambda *args, **kwargs: object()
+        # small (244 MB) and base (74 MB) fit, medium (769 MB) only fits alone
+        pool = WhisperModelPool(max_models=4, max_memory_mb=800)
+        pool.get("small", "cpu", "int8")
+        pool.get("base", "cpu", "int8")
+        self.assertEqual(len(pool), 2)
+        pool.get("medium", "cpu", "int8")
+        self.assertEqual(pool.find("medium"), ("cpu", "int8"))
+        self.assertEqual(len(pool), 1)
+
+    def test_loader_is_used_on_miss(self):
+        instance = object()
+        pool = WhisperModelPool()
+        self.assertIs(pool.get("org/custom-model", "cpu", "int8", loader=lambda: instance), instance)
+        self.assertEqual(WhisperModelPool.estimate_memory_mb("large-v3", "float16"), 3100)
+
+    @patch('yap.whisper_live.backend.model_pool.WhisperModel')
+    def test_model_options_are_passed_to_loaded_models(self, MockWhisperModel):
+        options = {"cpu_threads": 8, "num_workers": 4, "device_index": [0, 1]}
+        pool = WhisperModelPool(model_options=options)
+        pool.get("small", "cuda", "float16")
+        pool.get("small", "cpu", "int8")
+        MockWhisperModel.assert_any_call(
+            "small", device="cuda", compute_type="float16", cpu_threads=8, num_workers=4, device_index=[0, 1])
+        MockWhisperModel.assert_any_call("small", device="cpu", compute_type="int8", cpu_threads=8, num_workers=4)
+
+    def test_slot_limits_concurrent_decodes_per_model(self):
+        pool = WhisperModelPool(max_concurrency=2)
+        slot = pool.slot("small", "cpu", "int8")
+        self.assertIs(pool.slot("small", "cpu", "int8"), slot)
+        self.assertIsNot(pool.slot("tiny", "cpu", "int8"), slot)
+        self.assertTrue(slot.acquire(blocking=False))
+        self.assertTrue(slot.acquire(blocking=False))
+        self.assertFalse(slot.acquire(blocking=False))
+        slot.release()
+        slot.release()
+
+    def test_failed_decode_releases_model_slot(self):
+        pool = WhisperModelPool()
+        client = ServeClientFasterWhisper.__new__(ServeClientFasterWhisper)
+        client.batch_scheduler = None
+        client.model_slot = pool.slot("small", "cpu", "int8")
+        client.transcriber = MagicMock()
+        client.transcriber.transcribe.side_effect = RuntimeError("decode failed")
+        client.initial_prompt, client.language, client.task = None, "en", "transcribe"
+        client.use_vad, client.vad_parameters = False, None
+
+        with self.assertRaises(RuntimeError):
+            client.transcribe_audio(None)
+        self.assertTrue(client.model_slot.acquire(blocking=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,230 @@
+import io
+import sys
+import json
+import time
+import wave
+import shutil
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from yap.whisper_live.jobs import TranscriptionJobStore
+from yap.whisper_live.backend.model_pool import WhisperModelPool
+from yap.whisper_live.backend.faster_whisper_backend import ServeClientFasterWhisper
+from yap.whisper_live.server import TranscriptionServer, BoundedExecutor
+
+
+def silent_wav(seconds=0.5, rate=16000):
+    data = io.BytesIO()
+    with wave.open(data, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"\x00\x00" * int(seconds * rate))
+    return data.getvalue()
+
+
+class FakeModel:
+    """Fake `WhisperModel` returning `texts` as lazily decoded segments."""
+
+    def __init__(self, texts=("hello", "world")):
+        self.texts = texts
+        self.error = None
+
+    def transcribe(self, audio, **kwargs):
+        def segments():
+            for i, text in enumerate(self.texts):
+                if self.error is not None and i == 1:
+                    raise self.error
+                yield SimpleNamespace(id=i, start=float(i), end=float(i + 1), text=f" {text} ")
+        return segments(), SimpleNamespace(language="en", duration=0.5)
+
+
+class FakeModelPool:
+    """Serves one `FakeModel` for every configuration."""
+
+    def __init__(self, model):
+        self.model = model
+        self.decode_slot = threading.BoundedSemaphore(1)
+        self.acquired = []
+
+    def find(self, model):
+        return "cpu", "int8"
+
+    def acquire(self, model, device, compute_type, loader=None):
+        self.acquired.append(model)
+        return self.model
+
+    def release(self, model, device, compute_type):
+        pass
+
+    def slot(self, model, device, compute_type):
+        return self.decode_slot
+
+
+class RestApiTestCase(unittest.TestCase):
+    def setUp(self):
+        self.model = FakeModel()
+        self.server = TranscriptionServer()
+        self.server.model_pool = FakeModelPool(self.model)
+        self.server.rest_executor = BoundedExecutor(max_workers=1, max_queue=0, retry_after=7)
+        self.addCleanup(self.server.rest_executor.executor.shutdown)
+        self.client = TestClient(self.server.create_rest_app(job_workers=0))
+
+    def post_audio(self, **data):
+        return self.client.post(
+            "/v1/audio/transcriptions",
+            files={"file": ("a.wav", silent_wav(), "audio/wav")},
+            data=data,
+        )
+
+
+class TestPooledModel(unittest.TestCase):
+    def test_model_in_use_is_not_evicted(self):
+        pool = WhisperModelPool(max_models=1)
+        model = FakeModel()
+        pool.add("small", "cpu", "int8", model)
+        server = TranscriptionServer()
+        server.model_pool = pool
+
+        with server.use_pooled_model("small") as pooled:
+            self.assertIs(pooled, model)
+            slot = pool.slot("small", "cpu", "int8")
+            # another client loading a model must not evict the one being decoded with
+            pool.acquire("tiny", "cpu", "int8", loader=FakeModel)
+            self.assertIn(("small", "cpu", "int8"), pool.models)
+            self.assertIs(pool.slot("small", "cpu", "int8"), slot)
+
+        pool.release("tiny", "cpu", "int8")
+        self.assertNotIn(("small", "cpu", "int8"), pool.refs)
+        self.assertNotIn(("small", "cpu", "int8"), pool.models)
+
+
+class TestTranscriptions(RestApiTestCase):
+    def test_transcription(self):
+        response = self.post_audio()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"text": "hello world"})
+        self.assertEqual(self.server.rest_executor.in_flight, 0)
+
+    def test_preloaded_model_is_used(self):
+        self.assertEqual(self.post_audio().status_code, 200)
+        with patch.object(ServeClientFasterWhisper, "SINGLE_MODEL_CONFIG", ("distil-large-v3", "cpu", "int8")):
+            self.assertEqual(self.post_audio().status_code, 200)
+        self.assertEqual(self.server.model_pool.acquired, ["small", "distil-large-v3"])
+
+    def test_overload_is_rejected_with_retry_after(self):
+        self.assertTrue(self.server.rest_executor.try_acquire())
+        response = self.post_audio()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "7")
+        self.assertIn("error", response.json())
+
+        self.server.rest_executor.release()
+        self.assertEqual(self.post_audio().status_code, 200)
+
+
+    def test_status_reports_translation_cache_stats(self):
+        self.assertEqual(self.client.get("/v1/status").json(), {"clients": 0, "translation_cache": []})
+
+        stats = [{"model": "alirezamsh/small100", "engine": "ctranslate2",
+                  "entries": 3, "hits": 5, "misses": 3, "hit_rate": 0.625}]
+        translation_backend = SimpleNamespace(
+            ServeClientTranslation=SimpleNamespace(translation_cache_stats=lambda: stats))
+        # the real backend needs transformers; only its registry is read here
+        with patch.dict(sys.modules, {"yap.whisper_live.backend.translation_backend": translation_backend}):
+            self.assertEqual(self.client.get("/v1/status").json()["translation_cache"], stats)
+
+
+class TestStreamingTranscriptions(RestApiTestCase):
+    def stream_events(self):
+        response = self.post_audio(stream="true")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        return [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line]
+
+    def wait_for_release(self):
+        # the executor slot is released from the worker's done callback
+        for _ in range(100):
+            if self.server.rest_executor.in_flight == 0:
+                return
+            time.sleep(0.01)
+        self.fail("rest executor slot was not released")
+
+    def test_deltas_are_streamed_in_order_then_done(self):
+        self.model.texts = ("hello", "", "big", "world")
+        events = self.stream_events()
+        self.assertEqual(events, [
+            {"type": "transcript.text.delta", "delta": "hello"},
+            {"type": "transcript.text.delta", "delta": " big"},
+            {"type": "transcript.text.delta", "delta": " world"},
+            {"type": "transcript.text.done", "text": "hello big world"},
+        ])
+        self.wait_for_release()
+
+    def test_decode_error_ends_stream_with_error_event(self):
+        self.model.error = RuntimeError("decoder failed")
+        events = self.stream_events()
+        self.assertEqual(events, [
+            {"type": "transcript.text.delta", "delta": "hello"},
+            {"type": "error", "error": "decoder failed"},
+        ])
+        self.wait_for_release()
+
+
+class TestJobs(RestApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_path, ignore_errors=True)
+        self.client = TestClient(self.server.create_rest_app(cache_path=self.cache_path, job_workers=1))
+        # cleanups run last to first: stop the workers, wait for them, then close the store
+        self.addCleanup(self.server.job_store.close)
+        for worker in self.server.job_runner.workers:
+            self.addCleanup(worker.join, 5)
+        self.addCleanup(self.server.job_runner.stop)
+
+    def submit(self, audio):
+        response = self.client.post("/v1/jobs", files=[("files", ("a.wav", audio, "audio/wav"))])
+        self.assertEqual(response.status_code, 200)
+        job, = response.json()["jobs"]
+        self.assertEqual(job["status"], TranscriptionJobStore.QUEUED)
+        return job["id"]
+
+    def poll(self, job_id):
+        for _ in range(500):
+            job = self.client.get(f"/v1/jobs/{job_id}").json()
+            if job["status"] in (TranscriptionJobStore.COMPLETED, TranscriptionJobStore.FAILED):
+                return job
+            time.sleep(0.01)
+        self.fail(f"job {job_id} did not finish")
+
+    def test_job_completes_and_serves_result(self):
+        job_id = self.submit(silent_wav())
+        self.assertEqual(self.poll(job_id)["status"], TranscriptionJobStore.COMPLETED)
+
+        response = self.client.get(f"/v1/jobs/{job_id}/result")
+        self.assertEqual(response.json(), {"text": "hello world"})
+        response = self.client.get(f"/v1/jobs/{job_id}/result", params={"response_format": "srt"})
+        self.assertIn("00:00:01,000 --> 00:00:02,000", response.text)
+        self.assertEqual([j["id"] for j in self.client.get("/v1/jobs").json()["jobs"]], [job_id])
+
+    def test_failed_job_reports_error(self):
+        job_id = self.submit(b"not audio")
+        job = self.poll(job_id)
+        self.assertEqual(job["status"], TranscriptionJobStore.FAILED)
+        self.assertTrue(job["error"])
+
+        response = self.client.get(f"/v1/jobs/{job_id}/result")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["status"], TranscriptionJobStore.FAILED)
+
+    def test_unknown_job(self):
+        self.assertEqual(self.client.get("/v1/jobs/missing").status_code, 404)
+        self.assertEqual(self.client.get("/v1/jobs/missing/result").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import os
+import json
+import tempfile
+import unittest
+import threading
+from types import SimpleNamespace
+import numpy as np
+from yap.whisper_live.backend.base import ServeClientBase
+
+
+class RecordingServeClient(ServeClientBase):
+    """Minimal backend that records the chunk durations it was asked to transcribe."""
+
+    def __init__(self, **kwargs):
+        super().__init__("uid", None, **kwargs)
+        self.language = "en"
+        self.durations = []
+        self.transcribed = threading.Event()
+
+    def transcribe_audio(self, input_sample):
+        self.durations.append(input_sample.shape[0] / self.RATE)
+        self.transcribed.set()
+        return None
+
+
+class LoudnessVadStream:
+    """Stand-in VAD stream scoring each 512-sample window by its amplitude."""
+
+    num_samples = 512
+
+    def __init__(self):
+        self.pending = np.zeros(0, dtype=np.float32)
+
+    def __call__(self, audio):
+        audio = np.concatenate((self.pending, audio))
+        n = audio.shape[0] // self.num_samples
+        self.pending = audio[n * self.num_samples:]
+        windows = audio[:n * self.num_samples].reshape(n, self.num_samples)
+        return np.abs(windows).max(axis=1)
+
+    def reset(self):
+        self.pending = np.zeros(0, dtype=np.float32)
+
+    def close(self):
+        pass
+
+
+class TestServeClientBase(unittest.TestCase):
+    def test_add_frames_trims_and_advances_offset(self):
+        client = RecordingServeClient()
+        for _ in range(50):
+            client.add_frames(np.zeros(client.RATE, dtype=np.float32))
+        self.assertEqual(client.audio_buffer.start_time, 30.0)
+        self.assertEqual(client.timestamp_offset, 30.0)
+        _, duration = client.get_audio_chunk_for_processing()
+        self.assertEqual(duration, 20.0)
+
+    def test_clients_without_audio_skip_audio_buffer(self):
+        class SegmentOnlyClient(RecordingServeClient):
+            receives_audio = False
+
+        self.assertIsNone(SegmentOnlyClient().audio_buffer)
+        self.assertIsNotNone(RecordingServeClient().audio_buffer)
+
+    def test_loop_wakes_on_audio_and_exits_on_cleanup(self):
+        client = RecordingServeClient()
+        thread = threading.Thread(target=client.speech_to_text)
+        thread.start()
+        try:
+            self.assertFalse(client.transcribed.wait(0.2))
+            client.add_frames(np.zeros(2 * client.RATE, dtype=np.float32))
+            self.assertTrue(client.transcribed.wait(2.0))
+            self.assertEqual(client.durations, [2.0])
+        finally:
+            client.cleanup()
+            thread.join(timeout=2.0)
+        self.assertFalse(thread.is_alive())
+
+    def test_vad_gate_skips_silence_and_advances_offset(self):
+        client = RecordingServeClient()
+        client.vad_stream = LoudnessVadStream()
+        client.add_frames(np.zeros(3 * client.RATE, dtype=np.float32))
+        client.process_audio_chunk()
+        self.assertEqual(client.durations, [])
+        self.assertAlmostEqual(client.timestamp_offset, (3 * client.RATE // 512 * 512) / client.RATE - 0.5)
+        self.assertFalse(client.has_new_audio())
+
+        client.add_frames(np.ones(client.RATE, dtype=np.float32))
+        client.process_audio_chunk()
+        self.assertEqual(len(client.durations), 1)
+        # the pass keeps the padding before the onset of speech
+        self.assertGreater(client.durations[0], 1.5)
+
+    def test_pass_after_cleanup_does_not_block_vad_engine(self):
+        closed = RecordingServeClient(use_vad_gate=True)
+        other = RecordingServeClient(use_vad_gate=True)
+        closed.add_frames(np.zeros(2 * closed.RATE, dtype=np.float32))
+        other.add_frames(np.zeros(2 * other.RATE, dtype=np.float32))
+        closed.cleanup()
+
+        thread = threading.Thread(target=lambda: (closed.process_audio_chunk(), other.process_audio_chunk()))
+        thread.daemon = True
+        thread.start()
+        thread.join(timeout=5.0)
+        other.cleanup()
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(closed.durations, [])
+        self.assertGreater(other.evaluated_index, 0)
+
+    def test_delta_segments_send_only_new_segments(self):
+        client = RecordingServeClient()
+        client.delta_segments = True
+
+        def seg(text, start, end):
+            return SimpleNamespace(text=text, start=start, end=end, no_speech_prob=0.0)
+
+        sent = client.prepare_segments(client.update_segments([seg("one", 0, 1), seg("tw", 1, 2)], 2.0))
+        self.assertEqual([(s["id"], s["text"], s["completed"]) for s in sent], [(0, "one", True), (1, "tw", False)])
+
+        sent = client.prepare_segments(client.update_segments([seg("two", 0, 1), seg("thr", 1, 2)], 2.0))
+        # the partial "tw" completes with the id it was sent with
+        self.assertEqual([(s["id"], s["text"], s["completed"]) for s in sent], [(1, "two", True), (2, "thr", False)])
+
+        sent = client.prepare_segments(client.update_segments([seg("three", 0, 2)], 2.0))
+        self.assertEqual([(s["id"], s["text"], s["completed"]) for s in sent], [(2, "three", False)])
+        self.assertEqual(len(client.transcript), 2)
+
+    def test_transcript_is_bounded_and_spilled_to_log(self):
+        client = RecordingServeClient()
+        client.MAX_TRANSCRIPT_SEGMENTS = 3
+        with tempfile.TemporaryDirectory() as directory:
+            client.enable_transcript_log(directory)
+            for i in range(5):
+                client.add_completed_segment({"start": f"{i:.3f}", "end": f"{i + 1:.3f}", "text": str(i)})
+            client.cleanup()
+
+            self.assertEqual([s["id"] for s in client.transcript], [2, 3, 4])
+            with open(os.path.join(directory, "uid.jsonl")) as f:
+                logged = [json.loads(line) for line in f]
+        self.assertEqual([s["text"] for s in logged], ["0", "1", "2", "3", "4"])
+        self.assertEqual(ServeClientBase.transcript_log_path("/tmp", "../a b"), "/tmp/_a_b.jsonl")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import json
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+import numpy as np
+from yap.whisper_live.backend.base import ServeClientBase
+from yap.whisper_live.server import TranscriptionServer, ClientManager, BackendType, AsyncWebSocketAdapter
+
+
+class FakeFasterWhisperClient(ServeClientBase):
+    """Stands in for `ServeClientFasterWhisper`, recording the passes the server drives."""
+
+    instances = []
+
+    def __init__(self, websocket, client_uid=None, start_thread=True, use_vad=None, **kwargs):
+        super().__init__(client_uid, websocket)
+        self.language = "en"
+        self.start_thread = start_thread
+        self.use_vad = use_vad
+        self.durations = []
+        self.frame_threads = []
+        FakeFasterWhisperClient.instances.append(self)
+
+    def add_frames(self, frame_np):
+        self.frame_threads.append(threading.current_thread())
+        super().add_frames(frame_np)
+
+    def transcribe_audio(self, input_sample):
+        self.durations.append(input_sample.shape[0] / self.RATE)
+        return None
+
+
+class FakeWebSocket:
+    """Asyncio websocket delivering a handshake followed by `frames`."""
+
+    def __init__(self, handshake, frames):
+        self.handshake = handshake
+        self.frames = frames
+        self.sent = []
+        self.closed = False
+
+    async def recv(self):
+        return json.dumps(self.handshake)
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    async def close(self):
+        self.closed = True
+
+    async def __aiter__(self):
+        for frame in self.frames:
+            yield frame
+        # give the executor time to run the scheduled pass before the stream ends
+        for _ in range(200):
+            if FakeFasterWhisperClient.instances and FakeFasterWhisperClient.instances[-1].durations:
+                break
+            await asyncio.sleep(0.01)
+        yield b"END_OF_AUDIO"
+
+
+class TestRecvAudioAsync(unittest.TestCase):
+    def setUp(self):
+        FakeFasterWhisperClient.instances = []
+        self.server = TranscriptionServer()
+        self.server.client_manager = ClientManager()
+
+    def run_connection(self, websocket):
+        async def main():
+            self.server.loop = asyncio.get_running_loop()
+            self.server.inference_executor = ThreadPoolExecutor(max_workers=2)
+            try:
+                await self.server.recv_audio_async(websocket, backend=BackendType.FASTER_WHISPER)
+            finally:
+                self.server.inference_executor.shutdown(wait=True)
+
+        with patch("yap.whisper_live.backend.faster_whisper_backend.ServeClientFasterWhisper",
+                   FakeFasterWhisperClient):
+            asyncio.run(asyncio.wait_for(main(), timeout=10))
+
+    def test_passes_run_on_executor_and_client_is_cleaned_up(self):
+        frame = np.zeros(ServeClientBase.RATE // 2, dtype=np.float32).tobytes()
+        handshake = {"uid": "a", "language": "en", "task": "transcribe", "model": "small", "use_vad": False}
+        websocket = FakeWebSocket(handshake, [frame] * 4)
+        self.run_connection(websocket)
+
+        client, = FakeFasterWhisperClient.instances
+        self.assertFalse(client.start_thread)
+        self.assertFalse(client.use_vad)
+        self.assertTrue(client.durations)
+        self.assertGreaterEqual(client.durations[0], 1.0)
+        # frames are decoded and buffered off the event loop thread
+        self.assertEqual(len(client.frame_threads), 4)
+        self.assertNotIn(threading.current_thread(), client.frame_threads)
+        # clients are registered under the adapter wrapping the raw websocket
+        self.assertIsInstance(client.websocket, AsyncWebSocketAdapter)
+        self.assertTrue(client.exit)
+        self.assertTrue(websocket.closed)
+        self.assertEqual(self.server.client_manager.clients, {})
+        self.assertEqual(self.server.pending_passes, {})
+
+    def test_clients_with_own_thread_are_not_scheduled(self):
+        client = FakeFasterWhisperClient(None, client_uid="trt")
+        client.trans_thread = object()
+        client.add_frames(np.zeros(2 * client.RATE, dtype=np.float32))
+        self.server.schedule_transcription(client)
+        self.assertEqual(self.server.pending_passes, {})
+
+
+
+class TestShutdown(unittest.TestCase):
+    def test_shutdown_stops_batch_workers(self):
+        from yap.whisper_live.backend.faster_whisper_backend import ServeClientFasterWhisper
+
+        stopped = []
+        server = TranscriptionServer()
+        server.job_runner = SimpleNamespace(stop=lambda: stopped.append("jobs"))
+        scheduler = SimpleNamespace(stop=lambda: stopped.append("inference"))
+        with patch.object(ServeClientFasterWhisper, "BATCH_SCHEDULER", scheduler):
+            server.shutdown()
+            self.assertIsNone(ServeClientFasterWhisper.BATCH_SCHEDULER)
+        self.assertEqual(stopped, ["jobs", "inference"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import threading
+from yap.whisper_live.backend.translation_scheduler import BatchedTranslationScheduler, TranslationCache
+
+
+class RecordingTranslationModel:
+    """Fake model that upper-cases texts and records the batches it was called with."""
+
+    def __init__(self):
+        self.batches = []
+
+    def translate(self, texts, target_language):
+        self.batches.append((target_language, list(texts)))
+        if "fail" in texts:
+            raise RuntimeError("boom")
+        return [f"{target_language}:{text.upper()}" for text in texts]
+
+
+class TestBatchedTranslationScheduler(unittest.TestCase):
+    def setUp(self):
+        self.model = RecordingTranslationModel()
+        self.scheduler = BatchedTranslationScheduler(self.model, max_batch_size=8, max_wait_ms=100)
+
+    def tearDown(self):
+        self.scheduler.stop()
+        self.scheduler.worker.join(timeout=2.0)
+
+    def test_batches_clients_by_target_language(self):
+        results = {}
+
+        def submit(name, texts, language):
+            results[name] = self.scheduler.translate(texts, language)
+
+        threads = [
+            threading.Thread(target=submit, args=("a", ["one", "two"], "fr")),
+            threading.Thread(target=submit, args=("b", ["three"], "fr")),
+            threading.Thread(target=submit, args=("c", ["four"], "de")),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=2.0)
+
+        self.assertEqual(results["a"], ["fr:ONE", "fr:TWO"])
+        self.assertEqual(results["b"], ["fr:THREE"])
+        self.assertEqual(results["c"], ["de:FOUR"])
+        self.assertEqual(len(self.model.batches), 2)
+        self.assertEqual(sorted(language for language, _ in self.model.batches), ["de", "fr"])
+
+    def test_batch_error_is_raised_in_caller(self):
+        with self.assertRaises(RuntimeError):
+            self.scheduler.translate(["fail"], "fr")
+        self.assertEqual(self.scheduler.translate(["ok"], "fr"), ["fr:OK"])
+
+    def test_repeated_phrases_are_served_from_cache(self):
+        self.assertEqual(self.scheduler.translate(["yes", "next slide"], "fr"), ["fr:YES", "fr:NEXT SLIDE"])
+        self.assertEqual(self.scheduler.translate(["yes ", "no"], "fr"), ["fr:YES", "fr:NO"])
+        self.assertEqual(self.scheduler.translate(["yes"], "de"), ["de:YES"])
+        self.assertEqual([texts for _, texts in self.model.batches], [["yes", "next slide"], ["no"], ["yes"]])
+        stats = self.scheduler.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 4, 4))
+
+
+class TestTranslationCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = TranslationCache(max_entries=2)
+        cache.put("a", "fr", "A")
+        cache.put("b", "fr", "B")
+        self.assertEqual(cache.get("a", "fr"), "A")
+        cache.put("c", "fr", "C")
+        self.assertIsNone(cache.get("b", "fr"))
+        self.assertEqual(cache.get("c", "fr"), "C")
+
+    def test_entries_expire(self):
+        cache = TranslationCache(ttl=0)
+        cache.put("a", "fr", "A")
+        self.assertIsNone(cache.get("a", "fr"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import sys
+import time
+import types
+import threading
+import unittest
+from unittest.mock import patch
+import numpy as np
+from yap.whisper_live.backend.base import ServeClientBase
+
+# the TensorRT-LLM transcriber needs a GPU build; the client logic under test does not use it
+with patch.dict(sys.modules, {
+    "yap.whisper_live.transcriber": types.ModuleType("yap.whisper_live.transcriber"),
+    "yap.whisper_live.transcriber.transcriber_tensorrt": types.SimpleNamespace(WhisperTRTLLM=None),
+}):
+    from yap.whisper_live.backend.trt_backend import ServeClientTensorRT
+
+
+class FakeTranscriber:
+    """Stand-in for `WhisperTRTLLM` that always decodes the same text."""
+
+    def __init__(self):
+        self.passes = 0
+
+    def log_mel_spectrogram(self, audio):
+        return audio, audio.shape[0] / ServeClientBase.RATE
+
+    def transcribe(self, mel, text_prefix=None):
+        self.passes += 1
+        return "hello"
+
+
+class FakeWebSocket:
+    def send(self, message):
+        pass
+
+
+def make_client():
+    # skip model creation and the thread start in `__init__`
+    client = ServeClientTensorRT.__new__(ServeClientTensorRT)
+    ServeClientBase.__init__(client, "uid", FakeWebSocket())
+    client.language = "en"
+    client.task = "transcribe"
+    client.eos = False
+    client.eos_pending = False
+    client.transcriber = FakeTranscriber()
+    client.vad_detector = types.SimpleNamespace(close=lambda: None)
+    client.trans_thread = threading.Thread(target=client.speech_to_text, daemon=True)
+    return client
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestServeClientTensorRT(unittest.TestCase):
+    def test_end_of_speech_without_new_audio_completes_segment(self):
+        client = make_client()
+        client.add_frames(np.zeros(client.RATE, dtype=np.float32))
+        client.trans_thread.start()
+        try:
+            self.assertTrue(wait_until(lambda: client.transcriber.passes > 0))
+            self.assertEqual(client.transcript, [])
+
+            # silent frames are dropped with use_vad, so only the EOS flag changes
+            client.set_eos(True)
+            self.assertTrue(wait_until(lambda: client.transcript))
+            self.assertEqual(client.transcript[0]["text"], "hello ")
+            self.assertEqual(client.timestamp_offset, 1.0)
+        finally:
+            client.cleanup()
+            client.trans_thread.join(timeout=2)
+        self.assertFalse(client.trans_thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import unittest
+import numpy as np
+
+MODEL_PATH = os.path.expanduser("~/.cache/whisper-live/silero_vad.onnx")
+
+
+@unittest.skipUnless(os.path.exists(MODEL_PATH), "Silero VAD model not downloaded")
+class TestVoiceActivityStream(unittest.TestCase):
+    def setUp(self):
+        from yap.whisper_live.vad import VoiceActivityDetection
+        self.model = VoiceActivityDetection()
+        rng = np.random.default_rng(0)
+        t = np.arange(16000 * 2) / 16000
+        self.audio = (0.5 * np.sin(2 * np.pi * 200 * t) + 0.05 * rng.standard_normal(t.shape[0])).astype(np.float32)
+
+    def test_matches_whole_stream_regardless_of_packet_size(self):
+        whole = self.model.stream()(self.audio)
+
+        stream = self.model.stream()
+        parts, i = [], 0
+        for n in [100, 700, 1600, 3000, 5000, 21600]:
+            parts.append(stream(self.audio[i:i + n]))
+            i += n
+        np.testing.assert_allclose(np.concatenate(parts), whole, atol=1e-6)
+        self.assertEqual(whole.shape[0], self.audio.shape[0] // 512)
+
+    def test_detectors_share_one_session(self):
+        from yap.whisper_live.vad import VoiceActivityDetection
+        self.assertIs(VoiceActivityDetection().session, self.model.session)
+
+    def test_short_packets_are_buffered(self):
+        stream = self.model.stream()
+        self.assertEqual(stream(self.audio[:300]).shape[0], 0)
+        self.assertEqual(stream(self.audio[300:600]).shape[0], 1)
+
+
+@unittest.skipUnless(os.path.exists(MODEL_PATH), "Silero VAD model not downloaded")
+class TestBatchedVoiceActivityDetection(unittest.TestCase):
+    def test_concurrent_streams_match_individual_streams(self):
+        import threading
+        from yap.whisper_live.vad import BatchedVoiceActivityDetection, VoiceActivityDetection
+
+        model = VoiceActivityDetection()
+        engine = BatchedVoiceActivityDetection(model)
+        rng = np.random.default_rng(1)
+        t = np.arange(16000) / 16000
+        inputs = [
+            (a * np.sin(2 * np.pi * f * t) + 0.05 * rng.standard_normal(t.shape[0])).astype(np.float32)
+            for a, f in [(0.5, 200), (0.0, 0), (0.3, 440), (0.8, 120)]
+        ]
+        expected = [model.stream()(audio) for audio in inputs]
+
+        results = [[] for _ in inputs]
+
+        def feed(i):
+            stream = engine.stream()
+            for start in range(0, 16000, 1600):
+                results[i].append(stream(inputs[i][start:start + 1600]))
+            stream.close()
+
+        threads = [threading.Thread(target=feed, args=(i,)) for i in range(len(inputs))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for got, want in zip(results, expected):
+            np.testing.assert_allclose(np.concatenate(got), want, atol=1e-5)
+        self.assertEqual(engine.streams, [])
+
+    def test_closed_stream_does_not_block_engine(self):
+        import threading
+        from yap.whisper_live.vad import BatchedVoiceActivityDetection
+
+        engine = BatchedVoiceActivityDetection()
+        closed = engine.stream()
+        closed.close()
+        other = engine.stream()
+        results = {}
+
+        def feed():
+            results["closed"] = closed(np.zeros(2048, dtype=np.float32))
+            results["other"] = other(np.zeros(2048, dtype=np.float32))
+
+        thread = threading.Thread(target=feed, daemon=True)
+        thread.start()
+        thread.join(timeout=5.0)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results["closed"].shape, (0,))
+        self.assertEqual(results["other"].shape, (4,))
+
+
+    def test_caller_only_runs_batches_for_its_own_windows(self):
+        from yap.whisper_live.vad import BatchedVoiceActivityDetection
+
+        engine = BatchedVoiceActivityDetection()
+        runs = []
+        session = engine.session
+
+        class CountingSession:
+            def run(self, *args):
+                runs.append(args[1]["input"].shape[0])
+                return session.run(*args)
+
+        engine.session = CountingSession()
+        busy = engine.stream()
+        caller = engine.stream()
+        # another connection has a long backlog queued that its own thread has not run yet
+        with engine.cond:
+            busy._pending = np.zeros(512 * 10, dtype=np.float32)
+
+        self.assertEqual(caller(np.zeros(512 * 3, dtype=np.float32)).shape, (3,))
+        # one batch per window of the caller, each carrying a window of the backlog along
+        self.assertEqual(runs, [2, 2, 2])
+        self.assertEqual(busy._pending.shape[0], 512 * 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -31,6 +31,9 @@ async def monitor(host, port, duration=None):
                 if data.get("status") == "MONITOR_READY":
                     break
             
+            # Last printed segment id per client, so segments resent by the server are printed once
+            printed = {}
+
             # Receive loop
             while True:
                 try:
@@ -38,8 +41,14 @@ async def monitor(host, port, duration=None):
                     data = json.loads(message)
                     
                     if "segments" in data:
+                        uid = data.get("uid")
                         for seg in data["segments"]:
                             if seg.get("completed"):
+                                seg_id = seg.get("id")
+                                if seg_id is not None:
+                                    if seg_id <= printed.get(uid, -1):
+                                        continue
+                                    printed[uid] = seg_id
                                 # Print finalized segments
                                 print(f"{seg['text']}")
                                 sys.stdout.flush()